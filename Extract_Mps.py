@@ -2,108 +2,86 @@
     
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import WebDriverException
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service
 import time
 import csv
-import pandas as pd
-import re
 import os
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import subprocess
-
-# Try to import webdriver_manager for automatic ChromeDriver management
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    from selenium.webdriver.chrome.service import Service
-    WEBDRIVER_MANAGER_AVAILABLE = True
-except ImportError:
-    WEBDRIVER_MANAGER_AVAILABLE = False
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from driver_pool import DriverPool
+from geo_filter import GeoFilter
+from page_readiness import wait_until_ready, wait_until_settled
+from resource_policy import apply_resource_options, apply_resource_policy
+from place_extractor import (COLLECT_CANDIDATES_JS, MAX_CANDIDATES_PER_XPATH, collect_candidates,
+                             parse_operating_status, parse_phone_number, parse_place_fields, parse_rating,
+                             parse_store_type)
+from columnar_store import PLACE_DETAIL_FIELDS, PYARROW_AVAILABLE, ColumnarStore, columnar_path
+from coordinates import extract_coordinates_from_url
+from place_keys import place_key
+from resume_index import ResumeIndex
+from state_store import StateStore, state_path
+from csv_writer import BatchedCSVWriter
+from place_fetcher import fetch_place_record
+from async_engine import WEBSOCKETS_AVAILABLE, AsyncScrapeEngine, BlockedPageError
+from concurrency import AdaptiveConcurrency, is_block_page
+from url_reader import StreamingURLReader
+
+from browser_discovery import WEBDRIVER_MANAGER_AVAILABLE, discover_browser
+from profile_manager import profile_manager, warm_with_selenium
+
+if not WEBDRIVER_MANAGER_AVAILABLE:
     print("webdriver-manager not available. Install it with: pip install webdriver-manager")
 
 # Global lock for thread-safe CSV writing
 csv_lock = threading.Lock()
 
-def get_chrome_version():
-    """Get the installed Chrome browser version for better compatibility"""
-    try:
-        # Try different methods to get Chrome version
-        methods = [
-            # Windows
-            r'reg query "HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon" /v version',
-            # Alternative Windows method
-            r'powershell "Get-ItemProperty HKLM:\SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Uninstall\* | Select-Object DisplayName, DisplayVersion | Where-Object {$_.DisplayName -like \"*Chrome*\"}"',
-        ]
-
-        for method in methods:
-            try:
-                result = subprocess.run(method, shell=True, capture_output=True, text=True, timeout=10)
-                if result.returncode == 0 and result.stdout:
-                    # Extract version number from output
-                    version_match = re.search(r'(\d+)\.(\d+)\.(\d+)\.(\d+)', result.stdout)
-                    if version_match:
-                        major_version = int(version_match.group(1))
-                        return major_version
-            except:
-                continue
-
-        # Fallback: Try to get version from Chrome executable
-        import platform
-        if platform.system() == "Windows":
-            chrome_paths = [
-                r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-                r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-            ]
-            for path in chrome_paths:
-                if os.path.exists(path):
-                    try:
-                        result = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10)
-                        version_match = re.search(r'(\d+)\.(\d+)\.(\d+)\.(\d+)', result.stdout)
-                        if version_match:
-                            return int(version_match.group(1))
-                    except:
-                        continue
-
-    except Exception as e:
-        print(f"Warning: Could not detect Chrome version: {e}")
+# Ceiling (seconds) for waiting on a place page to become ready
+PAGE_READY_TIMEOUT = 20
 
-    return None
+# Resource profile for place-detail pages (see resource_policy.RESOURCE_PROFILES)
+RESOURCE_PROFILE = "place_details"
 
-def extract_coordinates_from_url(url):
-    """
-    Extract latitude and longitude coordinates from Google Maps URL
-
-    Args:
-        url (str): Google Maps URL containing coordinates
+# Try a browserless HTTP fetch of each place page before launching Chrome
+HTTP_FETCH_FIRST = False
 
-    Returns:
-        tuple: (latitude, longitude) as strings, or ("Not Found", "Not Found") if not found
-    """
-    try:
-        # Use regex to find latitude (3d parameter) and longitude (4d parameter)
-        lat_pattern = r'3d([+-]?\d+\.?\d*)'
-        lng_pattern = r'4d([+-]?\d+\.?\d*)'
+# "threads": one Selenium browser per worker thread
+# "asyncio": a few Chrome processes with many concurrent tabs each (needs websockets)
+SCRAPING_ENGINE = "threads"
 
-        lat_match = re.search(lat_pattern, url)
-        lng_match = re.search(lng_pattern, url)
+# Pre-scrape geo filter: URLs whose coordinates fall outside this area are dropped
+# before any browser opens. Set a (lat, lon) center with a radius, or a polygon of
+# (lat, lon) vertices; leave both as None to scrape every URL.
+GEO_FILTER_CENTER = None
+GEO_FILTER_RADIUS_KM = 7
+GEO_FILTER_POLYGON = None
 
-        latitude = lat_match.group(1) if lat_match else "Not Found"
-        longitude = lng_match.group(1) if lng_match else "Not Found"
+# Also write results to a Parquet dataset next to the CSV (needs pyarrow)
+COLUMNAR_OUTPUT = True
 
-        return latitude, longitude
+# Where resume state lives: "sqlite" keeps places, results and scrape attempts in a
+# WAL-mode database next to the output (see state_store.py); "csv" rebuilds a
+# ResumeIndex from the output CSV and its sidecar
+STATE_BACKEND = "sqlite"
 
-    except Exception as e:
-        print(f"Error extracting coordinates from URL: {str(e)}")
-        return "Not Found", "Not Found"
+# Output CSV columns, in order
+OUTPUT_FIELDNAMES = ['URL', 'Name', 'Address', 'Website', 'Phone', 'Store_Type', 'Operating_Status', 'Operating_Hours', 'Rating', 'Review_Count', 'Permanently_Closed', 'Latitude', 'Longitude']
 
 def safe_driver_quit(driver):
-    """Safely quit the Chrome driver with error handling"""
+    """Safely quit the Chrome driver with error handling and delete its cloned profile"""
     if not driver:
         return
 
+    try:
+        quit_driver_process(driver)
+    finally:
+        profile_manager.release(getattr(driver, 'profile_dir', None))
+
+def quit_driver_process(driver):
+    """Close the browser behind a driver, escalating to terminate/kill if needed"""
     try:
         # First try to close all windows
         try:
@@ -136,8 +114,7 @@ def append_result_to_csv(result, output_filename, write_header=False):
     try:
         with csv_lock:  # Thread-safe CSV writing
             with open(output_filename, 'a', newline='', encoding='utf-8') as file:
-                fieldnames = ['URL', 'Name', 'Address', 'Website', 'Phone', 'Store_Type', 'Operating_Status', 'Operating_Hours', 'Rating', 'Review_Count', 'Permanently_Closed', 'Latitude', 'Longitude']
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
+                writer = csv.DictWriter(file, fieldnames=OUTPUT_FIELDNAMES)
 
                 # Write header only if this is the first write
                 if write_header:
@@ -153,6 +130,18 @@ def append_result_to_csv(result, output_filename, write_header=False):
         traceback.print_exc()
         return False
 
+def save_result(result, output_filename, resume_index=None, result_writer=None):
+    """
+    Save one result through the batched writer if there is one, else append it directly
+    """
+    if result_writer is not None:
+        return result_writer.write(result)
+
+    success = append_result_to_csv(result, output_filename, write_header=False)
+    if success and resume_index is not None:
+        resume_index.add(result['URL'])
+    return success
+
 def check_url_already_processed(url, output_filename):
     """
     Check if a URL has already been processed by reading the existing output file
@@ -163,8 +152,9 @@ def check_url_already_processed(url, output_filename):
     try:
         with open(output_filename, 'r', newline='', encoding='utf-8') as file:
             reader = csv.DictReader(file)
+            key = place_key(url)
             for row in reader:
-                if row.get('URL') == url:
+                if place_key(row.get('URL')) == key:
                     return True
     except Exception as e:
         print(f"Warning: Error checking processed URLs: {e}")
@@ -175,536 +165,196 @@ def scroll_page(driver):
     """
     Scroll the page to help reveal dynamic content
     """
-    # Get the total height of the page
-    total_height = driver.execute_script("return document.body.scrollHeight")
-    
-    # Scroll in increments
-    for i in range(0, total_height, 500):
-        driver.execute_script(f"window.scrollTo(0, {i});")
-        time.sleep(0.5)
-    
+    # Scroll to the bottom and wait for any lazily loaded content to settle
+    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    wait_until_settled(driver)
+
     # Scroll back to top
     driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(1)
 
 
-    """Extract phone number using exact Google Maps HTML structure"""
-def extract_phone_number(driver, wait):
-    """Extract phone number using exact Google Maps HTML structure"""
-    try:
-        # Scroll and wait for page to be fully loaded
-        scroll_page(driver)
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
-
-        # Exact XPath selectors based on confirmed HTML structure
-        phone_xpaths = [
-            # Most specific - targets the exact phone div structure
-            "//div[contains(@class, 'AeaXub')]//div[contains(@class, 'Io6YTe') and contains(@class, 'fontBodyMedium') and contains(@class, 'kR99db')]",
-
-            # Parent-child relationship targeting phone container
-            "//div[contains(@class, 'rogA2c')]//div[contains(@class, 'Io6YTe') and contains(@class, 'fontBodyMedium')]",
-
-            # Class combination for phone text element
-            "//div[contains(@class, 'Io6YTe') and contains(@class, 'kR99db')]",
-
-            # Fallback for tel: links
-            "//a[contains(@href, 'tel:')]"
-        ]
-
-        for xpath in phone_xpaths:
-            try:
-                phone_elements = driver.find_elements(By.XPATH, xpath)
-
-                for element in phone_elements:
-                    try:
-                        # Scroll to element to ensure it's visible
-                        driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.3)
-
-                        # Extract text or href for tel: links
-                        if "tel:" in xpath:
-                            phone_text = element.get_attribute("href")
-                            if phone_text and phone_text.startswith("tel:"):
-                                phone_text = phone_text.replace("tel:", "").strip()
-                        else:
-                            phone_text = element.text.strip()
-
-                        if phone_text:
-                            # Phone number regex patterns for Indian numbers
-                            phone_patterns = [
-                                r'\+91[-.\s]?\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}',  # +91 format with spaces
-                                r'0\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}',  # 0 prefix format (like 044 2522 2944)
-                                r'0\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}'
-                                r'\d{3}[-.\s]?\d{4}[-.\s]?\d{4}',  # 3-4-4 format
-                                r'\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}',  # General landline format
-                                r'[6-9]\d{9}',  # 10-digit mobile format
-                                r'\+91[-.\s]?[6-9]\d{9}'  # +91 mobile format
-                            ]
-
-                            for pattern in phone_patterns:
-                                phone_matches = re.findall(pattern, phone_text)
-                                if phone_matches:
-                                    phone_number = phone_matches[0]
-                                    # Clean the phone number (keep digits and + only)
-                                    cleaned_number = ''.join(c for c in phone_number if c.isdigit() or c == '+')
-
-                                    # Validate length (Indian numbers: 10-13 digits)
-                                    digit_count = len(re.findall(r'\d', cleaned_number))
-                                    if 11 <= digit_count <= 13:
-                                        return cleaned_number
-                    except Exception:
-                        continue
-
-            except (NoSuchElementException, TimeoutException):
-                continue
-
-        return "Phone Number Not Found"
-
-    except Exception as e:
-        print(f"Error in phone extraction: {str(e)}")
-        return "Phone Number Not Found"
-
-def extract_store_type(driver, wait):
-    """Extract business category/store type from Google Maps page"""
-    try:
-        # Enhanced scrolling and waiting for elements to load
-        driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(2)
-
-        # Wait for page to be fully loaded
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
-
-        # Try multiple selectors for store type/category (prioritized by reliability)
-        category_selectors = [
-            "//button[contains(@class, 'DkEaL')]",  # Most reliable - confirmed working
-            "//button[contains(@class, 'DkEaL') and contains(@jsaction, 'pane.wfvdle18.category')]",
-            "//button[contains(@jsaction, 'pane.wfvdle18.category')]",
-            "//div[contains(@class, 'fontBodyMedium')]//button[contains(@class, 'DkEaL')]",
-            "//div[contains(@class, 'LBgpqf')]//button[contains(@class, 'DkEaL')]",
-            "//span[contains(@class, 'YhemCb')]",
-            "//div[contains(@class, 'LBgpqf')]//button",
-            "//button[contains(@aria-label, 'Category')]",
-        ]
-
-        for selector in category_selectors:
-            try:
-                # Find elements directly (find_elements never throws exception)
-                category_elements = driver.find_elements(By.XPATH, selector)
-
-                for element in category_elements:
-                    try:
-                        # Scroll to element to ensure it's visible
-                        driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.5)
-
-                        category_text = element.text.strip()
-
-                        if category_text and len(category_text) > 0:
-                            # Filter out common non-category buttons
-                            # IMPORTANT: "book" should NOT be in excluded_terms as "Book store" is a valid category
-                            excluded_terms = ['directions', 'save', 'share', 'nearby', 'call', 'website', 'menu', 'order']
-                            if not any(term in category_text.lower() for term in excluded_terms):
-                                return category_text
-                    except Exception:
-                        continue
-
-            except (NoSuchElementException, TimeoutException):
-                continue
-
-    except Exception as e:
-        print(f"Error extracting store type: {str(e)}")
-
-    return "Not Found"
-
-
-def extract_operating_status_and_hours(driver, wait):
-    """Extract operating status and hours from Google Maps page"""
-    try:
-        status = "Not Found"
-        operating_hours = "Not Found"
-
-        # Enhanced scrolling and waiting
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-        time.sleep(2)
-
-        # Wait for page to be fully loaded
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
-
-        # Try to find operating status with prioritized selectors (confirmed working)
-        status_selectors = [
-            "//span[contains(@class, 'ZDu9vd')]",  # Most reliable - confirmed working
-            "//div[contains(@class, 'MkV9')]//span[contains(@class, 'ZDu9vd')]",
-            "//span[contains(text(), 'Open') or contains(text(), 'Closed') or contains(text(), 'Closes')]",
-            "//div[contains(@class, 'o0Svhf')]//span",
-            "//span[contains(@class, 'ZDu9vd')]//span",
-            "//div[contains(@aria-expanded, 'true')]//span[contains(@class, 'ZDu9vd')]"
-        ]
-
-        for selector in status_selectors:
-            try:
-                # Use WebDriverWait for better reliability
-                status_elements = wait.until(lambda d: d.find_elements(By.XPATH, selector))
-
-                for element in status_elements:
-                    try:
-                        # Scroll to element to ensure it's visible
-                        driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.5)
-
-                        status_text = element.text.strip()
-
-                        if status_text and any(keyword in status_text.lower() for keyword in ['open', 'closed', 'closes', 'opens']):
-                            # Enhanced parsing logic with correct business logic
-                            status_text_lower = status_text.lower()
-
-                            # CRITICAL: If operating hours exist, business is operational (status = "Open")
-                            # Only set status to "Closed" if NO operating hours are found
-
-                            # Handle "Closed ⋅ Opens 8 am" format - business is OPEN (has operating hours)
-                            if "closed" in status_text_lower and "opens" in status_text_lower:
-                                status = "Open"  # Business is operational (has hours)
-                                # Extract opening time
-                                opens_patterns = [
-                                    r'opens\s+(.+?)(?:\s+\w{3})?$',  # "Opens 8 am Tue" -> "8 am"
-                                    r'opens\s+(.+)',  # General opens pattern
-                                ]
-                                for pattern in opens_patterns:
-                                    opens_match = re.search(pattern, status_text, re.IGNORECASE)
-                                    if opens_match:
-                                        time_part = opens_match.group(1).strip()
-                                        # Remove day abbreviations (Mon, Tue, etc.)
-                                        time_part = re.sub(r'\s+\w{3}$', '', time_part).strip()
-                                        operating_hours = f"Opens {time_part}"
-                                        break
-                                # Return immediately after successful parsing
-                                return status, operating_hours
-
-                            # Handle "Open ⋅ Closes 9 pm" format - business is OPEN
-                            elif "open" in status_text_lower and "closes" in status_text_lower:
-                                if "open now" in status_text_lower:
-                                    status = "Open now"
-                                else:
-                                    status = "Open"
-                                # Extract closing time
-                                closes_patterns = [
-                                    r'closes\s+(.+?)(?:\s+\w{3})?$',  # "Closes 9 pm" -> "9 pm"
-                                    r'closes\s+(.+)',  # General closes pattern
-                                ]
-                                for pattern in closes_patterns:
-                                    closes_match = re.search(pattern, status_text, re.IGNORECASE)
-                                    if closes_match:
-                                        time_part = closes_match.group(1).strip()
-                                        # Remove day abbreviations
-                                        time_part = re.sub(r'\s+\w{3}$', '', time_part).strip()
-                                        operating_hours = f"Closes {time_part}"
-                                        break
-                                # Return immediately after successful parsing
-                                return status, operating_hours
-
-                            # Handle simple "Open now" or "Open" status
-                            elif "open now" in status_text_lower:
-                                status = "Open now"
-                                # Return immediately
-                                return status, operating_hours
-                            elif "open" in status_text_lower:
-                                status = "Open"
-                                # Return immediately
-                                return status, operating_hours
-
-                            # Only set to "Closed" if no operating hours are found
-                            elif "closed" in status_text_lower and "opens" not in status_text_lower:
-                                status = "Closed"
-                                # Return immediately
-                                return status, operating_hours
-                    except Exception:
-                        continue
-
-                if status != "Not Found":
-                    break
-
-            except (NoSuchElementException, TimeoutException):
-                continue
-
-        # Try to extract detailed operating hours from the hours table
-        if operating_hours == "Not Found":
-            try:
-                # Look for the hours table with multiple selectors
-                hours_selectors = [
-                    "//table[contains(@class, 'eK4R0e')]",
-                    "//div[contains(@class, 't39EBf')]//table",
-                    "//table//tr[contains(@class, 'y0skZc')]"
-                ]
-
-                for table_selector in hours_selectors:
-                    try:
-                        if "//table" in table_selector:
-                            hours_table = driver.find_element(By.XPATH, table_selector)
-                            if hours_table:
-                                # Get today's hours (first row that's not a header)
-                                today_row = hours_table.find_element(By.XPATH, ".//tr[contains(@class, 'y0skZc')][1]")
-                                if today_row:
-                                    hours_cell = today_row.find_element(By.XPATH, ".//td[contains(@class, 'mxowUb')]")
-                                    if hours_cell:
-                                        hours_text = hours_cell.text.strip()
-                                        if hours_text and ("–" in hours_text or "-" in hours_text):
-                                            operating_hours = hours_text
-                                            break
-                        else:
-                            # Direct row selector
-                            today_rows = driver.find_elements(By.XPATH, table_selector)
-                            if today_rows:
-                                for row in today_rows[:1]:  # Take first row
-                                    hours_cell = row.find_element(By.XPATH, ".//td[contains(@class, 'mxowUb')]")
-                                    if hours_cell:
-                                        hours_text = hours_cell.text.strip()
-                                        if hours_text and ("–" in hours_text or "-" in hours_text):
-                                            operating_hours = hours_text
-                                            break
-                    except (NoSuchElementException, TimeoutException):
-                        continue
-
-                    if operating_hours != "Not Found":
-                        break
-
-            except (NoSuchElementException, TimeoutException):
-                pass
-
-    except Exception as e:
-        print(f"Error extracting operating status and hours: {str(e)}")
-
-    return status, operating_hours
-
-
-def extract_rating(driver, wait):
-    """Extract rating and review count from Google Maps page"""
-    try:
-        # Enhanced scrolling and waiting for rating elements
-        driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(2)
-
-        # Wait for page to be fully loaded
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
-
-        # Try multiple selectors for rating (prioritized by reliability)
-        rating_selectors = [
-            "//div[contains(@class, 'F7nice')]//span[@aria-hidden='true']",  # Most reliable - confirmed working
-            "//span[contains(@class, 'ceNzKf')]/preceding-sibling::span[@aria-hidden='true']",
-            "//div[contains(@jslog, '76333')]//span[@aria-hidden='true']",
-            "//div[contains(@class, 'F7nice')]//span[1]",
-            "//span[@aria-hidden='true' and string-length(text()) <= 3]",
-            "//div[contains(@class, 'jANrlb')]//div[contains(@class, 'F7nice')]//span"
-        ]
-
-        for selector in rating_selectors:
-            try:
-                # Use WebDriverWait for better reliability
-                rating_elements = wait.until(lambda d: d.find_elements(By.XPATH, selector))
-
-                for element in rating_elements:
-                    try:
-                        # Scroll to element to ensure it's visible
-                        driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.5)
-
-                        rating_text = element.text.strip()
-
-                        if rating_text:
-                            # Validate that it's a numeric rating
-                            if rating_text.replace('.', '').replace(',', '').isdigit():
-                                try:
-                                    rating_value = float(rating_text.replace(',', '.'))
-                                    if 0 <= rating_value <= 5:  # Valid rating range
-                                        return rating_text
-                                except ValueError:
-                                    continue
-
-                            # Also check for patterns like "4.5" or "5.0"
-                            rating_match = re.search(r'^([0-5](?:\.[0-9])?)$', rating_text)
-                            if rating_match:
-                                return rating_match.group(1)
-                    except Exception:
-                        continue
-
-            except (NoSuchElementException, TimeoutException):
-                continue
-
-    except Exception as e:
-        print(f"Error extracting rating: {str(e)}")
-
-    return "Not Found"
+# XPath fallback chains for each place field, in priority order. The JS extractor
+# evaluates all of them in one call; iter_element_candidates walks the same chains
+# through WebDriver when the script cannot run.
+NAME_XPATHS = [
+    "//h1[contains(@class, 'DUwDvf lfPIob')]"
+]
+
+ADDRESS_XPATHS = [
+    "//div[contains(@class,'rogA2c')]/div[contains(@class,'Io6YTe')]"
+]
+
+WEBSITE_XPATHS = [
+    "//a[contains(@aria-label, 'Website')]"
+]
+
+# Exact XPath selectors based on confirmed HTML structure
+PHONE_XPATHS = [
+    # Most specific - targets the exact phone div structure
+    "//div[contains(@class, 'AeaXub')]//div[contains(@class, 'Io6YTe') and contains(@class, 'fontBodyMedium') and contains(@class, 'kR99db')]",
+
+    # Parent-child relationship targeting phone container
+    "//div[contains(@class, 'rogA2c')]//div[contains(@class, 'Io6YTe') and contains(@class, 'fontBodyMedium')]",
+
+    # Class combination for phone text element
+    "//div[contains(@class, 'Io6YTe') and contains(@class, 'kR99db')]",
+
+    # Fallback for tel: links
+    "//a[contains(@href, 'tel:')]"
+]
+
+# Store type/category selectors (prioritized by reliability)
+CATEGORY_XPATHS = [
+    "//button[contains(@class, 'DkEaL')]",  # Most reliable - confirmed working
+    "//button[contains(@class, 'DkEaL') and contains(@jsaction, 'pane.wfvdle18.category')]",
+    "//button[contains(@jsaction, 'pane.wfvdle18.category')]",
+    "//div[contains(@class, 'fontBodyMedium')]//button[contains(@class, 'DkEaL')]",
+    "//div[contains(@class, 'LBgpqf')]//button[contains(@class, 'DkEaL')]",
+    "//span[contains(@class, 'YhemCb')]",
+    "//div[contains(@class, 'LBgpqf')]//button",
+    "//button[contains(@aria-label, 'Category')]",
+]
+
+# Operating status selectors (confirmed working first)
+STATUS_XPATHS = [
+    "//span[contains(@class, 'ZDu9vd')]",  # Most reliable - confirmed working
+    "//div[contains(@class, 'MkV9')]//span[contains(@class, 'ZDu9vd')]",
+    "//span[contains(text(), 'Open') or contains(text(), 'Closed') or contains(text(), 'Closes')]",
+    "//div[contains(@class, 'o0Svhf')]//span",
+    "//span[contains(@class, 'ZDu9vd')]//span",
+    "//div[contains(@aria-expanded, 'true')]//span[contains(@class, 'ZDu9vd')]"
+]
+
+# Today's hours cell in the opening-hours table (first row that's not a header)
+HOURS_XPATHS = [
+    "//table[contains(@class, 'eK4R0e')]//tr[contains(@class, 'y0skZc')][1]//td[contains(@class, 'mxowUb')]",
+    "//div[contains(@class, 't39EBf')]//table//tr[contains(@class, 'y0skZc')][1]//td[contains(@class, 'mxowUb')]",
+    "(//table//tr[contains(@class, 'y0skZc')])[1]//td[contains(@class, 'mxowUb')]"
+]
+
+# Rating selectors (prioritized by reliability)
+RATING_XPATHS = [
+    "//div[contains(@class, 'F7nice')]//span[@aria-hidden='true']",  # Most reliable - confirmed working
+    "//span[contains(@class, 'ceNzKf')]/preceding-sibling::span[@aria-hidden='true']",
+    "//div[contains(@jslog, '76333')]//span[@aria-hidden='true']",
+    "//div[contains(@class, 'F7nice')]//span[1]",
+    "//span[@aria-hidden='true' and string-length(text()) <= 3]",
+    "//div[contains(@class, 'jANrlb')]//div[contains(@class, 'F7nice')]//span"
+]
+
+# Review count selectors (prioritized by reliability)
+REVIEW_XPATHS = [
+    "//span[contains(@aria-label, 'review')]",  # Most reliable - targets aria-label with "review"
+    "//div[contains(@class, 'F7nice')]//span[contains(@aria-label, 'review')]",  # Within rating section
+    "//span[contains(@aria-label, 'reviews')]",  # Plural form
+    "//span[contains(@aria-label, 'review') and contains(text(), '(')]",  # With parentheses
+    "//div[contains(@jslog, '76333')]//span[contains(@aria-label, 'review')]"  # Within rating container
+]
+
+# Permanently/temporarily closed indicator
+# <div class="o0Svhf"><span class="ZDu9vd"><span class="aSftqf ">Permanently closed</span></span> ...</div>
+CLOSED_XPATHS = [
+    "//div[contains(@class, 'o0Svhf')]//span[contains(text(), 'Permanently closed')]",
+    "//div[contains(@class, 'o0Svhf')]//span[contains(text(), 'Temporarily closed')]"
+]
+
+PLACE_FIELD_XPATHS = {
+    'name': NAME_XPATHS,
+    'address': ADDRESS_XPATHS,
+    'website': WEBSITE_XPATHS,
+    'phone': PHONE_XPATHS,
+    'store_type': CATEGORY_XPATHS,
+    'status': STATUS_XPATHS,
+    'hours': HOURS_XPATHS,
+    'rating': RATING_XPATHS,
+    'review_count': REVIEW_XPATHS,
+    'closed': CLOSED_XPATHS,
+}
+
+
+def iter_element_candidates(driver, xpaths):
+    """
+    Yield candidates for an XPath chain through WebDriver, one element at a time
 
+    Produces the same {xpath, text, href, ariaLabel} dicts as the JS extractor so
+    the parse_* functions work on either path.
+    """
+    for index, xpath in enumerate(xpaths):
+        try:
+            elements = driver.find_elements(By.XPATH, xpath)
+        except WebDriverException:
+            continue
 
-def extract_review_count(driver, wait):
-    """Extract review count from Google Maps page"""
-    try:
-        # Enhanced scrolling and waiting for review elements
-        driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(1)
-
-        # Wait for page to be fully loaded
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
-
-        # Try multiple selectors for review count (prioritized by reliability)
-        review_selectors = [
-            "//span[contains(@aria-label, 'review')]",  # Most reliable - targets aria-label with "review"
-            "//div[contains(@class, 'F7nice')]//span[contains(@aria-label, 'review')]",  # Within rating section
-            "//span[contains(@aria-label, 'reviews')]",  # Plural form
-            "//span[contains(@aria-label, 'review') and contains(text(), '(')]",  # With parentheses
-            "//div[contains(@jslog, '76333')]//span[contains(@aria-label, 'review')]"  # Within rating container
-        ]
-
-        for selector in review_selectors:
+        for element in elements:
             try:
-                # Find elements directly (find_elements never throws exception)
-                review_elements = driver.find_elements(By.XPATH, selector)
-
-                for element in review_elements:
-                    try:
-                        # Scroll to element to ensure it's visible
-                        driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.3)
-
-                        # Extract aria-label attribute
-                        aria_label = element.get_attribute("aria-label")
-
-                        if aria_label:
-                            # Extract number from aria-label like "40 reviews" or "1 review"
-                            review_match = re.search(r'(\d+)\s+reviews?', aria_label)
-                            if review_match:
-                                review_count = review_match.group(1)
-                                # Validate that it's a numeric value
-                                if review_count.isdigit():
-                                    return review_count
-
-                        # Also try extracting from visible text in parentheses
-                        review_text = element.text.strip()
-                        if review_text:
-                            # Extract number from text like "(40)" or "(150)"
-                            text_match = re.search(r'\((\d+)\)', review_text)
-                            if text_match:
-                                review_count = text_match.group(1)
-                                if review_count.isdigit():
-                                    return review_count
-
-                    except Exception:
-                        continue
-
-            except (NoSuchElementException, TimeoutException):
+                # Scroll to element to ensure it's visible
+                driver.execute_script("arguments[0].scrollIntoView(true);", element)
+                yield {
+                    'xpath': index,
+                    'text': element.text.strip(),
+                    'href': element.get_attribute("href") or '',
+                    'ariaLabel': element.get_attribute("aria-label") or ''
+                }
+            except WebDriverException:
                 continue
 
-        return "Not Found"
-
-    except Exception as e:
-        print(f"Error extracting review count: {str(e)}")
-        return "Not Found"
-
 
-def extract_permanently_closed_status(driver, wait):
-    """Check if business is permanently closed"""
-    try:
-        # Look for permanently closed indicator    
-           # <div class="o0Svhf"><span class="ZDu9vd"><span class="aSftqf ">Permanently closed</span></span> <span class="puWIL hKrmvd google-symbols JUDSqb" aria-label="Show details" role="img" style="font-size: 18px;"></span></div>
-        closed_selectors = [
-                "//div[contains(@class, 'o0Svhf')]//span[contains(text(), 'Permanently closed')]",
-                "//div[contains(@class, 'o0Svhf')]//span[contains(text(), 'Temporarily closed')]" ]
-
-
-        for selector in closed_selectors:
-            try:
-                closed_element = driver.find_element(By.XPATH, selector)
-                if closed_element and "Permanently closed" or "Temporarily closed" in closed_element.text:
-                    return "Yes"
-            except (NoSuchElementException, TimeoutException):
-                continue
-
-    except Exception as e:
-        print(f"Error checking permanently closed status: {str(e)}")
+def fetch_place_data(url):
+    """
+    Build the scrape_data record from the page payload over plain HTTP
 
-    return "No"
+    Returns None when the page cannot be parsed, so the caller falls back to Selenium.
+    """
+    record = fetch_place_record(url)
+    if record is None:
+        return None
+
+    # Normalise the raw payload values with the same parsers as the browser path
+    record['Phone'] = parse_phone_number({'text': record['Phone'], 'href': ''}) or "Phone Number Not Found"
+    record['Store_Type'] = parse_store_type({'text': record['Store_Type']}) or "Not Found"
+    record['Rating'] = parse_rating({'text': record['Rating']}) or "Not Found"
+    if not record['Review_Count'].isdigit():
+        record['Review_Count'] = "Not Found"
+
+    status_and_hours = parse_operating_status({'text': record['Operating_Status']})
+    if status_and_hours:
+        status, hours = status_and_hours
+        record['Operating_Status'] = status
+        if hours != "Not Found":
+            record['Operating_Hours'] = hours
+    else:
+        record['Operating_Status'] = "Not Found"
+
+    # Coordinates come from the URL, as in scrape_data
+    record['Latitude'], record['Longitude'] = extract_coordinates_from_url(url)
+    return record
 
 
 def scrape_data(url, driver, wait):
     try:
         # Navigate to the URL
         driver.get(url)
-        time.sleep(8)  # Increased wait time for page to load completely
-
-        # Wait for page to be fully loaded
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(2)
-
-        # Scroll the page to ensure all elements are loaded
-        scroll_page(driver)
-        time.sleep(3)  # Additional wait after scrolling
-
-        # Additional scroll to ensure dynamic content is loaded
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
-        driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(2)
 
-        # Initialize variables with default values
-        address = website = phone = "Not Found"
+        # Wait for the place panel title, network idle and DOM quiet instead of fixed sleeps
+        if not wait_until_ready(driver, timeout=PAGE_READY_TIMEOUT):
+            print(f"⚠️ Page not settled after {PAGE_READY_TIMEOUT}s, extracting anyway: {url}")
 
-        try:
-            # Address extraction
-            address_element = wait.until(EC.presence_of_element_located(
-                (By.XPATH, "//div[contains(@class,'rogA2c')]/div[contains(@class,'Io6YTe')]")
-            ))
-            # Scroll to address element
-            driver.execute_script("arguments[0].scrollIntoView(true);", address_element)
-            address = address_element.text
-        except (TimeoutException, NoSuchElementException):
-            pass
-
-        try:
-            # Website extraction
-            website_element = wait.until(EC.presence_of_element_located(
-                (By.XPATH, "//a[contains(@aria-label, 'Website')]")
-            ))
-            website = website_element.get_attribute("href")
-        except (TimeoutException, NoSuchElementException):
+        # Read every field's XPath chain in a single script call
+        candidates = collect_candidates(driver, PLACE_FIELD_XPATHS)
+        if candidates is None:
+            # Script could not run - walk the same chains through WebDriver instead
+            scroll_page(driver)
+            candidates = {field: iter_element_candidates(driver, xpaths)
+                          for field, xpaths in PLACE_FIELD_XPATHS.items()}
 
-            pass
-        try:
-            name_element = wait.until(EC.presence_of_element_located(
-                (By.XPATH, "//h1[contains(@class, 'DUwDvf lfPIob')]")
-            ))
-            driver.execute_script("arguments[0].scrollIntoView(true);", name_element)
-            name = name_element.text.strip()
-        except (TimeoutException, NoSuchElementException):
-            name = "Name Not Found"
-
-        # Phone number extraction
-        phone = extract_phone_number(driver, wait)
-
-        # Extract new business information
-        store_type = extract_store_type(driver, wait)
-        operating_status, operating_hours = extract_operating_status_and_hours(driver, wait)
-        rating = extract_rating(driver, wait)
-        review_count = extract_review_count(driver, wait)
-        permanently_closed = extract_permanently_closed_status(driver, wait)
+        fields = parse_place_fields(candidates)
 
         # Coordinate extraction from URL
         latitude, longitude = extract_coordinates_from_url(url)
 
         return {
             'URL': url,
-            'Name': name,
-            'Address': address,
-            'Website': website,
-            'Phone': phone,
-            'Store_Type': store_type,
-            'Operating_Status': operating_status,
-            'Operating_Hours': operating_hours,
-            'Rating': rating,
-            'Review_Count': review_count,
-            'Permanently_Closed': permanently_closed,
+            **fields,
             'Latitude': latitude,
             'Longitude': longitude
         }
@@ -729,6 +379,32 @@ def scrape_data(url, driver, wait):
             'Longitude': longitude
         }
 
+async def scrape_data_async(tab, url):
+    """
+    Asyncio-engine counterpart of scrape_data for one tab of a shared browser
+    """
+    await tab.navigate(url)
+
+    # A consent/captcha page must not be saved, or the URL would be marked done
+    if is_block_page(await tab.current_url()):
+        raise BlockedPageError(url)
+
+    if not await tab.wait_until_ready(PAGE_READY_TIMEOUT):
+        print(f"⚠️ Page not settled after {PAGE_READY_TIMEOUT}s, extracting anyway: {url}")
+
+    candidates = await tab.evaluate(COLLECT_CANDIDATES_JS, PLACE_FIELD_XPATHS, MAX_CANDIDATES_PER_XPATH)
+    fields = parse_place_fields(candidates)
+
+    # Coordinate extraction from URL
+    latitude, longitude = extract_coordinates_from_url(url)
+
+    return {
+        'URL': url,
+        **fields,
+        'Latitude': latitude,
+        'Longitude': longitude
+    }
+
 def main():
     # Check if the input CSV file exists
     input_filename = 'Software_company_hyderabad.csv'
@@ -738,19 +414,8 @@ def main():
         print("The file should be created by the Google Maps scraper with the correct spelling: 'stationery' not 'stationary'")
         return
 
-    # Read URLs from CSV file
-    try:
-        df = pd.read_csv(input_filename)
-        if 'URL' not in df.columns:
-            print(f"Error: 'URL' column not found in {input_filename}")
-            print(f"Available columns: {list(df.columns)}")
-            return
-
-        urls = df['URL'].tolist()
-        print(f"Successfully loaded {len(urls)} URLs from {input_filename}")
-    except Exception as e:
-        print(f"Error reading CSV file: {str(e)}")
-        return
+    # Clean up browser profiles left behind by earlier, interrupted runs
+    profile_manager.gc()
 
     # Setup output file for real-time incremental writing
     output_filename = 'Software_company_hyderabad_op.csv'
@@ -758,32 +423,201 @@ def main():
     # Check if output file already exists to determine if we need to write header
     file_exists = os.path.exists(output_filename)
 
-    # Count existing processed URLs for resume capability
-    processed_count = 0
+    # Index existing processed URLs once for resume capability
+    resume_index = load_resume_state(output_filename)
     if file_exists:
+        print(f"Found existing output file with {len(resume_index)} processed URLs")
+        print("Will skip already processed URLs and continue from where left off")
+
+    # Stream URLs from the input CSV; already-processed ones never reach the workers
+    try:
+        urls = StreamingURLReader(input_filename, column='URL', skip=resume_index)
+        print(f"Streaming URLs from {input_filename}")
+    except Exception as e:
+        print(f"Error reading CSV file: {str(e)}")
+        return
+
+    # Drop places outside the configured area using the coordinates in their URLs
+    geo_filter = GeoFilter.from_config(GEO_FILTER_CENTER, GEO_FILTER_RADIUS_KM, GEO_FILTER_POLYGON)
+    if geo_filter is not None:
+        print(f"🌍 Only scraping places within {geo_filter.describe()}")
+        urls = geo_filter.filter(urls)
+
+    # Continue with the configured engine
+    try:
+        if SCRAPING_ENGINE == "asyncio":
+            process_urls_async(urls, output_filename, file_exists, resume_index)
+        else:
+            process_urls_multithreaded(urls, output_filename, file_exists, resume_index)
+    finally:
+        close_resume_state(resume_index, output_filename)
+
+    if geo_filter is not None:
+        print(f"🌍 {geo_filter.summary()}")
+
+def load_resume_state(output_filename):
+    """
+    Processed-URL state for an output file: a StateStore or a ResumeIndex, per STATE_BACKEND
+
+    The first SQLite run imports the existing output CSV, so resuming keeps working.
+    """
+    if STATE_BACKEND != "sqlite":
+        return ResumeIndex.load(output_filename)
+
+    state = StateStore(state_path(output_filename))
+    imported = state.sync_csv(output_filename)
+    if imported:
+        print(f"📋 Imported {imported} rows from {output_filename} into {state.path}")
+    print(f"📋 {len(state)} processed URLs in {state.path}")
+    return state
+
+def close_resume_state(resume_index, output_filename):
+    """Close a StateStore once the output CSV is final; a ResumeIndex needs no closing"""
+    if isinstance(resume_index, StateStore):
+        # Everything in the CSV is now in the database; skip re-importing it next run
+        resume_index.mark_csv_synced(output_filename)
+        resume_index.close()
+
+def record_flushed(resume_index, rows):
+    """Mark flushed rows as processed; a StateStore also keeps their records"""
+    if isinstance(resume_index, StateStore):
+        resume_index.save_results(rows)
+        return
+    for row in rows:
+        resume_index.add(row['URL'])
+
+def record_attempt(resume_index, url, status, error=None, duration=None):
+    """Log a scrape attempt when state is kept in SQLite"""
+    if isinstance(resume_index, StateStore):
         try:
-            with open(output_filename, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                processed_count = sum(1 for row in reader)
-            print(f"Found existing output file with {processed_count} processed URLs")
-            print("Will skip already processed URLs and continue from where left off")
+            resume_index.record_attempt(url, status, error, duration)
         except Exception as e:
-            print(f"Warning: Error reading existing output file: {e}")
+            print(f"Warning: Could not record scrape attempt: {e}")
+
+def open_columnar_store(output_filename):
+    """Parquet dataset mirroring the CSV output, or None if disabled or pyarrow is missing"""
+    if not COLUMNAR_OUTPUT:
+        return None
+    if not PYARROW_AVAILABLE:
+        print("pyarrow not available, writing CSV only. Install it with: pip install pyarrow")
+        return None
+    store = ColumnarStore(columnar_path(output_filename), PLACE_DETAIL_FIELDS, url_column='URL')
+    print(f"Columnar copy: {store.root}")
+    # Rows a killed run saved to the CSV but had not written to Parquet yet
+    backfilled = store.sync_csv(output_filename)
+    if backfilled:
+        print(f"Columnar copy: added {backfilled} rows missing from {output_filename}")
+    return store
+
+def process_urls_async(urls, output_filename, file_exists, resume_index=None):
+    """
+    Process URLs with the asyncio engine: few browsers, many concurrent tabs each
+    """
+    if not WEBSOCKETS_AVAILABLE:
+        print("websockets not available. Install it with: pip install websockets")
+        print("Falling back to the multithreaded engine")
+        process_urls_multithreaded(urls, output_filename, file_exists, resume_index)
+        return
+
+    # State opened here (rather than passed in by main) is closed here
+    owns_resume_state = resume_index is None
+    if owns_resume_state:
+        resume_index = load_resume_state(output_filename)
+
+    # Asyncio engine configuration
+    BROWSERS = 2  # Chrome processes
+    TABS_PER_BROWSER = 6  # Concurrent tabs in each process
+    PAGE_TIMEOUT = 60  # Seconds allowed per URL
 
-    # Continue with multithreaded processing
-    process_urls_multithreaded(urls, output_filename, file_exists)
+    total_urls = len(urls) if hasattr(urls, '__len__') else '?'
+    pending_urls = (url for url in urls if url not in resume_index)
+
+    print(f"\n{'='*80}")
+    print(f"STARTING ASYNCIO MULTI-TAB DATA EXTRACTION")
+    print(f"{'='*80}")
+    print(f"Total URLs: {total_urls} ({len(resume_index)} already processed)")
+    print(f"Output file: {output_filename}")
+    print(f"Browsers: {BROWSERS} x {TABS_PER_BROWSER} tabs")
+    print("-" * 80)
 
-def process_urls_multithreaded(urls, output_filename, file_exists):
+    columnar_store = open_columnar_store(output_filename)
+
+    def mark_flushed(rows):
+        record_flushed(resume_index, rows)
+        if columnar_store is not None:
+            columnar_store.write_batch(rows)
+
+    result_writer = BatchedCSVWriter(output_filename, OUTPUT_FIELDNAMES, on_flush=mark_flushed)
+
+    def on_result(url, record):
+        result_writer.write(record)
+        record_attempt(resume_index, url, 'success')
+        print(f"✅ {record.get('Name', 'N/A')} | {record.get('Phone', 'N/A')} | {url[:60]}...")
+
+    def on_error(url, error):
+        print(f"❌ Error processing {url[:60]}...: {error}")
+        record_attempt(resume_index, url, 'error', str(error))
+        latitude, longitude = extract_coordinates_from_url(url)
+        result_writer.write({'URL': url, 'Name': 'Error', 'Address': 'Error', 'Website': 'Error',
+                             'Phone': 'Error', 'Latitude': latitude, 'Longitude': longitude})
+
+    def on_blocked(url):
+        # Neither saved nor marked done, so a later run retries this URL
+        print(f"🛑 Landed on a consent/captcha page, not saving; will retry on a later run: {url[:60]}...")
+        record_attempt(resume_index, url, 'blocked')
+
+    engine = AsyncScrapeEngine(
+        scrape_data_async, browsers=BROWSERS, tabs_per_browser=TABS_PER_BROWSER,
+        page_timeout=PAGE_TIMEOUT, resource_profile=RESOURCE_PROFILE,
+        on_result=on_result, on_error=on_error, on_blocked=on_blocked
+    )
+
+    try:
+        # Fails here, before any page is scraped, if the output file cannot be opened
+        result_writer.start()
+        counts = engine.run_sync(pending_urls)
+        print(f"\n✅ Asyncio extraction completed: {counts['succeeded']} scraped, {counts['failed']} errors, "
+              f"{counts['blocked']} blocked by consent/captcha (left for retry)")
+    except KeyboardInterrupt:
+        print(f"\n⚠️  Script interrupted by user")
+    except Exception as e:
+        print(f"\n❌ An error occurred: {str(e)}")
+    finally:
+        result_writer.close()
+        if columnar_store is not None:
+            columnar_store.close()
+        if owns_resume_state:
+            close_resume_state(resume_index, output_filename)
+        print(f"✅ Progress saved to {output_filename}")
+
+def process_urls_multithreaded(urls, output_filename, file_exists, resume_index=None):
     """
     Process URLs using multithreading for improved performance
+
+    ``urls`` may be any iterable, including a lazy reader: URLs are pulled only as
+    workers free up, so at most SUBMIT_WINDOW futures exist at any time.
     """
-    # Multithreading configuration
-    MAX_THREADS = 2  # Conservative number to avoid overwhelming Google Maps
+    # State opened here (rather than passed in by main) is closed here
+    owns_resume_state = resume_index is None
+    if owns_resume_state:
+        resume_index = load_resume_state(output_filename)
 
-    # Counters for real-time progress tracking
-    total_urls = len(urls)
+    # Multithreading configuration
+    INITIAL_THREADS = 2  # Conservative start to avoid overwhelming Google Maps
+    MAX_THREADS = 6  # Ceiling the adaptive controller may grow to
+    MAX_PAGES_PER_DRIVER = 50  # Recycle each browser after this many pages
+    SUBMIT_WINDOW = MAX_THREADS * 4  # Futures in flight; keeps memory flat for huge inputs
+
+    # Batched writer configuration
+    CSV_BATCH_SIZE = 25  # Rows per group commit
+    CSV_FLUSH_INTERVAL = 5  # Seconds a row may wait before it is flushed
+    CSV_FSYNC_POLICY = "batch"  # "batch", "close" or "never"
+
+    # Counters for real-time progress tracking (the total is unknown for lazy inputs)
+    total_urls = len(urls) if hasattr(urls, '__len__') else '?'
     processed_new = 0
     skipped_existing = 0
+    blocked_pages = 0
     errors = 0
 
     print(f"\n{'='*80}")
@@ -791,7 +625,8 @@ def process_urls_multithreaded(urls, output_filename, file_exists):
     print(f"{'='*80}")
     print(f"Total URLs to process: {total_urls}")
     print(f"Output file: {output_filename}")
-    print(f"Threads: {MAX_THREADS}")
+    print(f"Threads: adaptive, starting at {INITIAL_THREADS} (max {MAX_THREADS})")
+    print(f"Driver reuse: up to {MAX_PAGES_PER_DRIVER} pages per browser")
     print(f"Mode: Real-time incremental CSV writing with coordinates")
     print("-" * 80)
 
@@ -799,44 +634,100 @@ def process_urls_multithreaded(urls, output_filename, file_exists):
     if not file_exists:
         try:
             with open(output_filename, 'w', newline='', encoding='utf-8') as file:
-                fieldnames = ['URL', 'Name', 'Address', 'Website', 'Phone', 'Store_Type', 'Operating_Status', 'Operating_Hours', 'Rating', 'Review_Count', 'Permanently_Closed', 'Latitude', 'Longitude']
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
+                writer = csv.DictWriter(file, fieldnames=OUTPUT_FIELDNAMES)
                 writer.writeheader()
             print("✅ Created output file with headers")
         except Exception as e:
             print(f"❌ Error creating output file: {e}")
+            if owns_resume_state:
+                close_resume_state(resume_index, output_filename)
             return
 
+    # One long-lived browser per worker thread instead of one per URL
+    driver_pool = DriverPool(create_chrome_driver, safe_driver_quit, max_pages=MAX_PAGES_PER_DRIVER)
+
+    # A single writer thread appends results in batches; URLs enter the resume index once flushed
+    columnar_store = open_columnar_store(output_filename)
+
+    def mark_flushed(rows):
+        record_flushed(resume_index, rows)
+        if columnar_store is not None:
+            columnar_store.write_batch(rows)
+
+    result_writer = BatchedCSVWriter(
+        output_filename, OUTPUT_FIELDNAMES,
+        batch_size=CSV_BATCH_SIZE, flush_interval=CSV_FLUSH_INTERVAL, fsync_policy=CSV_FSYNC_POLICY,
+        on_flush=mark_flushed
+    )
+
+    # AIMD controller: grows active workers while pages are fast and clean, backs off on trouble
+    controller = AdaptiveConcurrency(initial=INITIAL_THREADS, max_workers=MAX_THREADS)
+
+    def process_with_controller(url, thread_id, index):
+        # Threads over the current limit park here without holding a browser
+        if not controller.try_acquire():
+            driver_pool.close_current()
+            controller.acquire()
+
+        started = time.monotonic()
+        result = {'status': 'error', 'url': url}
+        try:
+            result = process_single_url(url, output_filename, thread_id, total_urls, index,
+                                        driver_pool, resume_index, result_writer)
+            return result
+        finally:
+            if result['status'] != 'skipped':
+                elapsed = time.monotonic() - started
+                controller.record(elapsed, ok=result['status'] == 'success',
+                                  blocked=result.get('blocked', False))
+                record_attempt(resume_index, url, result['status'], result.get('error'), elapsed)
+            controller.release()
+
     try:
+        # Fails here, before any page is scraped, if the output file cannot be opened
+        result_writer.start()
+
         # Process URLs using ThreadPoolExecutor
         with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
-            # Submit all URL processing tasks
-            future_to_url = {}
-            for index, url in enumerate(urls, 1):
-                future = executor.submit(process_single_url, url, output_filename,
-                                       index % MAX_THREADS, total_urls, index)
-                future_to_url[future] = (url, index)
-
-            # Process completed tasks
-            for future in as_completed(future_to_url):
-                url, index = future_to_url[future]
-                try:
-                    result = future.result()
+            url_iter = enumerate(urls, 1)
+            in_flight = {}
+
+            def submit_next():
+                # Pull the next URL from the input only when the window has room
+                for index, url in url_iter:
+                    future = executor.submit(process_with_controller, url, index % MAX_THREADS, index)
+                    in_flight[future] = url
+                    return True
+                return False
 
-                    if result['status'] == 'success':
-                        processed_new += 1
-                    elif result['status'] == 'skipped':
-                        skipped_existing += 1
-                    else:
-                        errors += 1
+            while len(in_flight) < SUBMIT_WINDOW and submit_next():
+                pass
+
+            # Process completed tasks, topping the window back up as each one finishes
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = in_flight.pop(future)
+                    submit_next()
+                    try:
+                        result = future.result()
+
+                        if result['status'] == 'success':
+                            processed_new += 1
+                        elif result['status'] == 'skipped':
+                            skipped_existing += 1
+                        elif result['status'] == 'blocked':
+                            blocked_pages += 1
+                        else:
+                            errors += 1
 
-                    # Progress update
-                    completed = processed_new + skipped_existing + errors
-                    print(f"📊 Progress: {completed}/{total_urls} | New: {processed_new} | Skipped: {skipped_existing} | Errors: {errors}")
+                        # Progress update
+                        completed = processed_new + skipped_existing + blocked_pages + errors
+                        print(f"📊 Progress: {completed}/{total_urls} | New: {processed_new} | Skipped: {skipped_existing} | Blocked: {blocked_pages} | Errors: {errors}")
 
-                except Exception as e:
-                    errors += 1
-                    print(f"❌ Thread execution error for {url}: {str(e)}")
+                    except Exception as e:
+                        errors += 1
+                        print(f"❌ Thread execution error for {url}: {str(e)}")
 
     except KeyboardInterrupt:
         print(f"\n⚠️  Script interrupted by user")
@@ -846,6 +737,13 @@ def process_urls_multithreaded(urls, output_filename, file_exists):
         print(f"✅ Progress saved: {processed_new} URLs processed and saved to {output_filename}")
 
     finally:
+        driver_pool.close_all()
+        result_writer.close()
+        if columnar_store is not None:
+            columnar_store.close()
+        if owns_resume_state:
+            close_resume_state(resume_index, output_filename)
+
         # Final summary
         print(f"\n{'='*80}")
         print(f"MULTITHREADED EXTRACTION COMPLETED!")
@@ -853,9 +751,10 @@ def process_urls_multithreaded(urls, output_filename, file_exists):
         print(f"Total URLs: {total_urls}")
         print(f"New URLs processed: {processed_new}")
         print(f"Already existing (skipped): {skipped_existing}")
+        print(f"Blocked by consent/captcha (left for retry): {blocked_pages}")
         print(f"Errors encountered: {errors}")
         print(f"Output file: {output_filename}")
-        print(f"Threads used: {MAX_THREADS}")
+        print(f"Final concurrency limit: {controller.limit} (max {MAX_THREADS})")
 
         # Count final records in output file
         try:
@@ -871,14 +770,14 @@ def process_urls_multithreaded(urls, output_filename, file_exists):
 
         print("="*80)
 
-def create_chrome_driver(thread_id=0):
+def create_chrome_driver(thread_id=0, resource_profile=RESOURCE_PROFILE):
     """
     Create a Chrome driver with improved version compatibility and thread safety using standard Selenium
+
+    Images, fonts, media and map tiles are blocked according to ``resource_profile``.
     """
-    # Detect Chrome version for better compatibility
-    chrome_version = get_chrome_version()
-    if chrome_version:
-        print(f"🔍 Detected Chrome version: {chrome_version}")
+    # Browser, version and chromedriver are resolved once per process (cached on disk)
+    browser = discover_browser()
 
     def create_chrome_options(thread_id, suffix=""):
         """Create fresh Chrome options to avoid reuse errors"""
@@ -893,22 +792,33 @@ def create_chrome_driver(thread_id=0):
         #options.add_argument('--disable-plugins')
         #options.add_argument('--disable-images')
         #options.add_argument('--disable-javascript')
-        # Use Windows-compatible temp directory path
-        temp_profile = f"C:\\temp\\chrome_profile_{thread_id}_{suffix}_{int(time.time())}"
-        options.add_argument(f'--user-data-dir={temp_profile}')
+        # Fresh clone of the warm template profile, deleted again when the driver quits
+        profile_dir = profile_manager.clone(f"{thread_id}_{suffix}", warm=warm_with_selenium)
+        attempt_profiles.append(profile_dir)
+        options.add_argument(f'--user-data-dir={profile_dir}')
+        apply_resource_options(options, resource_profile)
         return options
 
+    attempt_profiles = []
+
+    def finish(driver):
+        # Keep the profile this driver runs on; discard those of failed attempts
+        driver.profile_dir = attempt_profiles.pop()
+        for profile_dir in attempt_profiles:
+            profile_manager.release(profile_dir)
+        return apply_resource_policy(driver, resource_profile)
+
     driver = None
 
-    # Method 1: Try with webdriver-manager for automatic version management
-    if WEBDRIVER_MANAGER_AVAILABLE:
+    # Method 1: Try the ChromeDriver found by browser discovery (webdriver-manager or PATH)
+    if browser['driver_path']:
         try:
-            print(f"🔄 [Thread {thread_id}] Trying webdriver-manager for automatic ChromeDriver management...")
-            service = Service(ChromeDriverManager().install())
+            print(f"🔄 [Thread {thread_id}] Trying discovered ChromeDriver {browser['driver_path']}...")
+            service = Service(browser['driver_path'])
             options = create_chrome_options(thread_id, "webdriver_manager")
             driver = webdriver.Chrome(service=service, options=options)
-            print(f"✅ [Thread {thread_id}] Successfully created Chrome driver using webdriver-manager")
-            return driver
+            print(f"✅ [Thread {thread_id}] Successfully created Chrome driver using discovered ChromeDriver")
+            return finish(driver)
         except Exception as e:
             print(f"❌ [Thread {thread_id}] webdriver-manager failed: {e}")
 
@@ -919,7 +829,7 @@ def create_chrome_driver(thread_id=0):
             options = create_chrome_options(thread_id, "system")
             driver = webdriver.Chrome(options=options)
             print(f"✅ [Thread {thread_id}] Successfully created Chrome driver using system ChromeDriver")
-            return driver
+            return finish(driver)
         except Exception as e:
             print(f"❌ [Thread {thread_id}] System ChromeDriver failed: {e}")
 
@@ -942,14 +852,14 @@ def create_chrome_driver(thread_id=0):
                         service = Service(path)
                         driver = webdriver.Chrome(service=service, options=options)
                         print(f"✅ [Thread {thread_id}] Successfully created Chrome driver using {path}")
-                        return driver
+                        return finish(driver)
                 except Exception:
                     continue
 
             # If no specific path works, try without service
             driver = webdriver.Chrome(options=options)
             print(f"✅ [Thread {thread_id}] Successfully created Chrome driver with default service")
-            return driver
+            return finish(driver)
 
         except Exception as e:
             print(f"❌ [Thread {thread_id}] Explicit ChromeDriver service failed: {e}")
@@ -961,32 +871,60 @@ def create_chrome_driver(thread_id=0):
         print("2. Install/update webdriver-manager: pip install --upgrade webdriver-manager")
         print("3. Download ChromeDriver from: https://chromedriver.chromium.org/downloads")
         print("4. Ensure ChromeDriver is in your PATH or place chromedriver.exe in the script directory")
+        for profile_dir in attempt_profiles:
+            profile_manager.release(profile_dir)
         raise Exception("Failed to create Chrome driver with all methods")
 
     return driver
 
-def process_single_url(url, output_filename, thread_id, total_urls, current_index):
+def process_single_url(url, output_filename, thread_id, total_urls, current_index, driver_pool=None,
+                       resume_index=None, result_writer=None):
     """
     Process a single URL in a thread-safe manner
+
+    When a DriverPool is given the thread's pooled browser is reused, otherwise
+    a driver is created for this URL and quit afterwards. When a ResumeIndex (or
+    StateStore) is given it answers the already-processed check and is updated after each append;
+    otherwise the output file is scanned. When a BatchedCSVWriter is given results
+    are queued to it (it updates the index itself once rows are flushed) instead
+    of being appended directly.
     """
-    driver = None
     try:
         print(f"\n[Thread {thread_id}] [{current_index}/{total_urls}] Processing URL: {url}")
 
         # Check if this URL was already processed (thread-safe check)
-        if check_url_already_processed(url, output_filename):
+        if resume_index is not None:
+            already_processed = url in resume_index
+        else:
+            already_processed = check_url_already_processed(url, output_filename)
+
+        if already_processed:
             print(f"[Thread {thread_id}] ⏭️  Skipping - already processed")
             return {'status': 'skipped', 'url': url}
 
-        # Create driver for this thread
-        driver = create_chrome_driver(thread_id)
-        wait = WebDriverWait(driver, 15)
+        blocked = False
+        result = fetch_place_data(url) if HTTP_FETCH_FIRST else None
+        if result is not None:
+            print(f"[Thread {thread_id}] ⚡ Parsed from page payload without a browser")
+        elif driver_pool is not None:
+            with driver_pool.checkout(thread_id) as driver:
+                result = scrape_data(url, driver, WebDriverWait(driver, 15))
+                blocked = is_block_page(driver.current_url)
+        else:
+            driver = create_chrome_driver(thread_id)
+            try:
+                result = scrape_data(url, driver, WebDriverWait(driver, 15))
+                blocked = is_block_page(driver.current_url)
+            finally:
+                safe_driver_quit(driver)
 
-        # Extract data from the URL
-        result = scrape_data(url, driver, wait)
+        if blocked:
+            # Neither saved nor marked done, so a later run retries this URL
+            print(f"[Thread {thread_id}] 🛑 Landed on a consent/captcha page, not saving; will retry on a later run")
+            return {'status': 'blocked', 'url': url, 'blocked': True}
 
         # Thread-safe CSV writing
-        success = append_result_to_csv(result, output_filename, write_header=False)
+        success = save_result(result, output_filename, resume_index, result_writer)
 
         if success:
             print(f"[Thread {thread_id}] ✅ Extracted and saved: {result.get('Name', 'N/A')}")
@@ -1013,17 +951,12 @@ def process_single_url(url, output_filename, thread_id, total_urls, current_inde
                 'Latitude': latitude,
                 'Longitude': longitude
             }
-            append_result_to_csv(error_result, output_filename, write_header=False)
+            save_result(error_result, output_filename, resume_index, result_writer)
         except:
             pass
 
         return {'status': 'error', 'url': url, 'error': str(e)}
 
-    finally:
-        # Clean up driver
-        if driver:
-            safe_driver_quit(driver)
-
 
 
 if __name__ == "__main__":
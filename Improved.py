@@ -1,7 +1,4 @@
-import re
-import math
 import csv
-import time
 import pandas as pd
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
@@ -9,68 +6,24 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
-# ---------------------------
-# Utility: extract lat/lon from Google Maps URL
-# ---------------------------
-def extract_coordinates_from_url(url):
-    """
-    Extract latitude and longitude coordinates from Google Maps URL
-
-    Args:
-        url (str): Google Maps URL containing coordinates
-
-    Returns:
-        tuple: (latitude, longitude) as floats, or (None, None) if not found
-    """
-    try:
-        # Use regex to find latitude (3d parameter) and longitude (4d parameter)
-        lat_pattern = r'3d([+-]?\d+\.?\d*)'
-        lng_pattern = r'4d([+-]?\d+\.?\d*)'
-
-        lat_match = re.search(lat_pattern, url)
-        lng_match = re.search(lng_pattern, url)
-
-        if lat_match and lng_match:
-            latitude = float(lat_match.group(1))
-            longitude = float(lng_match.group(1))
-            print(f"    ✅ Coordinates extracted: {latitude}, {longitude}")
-            return latitude, longitude
-        else:
-            # Fallback to original pattern for URLs with @lat,lon format
-            match = re.search(r'/@([-+]?\d+\.\d+),([-+]?\d+\.\d+)', url)
-            if match:
-                latitude = float(match.group(1))
-                longitude = float(match.group(2))
-                print(f"    ✅ Coordinates extracted (fallback): {latitude}, {longitude}")
-                return latitude, longitude
-            else:
-                print(f"    ❌ No coordinates found in URL")
-                return None, None
-    except Exception as e:
-        print(f"    ❌ Error extracting coordinates: {str(e)}")
-        return None, None
-
-
-# ---------------------------
-# Utility: Haversine distance
-# ---------------------------
-def haversine(lat1, lon1, lat2, lon2):
-    R = 6371  # km
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-
-    a = (math.sin(dphi / 2) ** 2 +
-         math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2)
-    return 2 * R * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
+from coordinates import parse_coordinates
+from geo_distance import within_radius
+from page_readiness import wait_until_ready
+from place_keys import PlaceKeySet
+from results_feed import (SEARCH_READY_SELECTOR, FeedProgress, harvest_new_results, read_feed_state,
+                          scroll_and_wait)
 
 # ---------------------------
 # Load existing URLs from CSV files for deduplication
 # ---------------------------
 def load_existing_urls(all_urls_csv, filtered_csv):
-    """Load existing URLs from both CSV files to avoid duplicates"""
-    existing_urls = set()
+    """
+    Load existing URLs from both CSV files to avoid duplicates
+
+    Returns a PlaceKeySet, so membership is by place (feature ID) rather than
+    by the exact URL string.
+    """
+    existing_urls = PlaceKeySet()
 
     # Load from all_scraped_urls.csv
     try:
@@ -107,8 +60,14 @@ def load_existing_urls(all_urls_csv, filtered_csv):
 # ---------------------------
 # Scrape Google Maps for each search term (collect ALL URLs)
 # ---------------------------
-def scrape_all_places(search_item, search_lat, search_lon, all_urls_csv="all_scraped_urls.csv", filtered_csv="filtered_places.csv"):
-    """Scrape all URLs with incremental CSV writing, deduplication, and detailed debugging"""
+def scrape_all_places(search_item, search_lat, search_lon, all_urls_csv="all_scraped_urls.csv", filtered_csv="filtered_places.csv",
+                      target_count=None):
+    """
+    Scrape all URLs with incremental CSV writing, deduplication, and detailed debugging
+
+    Scrolling stops at the end of the results list, when the feed stops growing,
+    or once ``target_count`` results have been seen.
+    """
     urls_data = []
     driver = uc.Chrome(headless=False)
 
@@ -136,15 +95,14 @@ def scrape_all_places(search_item, search_lat, search_lon, all_urls_csv="all_scr
         query = f'https://www.google.com/maps/search/"{search_item}"/@{search_lat},{search_lon},13000m'
         print(f"🌐 Loading: {query}")
         driver.get(query)
-        time.sleep(5)
+        wait_until_ready(driver, timeout=15, selector=SEARCH_READY_SELECTOR)
 
-        urls = set()
-        scroll_pause_time = 2
-        scroll_attempts = 0
-        max_attempts = 10
-        urls_found_this_scroll = 0
+        urls = PlaceKeySet()
+        max_attempts = 60  # Ceiling only; the loop normally stops at the end of the feed
+        progress = FeedProgress(max_attempts, target_count=target_count)
+        feed_state = read_feed_state(driver)
 
-        while scroll_attempts < max_attempts:
+        while True:
             try:
                 # Try multiple selectors for the scrollable div
                 scrollable_div = None
@@ -179,28 +137,23 @@ def scrape_all_places(search_item, search_lat, search_lon, all_urls_csv="all_scr
                     ".hfpxzc"
                 ]
 
-                for selector in place_selectors:
-                    found_places = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if found_places:
-                        places.extend(found_places)
-                        print(f"  ✅ Found {len(found_places)} places with selector: {selector}")
+                # One script call returns the deduplicated hrefs that appeared since the last scroll
+                harvested = harvest_new_results(driver, place_selectors)
+                if harvested is None:
+                    for selector in place_selectors:
+                        found_places = driver.find_elements(By.CSS_SELECTOR, selector)
+                        if found_places:
+                            places.extend(found_places)
+                            print(f"  ✅ Found {len(found_places)} places with selector: {selector}")
+                    harvested = [{'href': place.get_attribute("href")} for place in places]
 
-                # Remove duplicates based on href
-                unique_places = []
-                seen_hrefs = set()
-                for place in places:
-                    href = place.get_attribute("href")
-                    if href and href not in seen_hrefs:
-                        unique_places.append(place)
-                        seen_hrefs.add(href)
-
-                places = unique_places
-                print(f"  📍 Scroll {scroll_attempts + 1}/{max_attempts}: Found {len(places)} unique place elements")
+                places = [place['href'] for place in harvested if place['href']]
+                print(f"  📍 Scroll {progress.scrolls + 1}: Found {len(places)} new place elements")
 
                 new_urls_this_scroll = 0
-                for place in places:
-                    url = place.get_attribute("href")
-                    if url and url not in urls:
+                batch_urls, batch_lats, batch_lons = [], [], []
+                for url in places:
+                    if url not in urls:
                         urls.add(url)
 
                         # Check if URL already exists in previous runs
@@ -214,60 +167,59 @@ def scrape_all_places(search_item, search_lat, search_lon, all_urls_csv="all_scr
 
                         print(f"    🔗 Processing NEW URL #{len(urls)}: {url[:80]}...")
 
-                        url_lat, url_lon = extract_coordinates_from_url(url)
+                        url_lat, url_lon = parse_coordinates(url)
 
                         if url_lat is not None and url_lon is not None:
-                            distance = haversine(search_lat, search_lon, url_lat, url_lon)
-                            within_7km = "YES" if distance <= 7 else "NO"
-
-                            url_data = {
-                                "search_item": search_item,
-                                "search_lat": search_lat,
-                                "search_lon": search_lon,
-                                "url": url,
-                                "url_lat": url_lat,
-                                "url_lon": url_lon,
-                                "distance_km": round(distance, 2),
-                                "within_7km": within_7km
-                            }
-
-                            urls_data.append(url_data)
-
+                            batch_urls.append(url)
+                            batch_lats.append(url_lat)
+                            batch_lons.append(url_lon)
                             # Add to existing URLs set to prevent duplicates within this session
                             existing_urls.add(url)
-
-                            # Append to all_scraped_urls.csv immediately
-                            pd.DataFrame([url_data]).to_csv(all_urls_csv, mode='a', header=False, index=False)
-
-                            # Also append to filtered CSV if within 7km
-                            if within_7km == "YES":
-                                pd.DataFrame([url_data]).to_csv(filtered_csv, mode='a', header=False, index=False)
-
-                            print(f"    📊 Distance: {distance:.2f} km | Within 7km: {within_7km}")
                         else:
                             print(f"    ⚠️ Skipping URL - coordinates not found")
 
-                print(f"  ➕ New URLs this scroll: {new_urls_this_scroll}")
+                if batch_urls:
+                    # Distances for the whole scroll batch in one vectorized pass
+                    distances, within = within_radius(search_lat, search_lon, batch_lats, batch_lons)
+                    batch_data = [{
+                        "search_item": search_item,
+                        "search_lat": search_lat,
+                        "search_lon": search_lon,
+                        "url": url,
+                        "url_lat": url_lat,
+                        "url_lon": url_lon,
+                        "distance_km": round(float(distance), 2),
+                        "within_7km": "YES" if is_within else "NO"
+                    } for url, url_lat, url_lon, distance, is_within
+                        in zip(batch_urls, batch_lats, batch_lons, distances, within)]
+                    urls_data.extend(batch_data)
+
+                    # Append the batch to all_scraped_urls.csv, and the nearby places to the filtered CSV
+                    batch_df = pd.DataFrame(batch_data)
+                    batch_df.to_csv(all_urls_csv, mode='a', header=False, index=False)
+                    if within.any():
+                        batch_df[within].to_csv(filtered_csv, mode='a', header=False, index=False)
+
+                    for row in batch_data:
+                        print(f"    📊 {row['url'][:60]}... Distance: {row['distance_km']:.2f} km | "
+                              f"Within 7km: {row['within_7km']}")
 
-                # If no new URLs found in this scroll, we might be done
-                if new_urls_this_scroll == 0:
-                    print(f"  🔄 No new URLs found, continuing to scroll...")
+                print(f"  ➕ New URLs this scroll: {new_urls_this_scroll}")
 
-                # Scroll down using multiple methods
-                if scrollable_div:
-                    try:
-                        driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", scrollable_div)
-                    except Exception:
-                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                else:
-                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                # Stop at the end of the feed, on a stalled feed or at the target count
+                stop_reason = progress.update(feed_state, len(urls), new_urls_this_scroll)
+                if stop_reason:
+                    print(f"  🛑 Stopped scrolling: {stop_reason}")
+                    break
 
-                time.sleep(scroll_pause_time)
-                scroll_attempts += 1
+                # Scroll down and wait for the feed to grow instead of sleeping
+                feed_state = scroll_and_wait(driver, scrollable_div)
 
             except Exception as e:
                 print(f"  ❌ Scroll error: {str(e)}")
-                scroll_attempts += 1
+                if progress.update(None, len(urls), 0):
+                    break
+                feed_state = scroll_and_wait(driver)
 
     except Exception as e:
         print(f"❌ Error for {search_item}: {str(e)}")
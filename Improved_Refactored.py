@@ -1,12 +1,11 @@
-import re
-import math
 import csv
-import time
 import logging
+import threading
 from pathlib import Path
-from typing import Tuple, Optional, Dict, List, Set
+from typing import Callable, Tuple, Optional, Dict, List
 from dataclasses import dataclass
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import pandas as pd
 import undetected_chromedriver as uc
@@ -16,6 +15,19 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.chrome.options import Options
 
+from columnar_store import PYARROW_AVAILABLE, SEARCH_RESULT_FIELDS, ColumnarStore, columnar_path
+from coordinates import parse_coordinates
+from driver_pool import DriverPool
+from geo_distance import DISTANCE_THRESHOLD_KM, haversine_km, within_radius
+from page_readiness import wait_until_ready
+from place_keys import PlaceKeySet
+from seen_store import SeenStore
+from state_store import StateStore, state_path
+from tiling import Tile, TilingPlanner
+from resource_policy import apply_resource_options, apply_resource_policy
+from results_feed import (SEARCH_READY_SELECTOR, FeedProgress, harvest_new_results, read_feed_state,
+                          scroll_and_wait)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,10 +41,17 @@ logger = logging.getLogger(__name__)
 
 # Constants
 DEFAULT_SCROLL_PAUSE_TIME = 2
-MAX_SCROLL_ATTEMPTS = 10
-DISTANCE_THRESHOLD_KM = 7
-EARTH_RADIUS_KM = 6371
+MAX_SCROLL_ATTEMPTS = 60  # Ceiling only; the loop normally stops at the end of the feed
+SEARCH_LOAD_TIMEOUT = 15
+TARGET_RESULT_COUNT = None  # Stop a search once this many results were seen (None = all)
 SEARCH_RADIUS_METERS = 13000
+ADAPTIVE_TILING = True  # Re-search saturated areas as smaller cells, see tiling.py
+RESOURCE_PROFILE = "search_results"  # see resource_policy.RESOURCE_PROFILES
+SEEN_STORE_SUFFIX = ".seen"  # Persistent place-hash set kept next to the all-URLs CSV
+SEEN_STORE_BLOOM = True
+COLUMNAR_OUTPUT = True  # Also keep a Parquet dataset of all URLs next to the CSV (needs pyarrow)
+MAX_SEARCH_BROWSERS = 3  # Browsers running searches concurrently
+MAX_SEARCHES_PER_BROWSER = 20  # Recycle a browser after this many searches
 
 # CSS Selectors
 SCROLLABLE_SELECTORS = [
@@ -61,6 +80,8 @@ class PlaceData:
     url_lon: Optional[float] = None
     distance_km: Optional[float] = None
     within_7km: str = "NO"
+    name: Optional[str] = None  # As shown in the results feed; not written to CSV
+    rating: Optional[str] = None
 
 class MapsScraperError(Exception):
     """Custom exception for Maps Scraper errors"""
@@ -80,37 +101,13 @@ class CoordinateExtractor:
         Returns:
             tuple: (latitude, longitude) as floats, or (None, None) if not found
         """
-        try:
-            # Primary pattern: 3d(lat) and 4d(lon)
-            lat_pattern = r'3d([+-]?\d+\.?\d*)'
-            lng_pattern = r'4d([+-]?\d+\.?\d*)'
-            
-            lat_match = re.search(lat_pattern, url)
-            lng_match = re.search(lng_pattern, url)
-            
-            if lat_match and lng_match:
-                latitude = float(lat_match.group(1))
-                longitude = float(lng_match.group(1))
-                logger.debug(f"Coordinates extracted: {latitude}, {longitude}")
-                return latitude, longitude
-            
-            # Fallback pattern: @lat,lon
-            fallback_match = re.search(r'/@([-+]?\d+\.\d+),([-+]?\d+\.\d+)', url)
-            if fallback_match:
-                latitude = float(fallback_match.group(1))
-                longitude = float(fallback_match.group(2))
-                logger.debug(f"Coordinates extracted (fallback): {latitude}, {longitude}")
-                return latitude, longitude
-            
-            logger.warning(f"No coordinates found in URL: {url[:50]}...")
-            return None, None
-            
-        except (ValueError, AttributeError) as e:
-            logger.error(f"Error extracting coordinates from URL: {str(e)}")
-            return None, None
+        latitude, longitude = parse_coordinates(url)
+        if latitude is None:
+            logger.warning(f"No coordinates found in URL: {str(url)[:50]}...")
+        return latitude, longitude
 
 class DistanceCalculator:
-    """Handles distance calculations using Haversine formula"""
+    """Handles distance calculations using the Haversine formula (vectorized, see geo_distance)"""
     
     @staticmethod
     def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -125,68 +122,118 @@ class DistanceCalculator:
             float: Distance in kilometers
         """
         try:
-            # Convert decimal degrees to radians
-            phi1, phi2 = math.radians(lat1), math.radians(lat2)
-            dphi = math.radians(lat2 - lat1)
-            dlambda = math.radians(lon2 - lon1)
-            
-            # Haversine formula
-            a = (math.sin(dphi / 2) ** 2 +
-                 math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2)
-            
-            return 2 * EARTH_RADIUS_KM * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-            
+            return float(haversine_km(lat1, lon1, lat2, lon2))
         except (ValueError, TypeError) as e:
             logger.error(f"Error calculating distance: {str(e)}")
             raise MapsScraperError(f"Invalid coordinates for distance calculation: {str(e)}")
+    
+    @staticmethod
+    def within_threshold(center_lat: float, center_lon: float, lats: List[float], lons: List[float],
+                         radius_km: float = DISTANCE_THRESHOLD_KM):
+        """
+        Distances from the search center to a batch of places, and the within-threshold mask
+        
+        Returns:
+            Tuple of (distances_km, mask) arrays aligned with the inputs
+        """
+        try:
+            return within_radius(center_lat, center_lon, lats, lons, radius_km)
+        except (ValueError, TypeError) as e:
+            logger.error(f"Error calculating distances: {str(e)}")
+            raise MapsScraperError(f"Invalid coordinates for distance calculation: {str(e)}")
 
 class URLManager:
-    """Manages URL deduplication and CSV operations"""
+    """
+    Manages URL deduplication and CSV operations (safe to share between threads)
+    
+    Places saved in earlier runs live in a memory-mapped SeenStore of 64-bit
+    place-key hashes, so startup does not re-read the CSVs. The store records
+    how far it has read each CSV; at startup it reads only rows appended since
+    (e.g. by Improved.py), and it is rebuilt when a CSV was recreated or
+    rewritten. Places claimed during this run are tracked in memory and enter
+    the store once their row has been written.
+    """
     
-    def __init__(self, all_urls_csv: str, filtered_csv: str):
+    def __init__(self, all_urls_csv: str, filtered_csv: str, seen_store_path: Optional[str] = None,
+                 columnar_store: Optional[ColumnarStore] = None):
         self.all_urls_csv = all_urls_csv
         self.filtered_csv = filtered_csv
-        self.existing_urls: Set[str] = set()
-        self._initialize_csv_files()
+        # Optional Parquet copy of every saved place (see columnar_store.py)
+        self.columnar_store = columnar_store
+        # Keyed by place (feature ID), not by URL string; see place_keys.place_key
+        self.existing_urls = PlaceKeySet()
+        self._write_lock = threading.Lock()
+        created = self._initialize_csv_files()
+        
+        store_path = seen_store_path or all_urls_csv + SEEN_STORE_SUFFIX
+        if created:
+            SeenStore.remove(store_path)
+        self.seen_store = SeenStore(store_path, use_bloom=SEEN_STORE_BLOOM)
+        if any(self.seen_store.csv_rewritten(csv_file) for csv_file in self._csv_files()):
+            logger.info("CSV files were rewritten since the seen-store was built; rebuilding it")
+            self.seen_store.close()
+            SeenStore.remove(store_path)
+            self.seen_store = SeenStore(store_path, use_bloom=SEEN_STORE_BLOOM)
         self._load_existing_urls()
+        logger.info(f"Total unique places already processed: {len(self.seen_store)}")
+    
+    def _csv_files(self) -> List[str]:
+        return [self.all_urls_csv, self.filtered_csv]
     
-    def _initialize_csv_files(self) -> None:
-        """Initialize CSV files with headers if they don't exist"""
+    def _initialize_csv_files(self) -> bool:
+        """Initialize CSV files with headers if they don't exist; True if any was created"""
         headers = [
             "search_item", "search_lat", "search_lon", "url",
             "url_lat", "url_lon", "distance_km", "within_7km"
         ]
         
+        created = False
         for csv_file in [self.all_urls_csv, self.filtered_csv]:
             if not Path(csv_file).exists():
                 pd.DataFrame(columns=headers).to_csv(csv_file, index=False)
                 logger.info(f"Created new CSV file: {csv_file}")
+                created = True
+        return created
     
     def _load_existing_urls(self) -> None:
-        """Load existing URLs from both CSV files to avoid duplicates"""
+        """Add the URLs appended to both CSV files since the seen-store last read them"""
         for csv_file, description in [(self.all_urls_csv, "all URLs"), (self.filtered_csv, "filtered URLs")]:
             try:
                 if Path(csv_file).exists():
-                    df = pd.read_csv(csv_file)
-                    if 'url' in df.columns:
-                        urls = set(df['url'].dropna())
-                        self.existing_urls.update(urls)
-                        logger.info(f"Loaded {len(urls)} existing {description}")
-                    else:
-                        logger.warning(f"No 'url' column found in {csv_file}")
+                    loaded = self.seen_store.sync_csv(csv_file, url_column='url')
+                    if loaded:
+                        logger.info(f"Loaded {loaded} new {description}")
             except Exception as e:
                 logger.error(f"Error reading {csv_file}: {str(e)}")
-        
-        logger.info(f"Total unique URLs already processed: {len(self.existing_urls)}")
+        self.seen_store.compact()
+    
+    def close(self) -> None:
+        """Fold this run's places into the sorted seen-store file and flush the columnar copy"""
+        # Mark this run's rows (and any another process appended) as read
+        self._load_existing_urls()
+        self.seen_store.close()
+        if self.columnar_store is not None:
+            self.columnar_store.close()
     
     def is_duplicate(self, url: str) -> bool:
-        """Check if URL has already been processed"""
-        return url in self.existing_urls
+        """Check if the place behind a URL has already been processed"""
+        return url in self.existing_urls or url in self.seen_store
     
     def add_url(self, url: str) -> None:
-        """Add URL to the set of processed URLs"""
+        """Add the place behind a URL to the set of processed places"""
         self.existing_urls.add(url)
     
+    def claim_url(self, url: str) -> bool:
+        """
+        Atomically mark the place behind a URL as processed
+        
+        Returns:
+            True if this caller claimed the place, False if another search already had it
+        """
+        if url in self.seen_store:
+            return False
+        return self.existing_urls.claim(url)
+    
     def save_place_data(self, place_data: PlaceData) -> None:
         """Save place data to appropriate CSV files"""
         try:
@@ -202,31 +249,54 @@ class URLManager:
                 "within_7km": place_data.within_7km
             }
             
-            # Save to all URLs CSV
-            pd.DataFrame([data_dict]).to_csv(self.all_urls_csv, mode='a', header=False, index=False)
+            with self._write_lock:
+                # Save to all URLs CSV
+                pd.DataFrame([data_dict]).to_csv(self.all_urls_csv, mode='a', header=False, index=False)
+                
+                # Save to filtered CSV if within threshold
+                if place_data.within_7km == "YES":
+                    pd.DataFrame([data_dict]).to_csv(self.filtered_csv, mode='a', header=False, index=False)
             
-            # Save to filtered CSV if within threshold
-            if place_data.within_7km == "YES":
-                pd.DataFrame([data_dict]).to_csv(self.filtered_csv, mode='a', header=False, index=False)
+            # Only now is the place durable, so only now may later runs skip it
+            self.seen_store.add(place_data.url)
+            if self.columnar_store is not None:
+                self.columnar_store.write(data_dict)
                 
         except Exception as e:
             logger.error(f"Error saving place data: {str(e)}")
             raise MapsScraperError(f"Failed to save place data: {str(e)}")
 
+# undetected_chromedriver patches the driver binary on start; never do that from two threads at once
+_driver_creation_lock = threading.Lock()
+
+def create_driver(headless: bool = False, resource_profile: str = RESOURCE_PROFILE):
+    """Start an undetected Chrome instance with the given resource profile"""
+    options = Options()
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    apply_resource_options(options, resource_profile)
+    
+    with _driver_creation_lock:
+        driver = uc.Chrome(options=options)
+    return apply_resource_policy(driver, resource_profile)
+
+def quit_driver(driver) -> None:
+    """Quit a driver, logging instead of raising if the browser is already gone"""
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.warning(f"Error quitting driver: {str(e)}")
+
 @contextmanager
-def webdriver_context(headless: bool = False):
+def webdriver_context(headless: bool = False, resource_profile: str = RESOURCE_PROFILE):
     """Context manager for WebDriver lifecycle"""
     driver = None
     try:
-        options = Options()
-        if headless:
-            options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920,1080")
-        
-        driver = uc.Chrome(options=options)
+        driver = create_driver(headless, resource_profile)
         yield driver
     except Exception as e:
         logger.error(f"WebDriver error: {str(e)}")
@@ -256,6 +326,19 @@ class MapsScraper:
                 continue
         return None
     
+    def _harvest_places(self, driver, seen_hrefs: PlaceKeySet) -> List[Dict]:
+        """
+        Return feed results not seen earlier in this search as {href, name, rating} dicts
+        
+        Uses a single script call; falls back to per-element lookups if it fails.
+        """
+        places = harvest_new_results(driver, PLACE_SELECTORS)
+        if places is None:
+            logger.warning("Bulk feed harvest failed, falling back to element lookups")
+            places = [{'href': element.get_attribute("href"), 'name': '', 'rating': ''}
+                      for element in self._find_place_elements(driver)]
+        return [place for place in places if place['href'] and place['href'] not in seen_hrefs]
+    
     def _find_place_elements(self, driver) -> List:
         """Find all place elements on the page"""
         places = []
@@ -279,59 +362,60 @@ class MapsScraper:
         
         return unique_places
     
-    def _process_place(self, place, search_item: str, search_lat: float, search_lon: float) -> Optional[PlaceData]:
-        """Process a single place element"""
-        url = place.get_attribute("href")
-        if not url:
-            return None
-        
-        # Check for duplicates
-        if self.url_manager.is_duplicate(url):
-            logger.debug(f"Skipping duplicate URL: {url[:50]}...")
-            return None
-        
-        # Extract coordinates
-        url_lat, url_lon = self.coordinate_extractor.extract_coordinates_from_url(url)
-        if url_lat is None or url_lon is None:
-            logger.warning(f"Skipping URL - coordinates not found: {url[:50]}...")
-            return None
-        
-        # Calculate distance
-        try:
-            distance = self.distance_calculator.haversine(search_lat, search_lon, url_lat, url_lon)
-            within_7km = "YES" if distance <= DISTANCE_THRESHOLD_KM else "NO"
+    def _process_places(self, places: List[Dict], search_item: str, search_lat: float,
+                        search_lon: float) -> List[PlaceData]:
+        """Process one scroll's harvested feed results, computing their distances in a single pass"""
+        candidates = []
+        for place in places:
+            url = place.get('href')
+            if not url:
+                continue
+            
+            # Check for duplicates
+            if self.url_manager.is_duplicate(url):
+                logger.debug(f"Skipping duplicate URL: {url[:50]}...")
+                continue
             
-            place_data = PlaceData(
+            # Extract coordinates
+            url_lat, url_lon = self.coordinate_extractor.extract_coordinates_from_url(url)
+            if url_lat is None or url_lon is None:
+                logger.warning(f"Skipping URL - coordinates not found: {url[:50]}...")
+                continue
+            candidates.append((place, url, url_lat, url_lon))
+        
+        if not candidates:
+            return []
+        
+        # Calculate distances for the whole batch
+        try:
+            distances, within = self.distance_calculator.within_threshold(
+                search_lat, search_lon, [c[2] for c in candidates], [c[3] for c in candidates])
+        except MapsScraperError as e:
+            logger.error(f"Error processing places: {str(e)}")
+            return []
+        
+        places_data = []
+        for (place, url, url_lat, url_lon), distance, is_within in zip(candidates, distances, within):
+            # Another search running in parallel may have reached this URL first
+            if not self.url_manager.claim_url(url):
+                continue
+            places_data.append(PlaceData(
                 search_item=search_item,
                 search_lat=search_lat,
                 search_lon=search_lon,
                 url=url,
                 url_lat=url_lat,
                 url_lon=url_lon,
-                distance_km=round(distance, 2),
-                within_7km=within_7km
-            )
-            
-            self.url_manager.add_url(url)
-            return place_data
-            
-        except MapsScraperError as e:
-            logger.error(f"Error processing place: {str(e)}")
-            return None
-    
-    def _scroll_page(self, driver, scrollable_element) -> None:
-        """Scroll the page to load more results"""
-        try:
-            if scrollable_element:
-                driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", scrollable_element)
-            else:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        except Exception as e:
-            logger.warning(f"Error scrolling: {str(e)}")
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                distance_km=round(float(distance), 2),
+                within_7km="YES" if is_within else "NO",
+                name=place.get('name') or None,
+                rating=place.get('rating') or None
+            ))
+        return places_data
     
     def scrape_places(self, search_item: str, search_lat: float, search_lon: float, 
-                     headless: bool = False) -> List[PlaceData]:
+                     headless: bool = False, driver=None,
+                     target_count: Optional[int] = TARGET_RESULT_COUNT) -> List[PlaceData]:
         """
         Scrape all places for a given search term and location
         
@@ -340,66 +424,185 @@ class MapsScraper:
             search_lat: Search center latitude
             search_lon: Search center longitude
             headless: Whether to run browser in headless mode
+            driver: Existing browser to search in; a new one is started and quit if omitted
+            target_count: Stop once this many results were seen in the feed (None = all)
             
         Returns:
             List of PlaceData objects
         """
+        if driver is None:
+            with webdriver_context(headless=headless) as driver:
+                return self._scrape_with_driver(driver, search_item, search_lat, search_lon, target_count)
+        return self._scrape_with_driver(driver, search_item, search_lat, search_lon, target_count)
+    
+    def _scrape_with_driver(self, driver, search_item: str, search_lat: float,
+                            search_lon: float, target_count: Optional[int] = None) -> List[PlaceData]:
+        """Run one search in an already started browser"""
+        places_data, _, _ = self._search_feed(driver, search_item, search_lat, search_lon, target_count)
+        return places_data
+    
+    def scrape_area(self, search_item: str, search_lat: float, search_lon: float, driver,
+                    target_count: Optional[int] = TARGET_RESULT_COUNT) -> List[PlaceData]:
+        """
+        Cover a search area with adaptive tiles (see tiling.TilingPlanner)
+        
+        The whole area is searched first; only cells whose feed hit the ~120
+        result cap are searched again as four smaller cells. Places are
+        deduplicated on their place ID across cells, and distances are always
+        measured from the original search center.
+        
+        Returns:
+            List of new PlaceData objects from every cell
+        """
+        planner = TilingPlanner(search_lat, search_lon, SEARCH_RADIUS_METERS)
+        area_seen = PlaceKeySet()
         places_data = []
-        processed_urls = set()
         
-        with webdriver_context(headless=headless) as driver:
-            try:
-                query = f'https://www.google.com/maps/search/"{search_item}"/@{search_lat},{search_lon},{SEARCH_RADIUS_METERS}m'
-                logger.info(f"Loading: {query}")
-                driver.get(query)
-                time.sleep(DEFAULT_SCROLL_PAUSE_TIME)
+        for tile in planner:
+            remaining = None if target_count is None else target_count - len(area_seen)
+            tile_places, feed_keys, reached_end = self._search_feed(
+                driver, search_item, search_lat, search_lon, remaining, tile)
+            places_data.extend(tile_places)
+            area_seen.update(feed_keys)
+            
+            if target_count is not None and len(area_seen) >= target_count:
+                break
+            children = planner.record(tile, len(feed_keys), reached_end)
+            if children:
+                logger.info(f"Cell at {tile.lat:.5f}, {tile.lon:.5f} ({round(tile.radius_m)}m) saturated "
+                            f"with {len(feed_keys)} results, splitting into {len(children)} cells")
+        
+        logger.info(f"Area search '{search_item}' completed: {planner.queries} queries, "
+                    f"{planner.splits} splits, {len(area_seen)} distinct places seen, "
+                    f"{len(places_data)} new")
+        return places_data
+    
+    def _search_feed(self, driver, search_item: str, search_lat: float, search_lon: float,
+                     target_count: Optional[int] = None,
+                     tile: Optional[Tile] = None) -> Tuple[List[PlaceData], PlaceKeySet, bool]:
+        """
+        Run one search query and scroll its feed
+        
+        Args:
+            tile: Cell to search; defaults to the whole area around the search center
+            
+        Returns:
+            (new PlaceData objects, keys of every place the feed showed, whether the feed reached its end)
+        """
+        places_data = []
+        processed_urls = PlaceKeySet()
+        if tile is None:
+            tile = Tile(search_lat, search_lon, SEARCH_RADIUS_METERS)
+        
+        try:
+            query = f'https://www.google.com/maps/search/"{search_item}"/@{tile.lat},{tile.lon},{round(tile.radius_m)}m'
+            logger.info(f"Loading: {query}")
+            driver.get(query)
+            wait_until_ready(driver, timeout=SEARCH_LOAD_TIMEOUT, selector=SEARCH_READY_SELECTOR)
+            
+            new_urls_count = 0
+            progress = FeedProgress(MAX_SCROLL_ATTEMPTS, target_count=target_count)
+            feed_state = read_feed_state(driver)
+            
+            while True:
+                # Find scrollable element
+                scrollable_element = self._find_scrollable_element(driver)
                 
-                scroll_attempts = 0
-                new_urls_count = 0
+                # Only the results that appeared since the last scroll
+                places = self._harvest_places(driver, processed_urls)
+                logger.info(f"Scroll {progress.scrolls + 1}: Found {len(places)} new place elements")
                 
-                while scroll_attempts < MAX_SCROLL_ATTEMPTS:
-                    # Find scrollable element
-                    scrollable_element = self._find_scrollable_element(driver)
+                # Process places
+                new_urls_this_scroll = 0
+                processed_urls.update(place['href'] for place in places)
+                for place_data in self._process_places(places, search_item, search_lat, search_lon):
+                    places_data.append(place_data)
+                    self.url_manager.save_place_data(place_data)
+                    new_urls_this_scroll += 1
+                    new_urls_count += 1
                     
-                    # Find place elements
-                    places = self._find_place_elements(driver)
-                    logger.info(f"Scroll {scroll_attempts + 1}/{MAX_SCROLL_ATTEMPTS}: Found {len(places)} unique place elements")
-                    
-                    # Process places
-                    new_urls_this_scroll = 0
-                    for place in places:
-                        url = place.get_attribute("href")
-                        if url and url not in processed_urls:
-                            processed_urls.add(url)
-                            place_data = self._process_place(place, search_item, search_lat, search_lon)
-                            
-                            if place_data:
-                                places_data.append(place_data)
-                                self.url_manager.save_place_data(place_data)
-                                new_urls_this_scroll += 1
-                                new_urls_count += 1
-                                
-                                logger.info(f"Processed URL #{new_urls_count}: {url[:50]}... "
-                                          f"Distance: {place_data.distance_km} km "
-                                          f"Within 7km: {place_data.within_7km}")
-                    
-                    logger.info(f"New URLs this scroll: {new_urls_this_scroll}")
-                    
-                    # Check if we should continue scrolling
-                    if new_urls_this_scroll == 0:
-                        logger.info("No new URLs found, continuing to scroll...")
-                    
-                    # Scroll down
-                    self._scroll_page(driver, scrollable_element)
-                    time.sleep(DEFAULT_SCROLL_PAUSE_TIME)
-                    scroll_attempts += 1
+                    logger.info(f"Processed URL #{new_urls_count}: {place_data.name or place_data.url[:50]} "
+                              f"Rating: {place_data.rating or 'n/a'} "
+                              f"Distance: {place_data.distance_km} km "
+                              f"Within 7km: {place_data.within_7km}")
                 
-                logger.info(f"Search '{search_item}' completed: {new_urls_count} new URLs processed")
-                return places_data
+                logger.info(f"New URLs this scroll: {new_urls_this_scroll}")
                 
-            except Exception as e:
-                logger.error(f"Error during scraping: {str(e)}")
-                raise MapsScraperError(f"Scraping failed for '{search_item}': {str(e)}")
+                # Stop at the end of the feed, on a stalled feed or at the target count
+                stop_reason = progress.update(feed_state, len(processed_urls), new_urls_this_scroll)
+                if stop_reason:
+                    logger.info(f"Stopped scrolling: {stop_reason}")
+                    break
+                
+                # Scroll down and wait for the feed to grow
+                feed_state = scroll_and_wait(driver, scrollable_element)
+            
+            logger.info(f"Search '{search_item}' completed: {new_urls_count} new URLs processed")
+            return places_data, processed_urls, progress.reached_end
+            
+        except Exception as e:
+            logger.error(f"Error during scraping: {str(e)}")
+            raise MapsScraperError(f"Scraping failed for '{search_item}': {str(e)}")
+
+@dataclass
+class SearchResult:
+    """Outcome of one search item run by the SearchCollector"""
+    search_item: str
+    places: List[PlaceData]
+    error: Optional[str] = None
+    search_lat: Optional[float] = None
+    search_lon: Optional[float] = None
+
+class SearchCollector:
+    """Runs search items concurrently on a pool of long-lived browsers"""
+    
+    def __init__(self, scraper: MapsScraper, max_browsers: int = MAX_SEARCH_BROWSERS,
+                 headless: bool = False, max_searches_per_browser: int = MAX_SEARCHES_PER_BROWSER,
+                 adaptive_tiling: bool = ADAPTIVE_TILING,
+                 driver_factory: Optional[Callable[[int], object]] = None):
+        """
+        Args:
+            scraper: Scraper whose URLManager is shared by every worker
+            max_browsers: Number of browsers (and worker threads)
+            headless: Whether to run browsers in headless mode
+            max_searches_per_browser: Searches a browser runs before it is restarted
+            adaptive_tiling: Split saturated search areas into smaller cells
+            driver_factory: Called with the worker thread id to start a browser; defaults to create_driver
+        """
+        self.scraper = scraper
+        self.max_browsers = max_browsers
+        self.adaptive_tiling = adaptive_tiling
+        if driver_factory is None:
+            driver_factory = lambda thread_id: create_driver(headless=headless)
+        self.driver_pool = DriverPool(driver_factory, quit_driver, max_pages=max_searches_per_browser)
+    
+    def _run_search(self, search_item: str, search_lat: float, search_lon: float) -> SearchResult:
+        logger.info(f"Searching for: {search_item} (center {search_lat}, {search_lon})")
+        try:
+            with self.driver_pool.checkout() as driver:
+                if self.adaptive_tiling:
+                    places = self.scraper.scrape_area(search_item, search_lat, search_lon, driver)
+                else:
+                    places = self.scraper.scrape_places(search_item, search_lat, search_lon, driver=driver)
+            return SearchResult(search_item, places, search_lat=search_lat, search_lon=search_lon)
+        except Exception as e:
+            # The pool has already discarded the browser this search ran in
+            return SearchResult(search_item, [], error=str(e), search_lat=search_lat, search_lon=search_lon)
+    
+    def collect(self, searches: List[Tuple[str, float, float]]):
+        """
+        Run every (search_item, latitude, longitude) search
+        
+        Yields:
+            SearchResult for each search, in completion order
+        """
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_browsers) as executor:
+                futures = [executor.submit(self._run_search, *search) for search in searches]
+                for future in as_completed(futures):
+                    yield future.result()
+        finally:
+            self.driver_pool.close_all()
 
 class InputValidator:
     """Validates input data and parameters"""
@@ -438,13 +641,24 @@ def main():
     input_csv = "maps_results.csv"
     output_csv = "filtered_places.csv"
     all_urls_csv = "all_scraped_urls.csv"
+    url_manager = None
+    state = None
     
     try:
         # Validate input
         df = InputValidator.validate_input_file(input_csv)
         
         # Initialize components
-        url_manager = URLManager(all_urls_csv, output_csv)
+        columnar_store = None
+        if COLUMNAR_OUTPUT and PYARROW_AVAILABLE:
+            columnar_store = ColumnarStore(columnar_path(all_urls_csv), SEARCH_RESULT_FIELDS)
+            # Rows a killed run saved to the CSV but had not written to Parquet yet
+            backfilled = columnar_store.sync_csv(all_urls_csv)
+            if backfilled:
+                logger.info(f"Added {backfilled} rows missing from the columnar copy of {all_urls_csv}")
+        elif COLUMNAR_OUTPUT:
+            logger.warning("pyarrow not available, writing CSV only. Install it with: pip install pyarrow")
+        url_manager = URLManager(all_urls_csv, output_csv, columnar_store=columnar_store)
         scraper = MapsScraper(url_manager)
         
         logger.info("Starting scraping process...")
@@ -453,39 +667,44 @@ def main():
         total_scraped = 0
         total_filtered = 0
         
-        # Process each search item
-        for _, row in df.iterrows():
-            search_item = row['search_item']
-            
-            # Validate coordinates
-            search_lat, search_lon = InputValidator.validate_coordinates(
-                row['latitude'], row['longitude']
-            )
+        # Validate every search item up front
+        searches = []
+        for row in df.itertuples(index=False):
+            search_lat, search_lon = InputValidator.validate_coordinates(row.latitude, row.longitude)
             
             if search_lat is None or search_lon is None:
-                logger.warning(f"Skipping '{search_item}' - Invalid coordinates: "
-                             f"lat={row['latitude']}, lon={row['longitude']}")
+                logger.warning(f"Skipping '{row.search_item}' - Invalid coordinates: "
+                             f"lat={row.latitude}, lon={row.longitude}")
+                continue
+            searches.append((row.search_item, search_lat, search_lon))
+        
+        # Searches finished in an earlier run are skipped; failed ones are retried
+        state = StateStore(state_path(all_urls_csv))
+        state.add_search_jobs(searches)
+        pending = set(state.pending_search_jobs())
+        finished = len(searches) - sum(1 for search in searches if search in pending)
+        searches = [search for search in searches if search in pending]
+        if finished:
+            logger.info(f"Skipping {finished} searches already completed (see {state.path})")
+        
+        logger.info(f"Running {len(searches)} searches on {MAX_SEARCH_BROWSERS} browsers")
+        collector = SearchCollector(scraper, max_browsers=MAX_SEARCH_BROWSERS)
+        
+        for result in collector.collect(searches):
+            state.finish_search_job(result.search_item, result.search_lat, result.search_lon,
+                                    result_count=len(result.places), error=result.error)
+            if result.error:
+                logger.error(f"Failed to scrape '{result.search_item}': {result.error}")
                 continue
             
-            logger.info(f"\nSearching for: {search_item}")
-            logger.info(f"Search center: {search_lat}, {search_lon}")
+            # Count filtered results
+            filtered_count = sum(1 for place in result.places if place.within_7km == 'YES')
             
-            # Scrape places
-            try:
-                places_data = scraper.scrape_places(search_item, search_lat, search_lon)
-                
-                # Count filtered results
-                filtered_count = sum(1 for place in places_data if place.within_7km == 'YES')
-                
-                total_scraped += len(places_data)
-                total_filtered += filtered_count
-                
-                logger.info(f"Found {filtered_count} places within 7 km "
-                           f"(out of {len(places_data)} total NEW places)")
-                
-            except MapsScraperError as e:
-                logger.error(f"Failed to scrape '{search_item}': {str(e)}")
-                continue
+            total_scraped += len(result.places)
+            total_filtered += filtered_count
+            
+            logger.info(f"'{result.search_item}': found {filtered_count} places within 7 km "
+                       f"(out of {len(result.places)} total NEW places)")
         
         # Final summary
         logger.info("\nFINAL SUMMARY:")
@@ -514,6 +733,11 @@ def main():
         logger.info("Scraping interrupted by user")
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
+    finally:
+        if url_manager is not None:
+            url_manager.close()
+        if state is not None:
+            state.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
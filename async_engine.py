@@ -0,0 +1,364 @@
+import asyncio
+import json
+import subprocess
+import time
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional
+
+from browser_discovery import find_chrome_binary
+from page_readiness import (DEFAULT_QUIET_PERIOD, DEFAULT_READY_TIMEOUT, PLACE_TITLE_SELECTOR,
+                            POLL_INTERVAL, READINESS_PROBE_JS, READINESS_TRACKER_JS, STALE_REQUEST_MS,
+                            is_ready)
+from profile_manager import profile_manager, warm_with_selenium
+from resource_policy import blocked_patterns
+
+# Try to import websockets for the CDP transport
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+CDP_COMMAND_TIMEOUT = 30
+BROWSER_START_TIMEOUT = 30
+
+# URLs read from the input per worker-thread call, keeping file reads off the event loop
+URL_PREFETCH_BATCH = 100
+
+
+class CDPError(Exception):
+    """Raised when a DevTools command fails or the connection drops"""
+    pass
+
+
+class BlockedPageError(Exception):
+    """Raised by a scrape_page function when a tab landed on a consent or captcha page"""
+    pass
+
+
+def _call_function_expression(function_body: str, args: List) -> str:
+    """Wrap a Selenium-style script (reads ``arguments``) into a CDP expression"""
+    return f"(function () {{\n{function_body}\n}}).apply(null, {json.dumps(args)})"
+
+
+class CDPConnection:
+    """One websocket to a browser; commands are multiplexed by id and session"""
+
+    def __init__(self, ws_url: str):
+        self.ws_url = ws_url
+        self._ws = None
+        self._reader = None
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+
+    async def connect(self) -> None:
+        self._ws = await websockets.connect(self.ws_url, max_size=None)
+        self._reader = asyncio.create_task(self._read_loop())
+
+    async def send(self, method: str, params: Optional[Dict] = None, session_id: Optional[str] = None,
+                   timeout: float = CDP_COMMAND_TIMEOUT) -> Dict:
+        self._next_id += 1
+        message_id = self._next_id
+        message = {'id': message_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        try:
+            await self._ws.send(json.dumps(message))
+            response = await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(message_id, None)
+
+        if 'error' in response:
+            raise CDPError(f"{method} failed: {response['error'].get('message')}")
+        return response.get('result', {})
+
+    async def _read_loop(self) -> None:
+        try:
+            async for raw in self._ws:
+                message = json.loads(raw)
+                # Events are ignored: readiness is polled, not pushed
+                future = self._pending.get(message.get('id'))
+                if future and not future.done():
+                    future.set_result(message)
+        except Exception:
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("DevTools connection closed"))
+
+    async def close(self) -> None:
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+
+class Tab:
+    """A page target in a shared browser, driven through its flattened CDP session"""
+
+    def __init__(self, connection: CDPConnection, target_id: str, session_id: str):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+
+    async def send(self, method: str, params: Optional[Dict] = None) -> Dict:
+        return await self.connection.send(method, params, session_id=self.session_id)
+
+    async def navigate(self, url: str) -> None:
+        result = await self.send("Page.navigate", {'url': url})
+        if result.get('errorText'):
+            raise CDPError(f"Navigation failed: {result['errorText']}")
+
+    async def current_url(self) -> str:
+        """The URL the tab ended up on, after any redirects"""
+        return await self.evaluate("return location.href;")
+
+    async def evaluate(self, function_body: str, *args):
+        """Run a Selenium-style script (using ``arguments``) and return its JSON value"""
+        result = await self.send("Runtime.evaluate", {
+            'expression': _call_function_expression(function_body, list(args)),
+            'returnByValue': True,
+        })
+        if 'exceptionDetails' in result:
+            raise CDPError(f"Script error: {result['exceptionDetails'].get('text')}")
+        return result.get('result', {}).get('value')
+
+    async def wait_until_ready(self, timeout: float = DEFAULT_READY_TIMEOUT,
+                               selector: Optional[str] = PLACE_TITLE_SELECTOR,
+                               quiet_period: float = DEFAULT_QUIET_PERIOD) -> bool:
+        """Async counterpart of page_readiness.wait_until_ready"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                signals = await self.evaluate(READINESS_PROBE_JS, selector, STALE_REQUEST_MS)
+            except CDPError:
+                signals = None
+            if is_ready(signals, quiet_period):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def close(self) -> None:
+        try:
+            await self.connection.send("Target.closeTarget", {'targetId': self.target_id})
+        except Exception:
+            pass
+
+
+class BrowserProcess:
+    """A Chrome process started with remote debugging, hosting many tabs"""
+
+    def __init__(self, binary: str, headless: bool = True, resource_profile: str = "place_details"):
+        self.binary = binary
+        self.headless = headless
+        self.resource_profile = resource_profile
+        self.process = None
+        self.connection: Optional[CDPConnection] = None
+        self.profile_dir: Optional[str] = None
+        self._stderr_drain = None
+
+    async def start(self) -> None:
+        # Cloning copies the template (and warms it on first use); keep that off the event loop
+        self.profile_dir = await asyncio.to_thread(profile_manager.clone, "async", warm=warm_with_selenium)
+        args = [
+            self.binary,
+            "--remote-debugging-port=0",
+            f"--user-data-dir={self.profile_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--disable-extensions",
+            "--disable-gpu",
+            "--window-size=1920,1080",
+        ]
+        if self.headless:
+            args.append("--headless=new")
+        args.append("about:blank")
+
+        self.process = await asyncio.create_subprocess_exec(
+            *args, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        ws_url = await asyncio.wait_for(self._read_ws_url(), BROWSER_START_TIMEOUT)
+
+        # Keep reading stderr so Chrome never blocks on a full pipe
+        self._stderr_drain = asyncio.create_task(self._drain_stderr())
+
+        self.connection = CDPConnection(ws_url)
+        await self.connection.connect()
+
+    async def _read_ws_url(self) -> str:
+        while True:
+            line = await self.process.stderr.readline()
+            if not line:
+                raise CDPError("Chrome exited before opening the DevTools port")
+            text = line.decode(errors='replace').strip()
+            if text.startswith("DevTools listening on "):
+                return text[len("DevTools listening on "):]
+
+    async def _drain_stderr(self) -> None:
+        while await self.process.stderr.readline():
+            pass
+
+    async def new_tab(self) -> Tab:
+        target = await self.connection.send("Target.createTarget", {'url': "about:blank"})
+        attached = await self.connection.send("Target.attachToTarget",
+                                              {'targetId': target['targetId'], 'flatten': True})
+        tab = Tab(self.connection, target['targetId'], attached['sessionId'])
+
+        # Count the requests every page starts from its first script on
+        await tab.send("Page.addScriptToEvaluateOnNewDocument", {'source': READINESS_TRACKER_JS})
+
+        patterns = blocked_patterns(self.resource_profile)
+        if patterns:
+            await tab.send("Network.enable")
+            await tab.send("Network.setBlockedURLs", {'urls': patterns})
+        return tab
+
+    async def close(self) -> None:
+        if self.connection is not None:
+            try:
+                await self.connection.send("Browser.close", timeout=5)
+            except Exception:
+                pass
+            await self.connection.close()
+
+        if self.process is not None and self.process.returncode is None:
+            try:
+                await asyncio.wait_for(self.process.wait(), 10)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+
+        if self._stderr_drain is not None:
+            await asyncio.gather(self._stderr_drain, return_exceptions=True)
+        profile_manager.release(self.profile_dir)
+
+
+class AsyncScrapeEngine:
+    """
+    Scrapes URLs with a few browser processes, each hosting many concurrent tabs
+
+    Every tab is a worker pulling URLs from a bounded queue, so the producer
+    blocks (back-pressure) instead of buffering the whole input. Each page runs
+    under its own timeout; a tab that times out or errors is replaced. A page
+    whose scrape_page raises BlockedPageError is counted as blocked and
+    reported to on_blocked only, so the caller can leave it for a retry.
+    """
+
+    def __init__(self, scrape_page: Callable, browsers: int = 2, tabs_per_browser: int = 4,
+                 page_timeout: float = 60, queue_size: Optional[int] = None,
+                 resource_profile: str = "place_details", headless: bool = True,
+                 chrome_binary: Optional[str] = None,
+                 on_result: Optional[Callable[[str, Dict], None]] = None,
+                 on_error: Optional[Callable[[str, Exception], None]] = None,
+                 on_blocked: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            scrape_page: ``async def scrape_page(tab, url) -> dict``
+            browsers: Number of Chrome processes
+            tabs_per_browser: Concurrent tabs in each process
+            page_timeout: Seconds allowed per URL, including navigation
+            queue_size: Bound on queued URLs (defaults to twice the number of tabs)
+            resource_profile: resource_policy profile installed on every tab
+            headless: Run Chrome headless
+            chrome_binary: Chrome executable; found with find_chrome_binary() if omitted
+            on_result: Called with (url, record) for each scraped page
+            on_error: Called with (url, exception) for each failed page
+            on_blocked: Called with the url of each page that landed on a consent or captcha page
+        """
+        self.scrape_page = scrape_page
+        self.browsers = browsers
+        self.tabs_per_browser = tabs_per_browser
+        self.page_timeout = page_timeout
+        self.queue_size = queue_size or 2 * browsers * tabs_per_browser
+        self.resource_profile = resource_profile
+        self.headless = headless
+        self.chrome_binary = chrome_binary
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_blocked = on_blocked
+        self.succeeded = 0
+        self.failed = 0
+        self.blocked = 0
+
+    async def run(self, urls: Iterable[str]) -> Dict[str, int]:
+        """Scrape every URL and return succeeded/failed/blocked counts"""
+        if not WEBSOCKETS_AVAILABLE:
+            raise CDPError("The asyncio engine needs the websockets package")
+
+        binary = self.chrome_binary or find_chrome_binary()
+        if not binary:
+            raise CDPError("Chrome executable not found; set CHROME_BINARY")
+
+        processes = [BrowserProcess(binary, self.headless, self.resource_profile) for _ in range(self.browsers)]
+        try:
+            await asyncio.gather(*(process.start() for process in processes))
+
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+            workers = [asyncio.create_task(self._worker(process, queue))
+                       for process in processes for _ in range(self.tabs_per_browser)]
+
+            # The input may be a file-backed reader; read it in batches on a worker thread
+            url_iter = iter(urls)
+            while True:
+                batch = await asyncio.to_thread(list, islice(url_iter, URL_PREFETCH_BATCH))
+                if not batch:
+                    break
+                for url in batch:
+                    await self._put(queue, url, workers)
+            for _ in workers:
+                await self._put(queue, None, workers)
+            await asyncio.gather(*workers)
+        finally:
+            await asyncio.gather(*(process.close() for process in processes), return_exceptions=True)
+
+        return {'succeeded': self.succeeded, 'failed': self.failed, 'blocked': self.blocked}
+
+    @staticmethod
+    async def _put(queue: asyncio.Queue, item, workers: List[asyncio.Task]) -> None:
+        """Block while the queue is full, but give up if every worker has died"""
+        while True:
+            try:
+                await asyncio.wait_for(queue.put(item), 1)
+                return
+            except asyncio.TimeoutError:
+                if all(worker.done() for worker in workers):
+                    # Surface the first worker's exception
+                    await asyncio.gather(*workers)
+                    raise CDPError("All tabs stopped before the input was consumed")
+
+    def run_sync(self, urls: Iterable[str]) -> Dict[str, int]:
+        """Blocking wrapper around run() for the synchronous scripts"""
+        return asyncio.run(self.run(urls))
+
+    async def _worker(self, process: BrowserProcess, queue: asyncio.Queue) -> None:
+        tab = await process.new_tab()
+        try:
+            while True:
+                url = await queue.get()
+                if url is None:
+                    break
+
+                try:
+                    record = await asyncio.wait_for(self.scrape_page(tab, url), self.page_timeout)
+                    self.succeeded += 1
+                    if self.on_result:
+                        self.on_result(url, record)
+                except BlockedPageError:
+                    self.blocked += 1
+                    if self.on_blocked:
+                        self.on_blocked(url)
+                except Exception as e:
+                    if isinstance(e, asyncio.TimeoutError):
+                        e = CDPError(f"Timed out after {self.page_timeout}s")
+                    self.failed += 1
+                    if self.on_error:
+                        self.on_error(url, e)
+                    # The tab may be wedged mid-navigation; start over with a fresh one
+                    await tab.close()
+                    tab = await process.new_tab()
+        finally:
+            await tab.close()
@@ -0,0 +1,151 @@
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import threading
+from typing import Dict, Optional
+
+# Try to import webdriver_manager for automatic ChromeDriver management
+try:
+    from webdriver_manager.chrome import ChromeDriverManager
+    WEBDRIVER_MANAGER_AVAILABLE = True
+except ImportError:
+    WEBDRIVER_MANAGER_AVAILABLE = False
+
+# Where the discovery result is kept between runs
+DISCOVERY_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".maps_scraper_browser.json")
+
+CHROME_BINARY_CANDIDATES = [
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+VERSION_PATTERN = re.compile(r'(\d+)\.(\d+)\.(\d+)\.(\d+)')
+
+# Registry queries used on Windows, where chrome.exe --version prints nothing
+WINDOWS_VERSION_COMMANDS = [
+    r'reg query "HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon" /v version',
+    r'powershell "Get-ItemProperty HKLM:\SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Uninstall\* | Select-Object DisplayName, DisplayVersion | Where-Object {$_.DisplayName -like \"*Chrome*\"}"',
+]
+
+_discovered: Optional[Dict] = None
+_discovery_lock = threading.Lock()
+
+
+def find_chrome_binary() -> Optional[str]:
+    """Locate a Chrome/Chromium executable (CHROME_BINARY overrides the search)"""
+    override = os.environ.get("CHROME_BINARY")
+    if override:
+        return override
+
+    for candidate in CHROME_BINARY_CANDIDATES:
+        path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if path:
+            return path
+    return None
+
+
+def get_chrome_version(binary: Optional[str] = None) -> Optional[int]:
+    """Get the installed Chrome major version, or None if it cannot be detected"""
+    commands = []
+    if platform.system() == "Windows":
+        commands.extend(WINDOWS_VERSION_COMMANDS)
+    if binary:
+        commands.append([binary, "--version"])
+
+    for command in commands:
+        try:
+            result = subprocess.run(command, shell=isinstance(command, str), capture_output=True,
+                                    text=True, timeout=10)
+            version_match = VERSION_PATTERN.search(result.stdout or "")
+            if result.returncode == 0 and version_match:
+                return int(version_match.group(1))
+        except Exception:
+            continue
+    return None
+
+
+def binary_fingerprint(binary: Optional[str]) -> Optional[str]:
+    """Identify a browser build by path, size and mtime; changes when Chrome updates"""
+    if not binary:
+        return None
+    try:
+        stat = os.stat(binary)
+    except OSError:
+        return None
+    return f"{os.path.abspath(binary)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def _install_chromedriver() -> Optional[str]:
+    if WEBDRIVER_MANAGER_AVAILABLE:
+        try:
+            return ChromeDriverManager().install()
+        except Exception as e:
+            print(f"Warning: webdriver-manager could not install ChromeDriver: {e}")
+    return shutil.which("chromedriver")
+
+
+def _load_cache(cache_file: str) -> Optional[Dict]:
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cache(cache_file: str, info: Dict) -> None:
+    try:
+        with open(cache_file, 'w', encoding='utf-8') as file:
+            json.dump(info, file, indent=2)
+    except OSError as e:
+        print(f"Warning: Could not write browser discovery cache {cache_file}: {e}")
+
+
+def _cache_is_valid(cached: Optional[Dict], binary: Optional[str]) -> bool:
+    if not cached or cached.get('binary') != binary:
+        return False
+    if cached.get('fingerprint') != binary_fingerprint(binary):
+        return False
+    driver_path = cached.get('driver_path')
+    return driver_path is None or os.path.exists(driver_path)
+
+
+def discover_browser(cache_file: str = DISCOVERY_CACHE_FILE, refresh: bool = False) -> Dict:
+    """
+    Resolve the Chrome binary, its major version and a matching chromedriver
+
+    The result is memoised for the process and cached in ``cache_file``; the
+    cache is reused until the browser binary changes (path, size or mtime) or
+    the cached chromedriver disappears, so version probes and webdriver-manager
+    run once per browser update instead of once per driver.
+
+    Returns:
+        Dict with 'binary', 'version', 'driver_path' and 'fingerprint'; any of the
+        first three may be None when it could not be found
+    """
+    global _discovered
+
+    with _discovery_lock:
+        if _discovered is not None and not refresh:
+            return _discovered
+
+        binary = find_chrome_binary()
+        cached = None if refresh else _load_cache(cache_file)
+        if _cache_is_valid(cached, binary):
+            _discovered = cached
+            return _discovered
+
+        info = {
+            'binary': binary,
+            'fingerprint': binary_fingerprint(binary),
+            'version': get_chrome_version(binary),
+            'driver_path': _install_chromedriver(),
+        }
+        print(f"🔍 Detected Chrome {info['version'] or 'version unknown'} at {binary or 'default location'}")
+        _save_cache(cache_file, info)
+        _discovered = info
+        return _discovered
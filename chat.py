@@ -2,7 +2,7 @@ import csv
 import time
 import re
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -11,11 +11,18 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException, WebDriverException, NoSuchElementException
 )
-from webdriver_manager.chrome import ChromeDriverManager
+
+from browser_discovery import discover_browser
+from resource_policy import apply_resource_options, apply_resource_policy
+from resume_index import ResumeIndex
+from url_reader import StreamingURLReader
+
+# Resource profile for business pages (see resource_policy.RESOURCE_PROFILES)
+RESOURCE_PROFILE = "place_details"
 
 
 # -------------------------- Chrome Setup --------------------------
-def create_driver(headless=False):
+def create_driver(headless=False, resource_profile=RESOURCE_PROFILE):
     """Initialize a Chrome WebDriver instance."""
     options = webdriver.ChromeOptions()
     if headless:
@@ -25,11 +32,14 @@ def create_driver(headless=False):
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option("useAutomationExtension", False)
+    apply_resource_options(options, resource_profile)
 
     try:
-        service = Service(ChromeDriverManager().install())
+        # Resolved once per process and cached on disk, not per row
+        browser = discover_browser()
+        service = Service(browser["driver_path"]) if browser["driver_path"] else Service()
         driver = webdriver.Chrome(service=service, options=options)
-        return driver
+        return apply_resource_policy(driver, resource_profile)
     except WebDriverException as e:
         print(f"[Driver Error] {e}")
         return None
@@ -128,11 +138,10 @@ def process_url(row, input_headers):
 
 
 # -------------------------- CSV Helpers --------------------------
-def read_input_csv(input_file):
-    """Read URLs and data from input CSV."""
-    with open(input_file, "r", encoding="utf-8") as file:
-        reader = csv.DictReader(file)
-        return list(reader), reader.fieldnames
+def read_input_csv(input_file, skip=None):
+    """Stream input rows lazily, dropping rows whose URL is in ``skip``."""
+    reader = StreamingURLReader(input_file, column="URL", skip=skip)
+    return reader.rows(), reader.fieldnames
 
 
 def write_output_csv(output_file, data, headers):
@@ -148,29 +157,42 @@ def write_output_csv(output_file, data, headers):
 # -------------------------- Main Scraper --------------------------
 def main(input_file="input.csv", output_file="output.csv", max_threads=5):
     """Main threaded scraping controller."""
-    rows, input_headers = read_input_csv(input_file)
+    # Resume: rows whose URL is already in the output file are never read into memory
+    processed = ResumeIndex.load(output_file, use_sidecar=False)
+    rows, input_headers = read_input_csv(input_file, skip=processed)
 
     output_headers = input_headers + [
         'Name', 'Address', 'Website', 'Phone', 'Rating', 'Operating_Hours', 'Permanently_Closed'
     ]
 
-    print(f"[INFO] Starting scrape for {len(rows)} URLs using {max_threads} threads...")
+    print(f"[INFO] Starting scrape ({len(processed)} URLs already done) using {max_threads} threads...")
 
     results = []
     with ThreadPoolExecutor(max_workers=max_threads) as executor:
-        futures = {executor.submit(process_url, row, input_headers): row for row in rows}
-
-        for future in as_completed(futures):
+        # Only a small window of rows is in flight; the rest stay on disk until needed
+        futures = set()
+        for row in rows:
+            if len(futures) >= max_threads * 4:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    data = future.result()
+                    if data:
+                        results.append(data)
+                        print(f"[DONE] {data.get('URL')}")
+
+                # Periodic save
+                if len(results) >= 10:
+                    write_output_csv(output_file, results, output_headers)
+                    results.clear()
+
+            futures.add(executor.submit(process_url, row, input_headers))
+
+        for future in wait(futures).done:
             data = future.result()
             if data:
                 results.append(data)
                 print(f"[DONE] {data.get('URL')}")
 
-            # Periodic save
-            if len(results) % 10 == 0:
-                write_output_csv(output_file, results, output_headers)
-                results.clear()
-
     # Write remaining results
     if results:
         write_output_csv(output_file, results, output_headers)
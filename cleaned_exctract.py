@@ -4,33 +4,23 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
-import time
 import csv
-import pandas as pd
 import re
 import os
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from page_readiness import wait_until_ready, wait_until_settled
+from coordinates import extract_coordinates_from_url
+from place_keys import place_key
+from resume_index import ResumeIndex
+from url_reader import StreamingURLReader
+
 # Global lock for thread-safe CSV writing
 csv_lock = threading.Lock()
 
-def extract_coordinates_from_url(url):
-    """Extract latitude and longitude coordinates from Google Maps URL"""
-    try:
-        lat_pattern = r'3d([+-]?\d+\.?\d*)'
-        lng_pattern = r'4d([+-]?\d+\.?\d*)'
-        
-        lat_match = re.search(lat_pattern, url)
-        lng_match = re.search(lng_pattern, url)
-        
-        latitude = lat_match.group(1) if lat_match else "Not Found"
-        longitude = lng_match.group(1) if lng_match else "Not Found"
-        
-        return latitude, longitude
-    except Exception as e:
-        print(f"Error extracting coordinates: {str(e)}")
-        return "Not Found", "Not Found"
+# Ceiling (seconds) for waiting on a place page to become ready
+PAGE_READY_TIMEOUT = 20
 
 def safe_driver_quit(driver):
     """Safely quit the Chrome driver with error handling"""
@@ -74,8 +64,9 @@ def check_url_already_processed(url, output_filename):
     try:
         with open(output_filename, 'r', newline='', encoding='utf-8') as file:
             reader = csv.DictReader(file)
+            key = place_key(url)
             for row in reader:
-                if row.get('URL') == url:
+                if place_key(row.get('URL')) == key:
                     return True
     except Exception as e:
         print(f"Warning: Error checking processed URLs: {e}")
@@ -85,12 +76,10 @@ def check_url_already_processed(url, output_filename):
 def scroll_page(driver):
     """Scroll the page to help reveal dynamic content"""
     try:
-        total_height = driver.execute_script("return document.body.scrollHeight")
-        for i in range(0, total_height, 500):
-            driver.execute_script(f"window.scrollTo(0, {i});")
-            time.sleep(0.3)
+        # Scroll to the bottom and wait for any lazily loaded content to settle
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        wait_until_settled(driver)
         driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(0.5)
     except:
         pass
 
@@ -99,8 +88,6 @@ def extract_phone_number(driver, wait):
     try:
         # Scroll and wait for page to be fully loaded
         scroll_page(driver)
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
 
         # Exact XPath selectors based on confirmed HTML structure
         phone_xpaths = [
@@ -125,7 +112,6 @@ def extract_phone_number(driver, wait):
                     try:
                         # Scroll to element to ensure it's visible
                         driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.3)
 
                         # Extract text or href for tel: links
                         if "tel:" in xpath:
@@ -173,8 +159,7 @@ def extract_store_type(driver, wait):
     """Extract business category/store type from Google Maps page"""
     try:
         driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(1)
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+        wait_until_settled(driver)
         
         category_selectors = [
             "//button[contains(@class, 'DkEaL')]",
@@ -190,7 +175,6 @@ def extract_store_type(driver, wait):
                 for element in category_elements:
                     try:
                         driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.3)
                         category_text = element.text.strip()
                         
                         if category_text:
@@ -214,8 +198,7 @@ def extract_operating_status_and_hours(driver, wait):
         operating_hours = "Not Found"
         
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-        time.sleep(1)
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+        wait_until_settled(driver)
         
         status_selectors = [
             "//span[contains(@class, 'ZDu9vd')]",
@@ -230,7 +213,6 @@ def extract_operating_status_and_hours(driver, wait):
                 for element in status_elements:
                     try:
                         driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.3)
                         status_text = element.text.strip()
                         
                         if status_text and any(kw in status_text.lower() for kw in ['open', 'closed', 'closes', 'opens']):
@@ -299,8 +281,7 @@ def extract_rating(driver, wait):
     """Extract rating from Google Maps page"""
     try:
         driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(1)
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+        wait_until_settled(driver)
         
         rating_selectors = [
             "//div[contains(@class, 'F7nice')]//span[@aria-hidden='true']",
@@ -315,7 +296,6 @@ def extract_rating(driver, wait):
                 for element in rating_elements:
                     try:
                         driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.3)
                         rating_text = element.text.strip()
                         
                         if rating_text:
@@ -364,17 +344,10 @@ def scrape_data(url, driver, wait):
     """Main scraping function to extract all business information"""
     try:
         driver.get(url)
-        time.sleep(8)
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(2)
+        if not wait_until_ready(driver, timeout=PAGE_READY_TIMEOUT):
+            print(f"⚠️ Page not settled after {PAGE_READY_TIMEOUT}s, extracting anyway: {url}")
         
         scroll_page(driver)
-        time.sleep(2)
-        
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(1)
-        driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(1)
         
         address = website = phone = "Not Found"
         
@@ -591,20 +564,17 @@ def main():
         print(f"Error: Input file '{input_filename}' not found!")
         return
     
+    output_filename = 'filtered_output.csv'
+
+    # Read only the URL column, line by line, dropping URLs already in the output
     try:
-        df = pd.read_csv(input_filename)
-        if 'URL' not in df.columns:
-            print(f"Error: 'URL' column not found")
-            print(f"Available columns: {list(df.columns)}")
-            return
-        
-        urls = df['URL'].tolist()
-        print(f"Successfully loaded {len(urls)} URLs from {input_filename}")
+        processed = ResumeIndex.load(output_filename, use_sidecar=False)
+        reader = StreamingURLReader(input_filename, column='URL', skip=processed)
+        urls = list(reader)
+        print(f"Loaded {len(urls)} pending URLs from {input_filename} ({reader.skipped} already processed)")
     except Exception as e:
         print(f"Error reading CSV: {str(e)}")
         return
-    
-    output_filename = 'filtered_output.csv'
     file_exists = os.path.exists(output_filename)
     
     if file_exists:
@@ -0,0 +1,204 @@
+import csv
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from place_keys import place_key
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Buffered rows are written as one Parquet file once this many are pending,
+# or once the oldest has waited FLUSH_INTERVAL seconds
+ROWS_PER_FILE = 5000
+FLUSH_INTERVAL = 60
+
+PARTITION_COLUMN = "run_date"
+KEY_COLUMN = "place_key"
+TIMESTAMP_COLUMN = "scraped_at"
+
+# Stable schemas as (column, arrow type name) pairs, in CSV column order.
+# Search results: all_scraped_urls.csv / filtered_places.csv
+SEARCH_RESULT_FIELDS: List[Tuple[str, str]] = [
+    ("search_item", "string"), ("search_lat", "float64"), ("search_lon", "float64"),
+    ("url", "string"), ("url_lat", "float64"), ("url_lon", "float64"),
+    ("distance_km", "float64"), ("within_7km", "string"),
+]
+# Place details: the *_op.csv outputs of the detail extractors. Values stay
+# strings because the extractors write sentinels such as "Not Found".
+PLACE_DETAIL_FIELDS: List[Tuple[str, str]] = [
+    (name, "string") for name in (
+        'URL', 'Name', 'Address', 'Website', 'Phone', 'Store_Type', 'Operating_Status',
+        'Operating_Hours', 'Rating', 'Review_Count', 'Permanently_Closed', 'Latitude', 'Longitude')
+]
+
+
+def columnar_path(csv_filename: str) -> str:
+    """Dataset directory kept next to a CSV output (Delhi_op.csv -> Delhi_op.parquet/)"""
+    return os.path.splitext(csv_filename)[0] + ".parquet"
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ColumnarStore:
+    """
+    Append-only Parquet dataset with a fixed schema, partitioned by run date
+
+    Rows are buffered and written as one Parquet file per ``rows_per_file``
+    rows, once the oldest buffered row is ``flush_interval`` seconds old, and
+    on ``flush``/``close``, under ``<root>/run_date=YYYY-MM-DD/``. Besides the
+    CSV columns every row carries ``place_key`` (see place_keys.place_key) and
+    ``scraped_at``, so deduplication and joins across runs are column scans.
+    ``export_csv`` writes the CSV view with the original columns.
+
+    The dataset mirrors a CSV that is written first, so rows still buffered
+    when a run is killed are only in the CSV; ``sync_csv`` copies such rows
+    over when the store is opened again.
+    """
+
+    def __init__(self, root: str, fields: List[Tuple[str, str]], url_column: str = "url",
+                 rows_per_file: int = ROWS_PER_FILE, flush_interval: float = FLUSH_INTERVAL):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for the columnar store: pip install pyarrow")
+        self.root = root
+        self.fields = list(fields)
+        self.columns = [name for name, _ in self.fields]
+        self.url_column = url_column
+        self.rows_per_file = rows_per_file
+        self.flush_interval = flush_interval
+        self.schema = pa.schema(
+            [pa.field(name, pa.type_for_alias(type_name)) for name, type_name in self.fields]
+            + [pa.field(KEY_COLUMN, pa.string()), pa.field(TIMESTAMP_COLUMN, pa.timestamp('ms', tz='UTC'))]
+        )
+        # What readers see: the stored columns plus the hive partition column
+        self.partitioning = ds.partitioning(pa.schema([pa.field(PARTITION_COLUMN, pa.string())]), flavor="hive")
+        self.dataset_schema = self.schema.append(pa.field(PARTITION_COLUMN, pa.string()))
+        self._float_columns = [name for name, type_name in self.fields if type_name.startswith("float")]
+        self._pending: List[Dict] = []
+        self._oldest_pending = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def write(self, row: Dict) -> None:
+        self.write_batch([row])
+
+    def write_batch(self, rows: Iterable[Dict]) -> None:
+        """Buffer rows; columns outside the schema are ignored and missing ones are null"""
+        scraped_at = datetime.now(timezone.utc)
+        with self._lock:
+            if not self._pending:
+                self._oldest_pending = time.monotonic()
+            for row in rows:
+                record = {name: row.get(name) for name in self.columns}
+                for name in self._float_columns:
+                    record[name] = _to_float(record[name])
+                for name, type_name in self.fields:
+                    if type_name == "string" and record[name] is not None:
+                        record[name] = str(record[name])
+                record[KEY_COLUMN] = place_key(row.get(self.url_column))
+                record[TIMESTAMP_COLUMN] = scraped_at
+                self._pending.append(record)
+            if (len(self._pending) >= self.rows_per_file
+                    or time.monotonic() - self._oldest_pending >= self.flush_interval):
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        table = pa.Table.from_pylist(self._pending, schema=self.schema)
+        run_date = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        partition = os.path.join(self.root, f"{PARTITION_COLUMN}={run_date}")
+        os.makedirs(partition, exist_ok=True)
+        filename = f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+        # Write under a temporary name so readers never see a partial file
+        temp_path = os.path.join(partition, "." + filename)
+        pq.write_table(table, temp_path)
+        os.replace(temp_path, os.path.join(partition, filename))
+        self._pending = []
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        self.flush()
+
+    def dataset(self):
+        return ds.dataset(self.root, format="parquet", partitioning=self.partitioning,
+                          schema=self.dataset_schema, exclude_invalid_files=True)
+
+    def read(self, columns: Optional[List[str]] = None, filter=None):
+        """
+        Read the dataset (or some columns / a pyarrow.dataset filter of it) as a pyarrow Table
+
+        Filters may use the partition column, e.g. ds.field("run_date") == "2026-10-17".
+        """
+        return self.dataset().to_table(columns=columns, filter=filter)
+
+    def sync_csv(self, csv_filename: str) -> int:
+        """
+        Copy the rows of the mirrored CSV whose places the dataset does not have yet
+
+        Returns:
+            Number of rows written
+        """
+        if not os.path.exists(csv_filename):
+            return 0
+        known = self.place_keys()
+        written = 0
+        missing: List[Dict] = []
+        with open(csv_filename, 'r', newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                key = place_key(row.get(self.url_column))
+                if not key or key in known:
+                    continue
+                known.add(key)
+                missing.append(row)
+                if len(missing) >= self.rows_per_file:
+                    self.write_batch(missing)
+                    written += len(missing)
+                    missing = []
+        self.write_batch(missing)
+        self.flush()
+        return written + len(missing)
+
+    def place_keys(self) -> Set[str]:
+        """Every place stored so far, read from the place_key column alone"""
+        keys = self.read(columns=[KEY_COLUMN]).column(KEY_COLUMN).unique().to_pylist()
+        return {key for key in keys if key}
+
+    def export_csv(self, csv_filename: str, filter=None, deduplicate: bool = False) -> int:
+        """
+        Write the CSV view of the dataset with the original columns
+
+        Args:
+            filter: Optional pyarrow.dataset expression, e.g. ds.field("within_7km") == "YES"
+            deduplicate: Keep only the first row of each place
+
+        Returns:
+            Number of rows written
+        """
+        import pyarrow.csv as pa_csv
+
+        table = self.read(columns=self.columns + [KEY_COLUMN, TIMESTAMP_COLUMN], filter=filter)
+        table = table.sort_by([(TIMESTAMP_COLUMN, "ascending")])
+        if deduplicate:
+            keys = table.column(KEY_COLUMN).to_pylist()
+            seen = set()
+            first_rows = [index for index, key in enumerate(keys) if not (key in seen or seen.add(key))]
+            table = table.take(first_rows)
+        pa_csv.write_csv(table.select(self.columns), csv_filename)
+        return table.num_rows
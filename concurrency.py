@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+# URL fragments Google redirects to when it wants consent or suspects a bot
+BLOCK_PAGE_MARKERS = ("consent.google.", "google.com/sorry/", "/recaptcha/")
+
+
+def is_block_page(url: Optional[str]) -> bool:
+    """True if a browser ended up on a consent or captcha page instead of the place"""
+    return bool(url) and any(marker in url for marker in BLOCK_PAGE_MARKERS)
+
+
+def available_memory_mb() -> Optional[float]:
+    """Available host memory in MB, or None if it cannot be determined"""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/meminfo", "r") as file:
+            for line in file:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on how many workers may scrape at once
+
+    Every ``window`` pages the limit grows by ``increase_step`` if the window was
+    healthy, or is multiplied by ``decrease_factor`` if latency, the error rate or
+    free memory crossed their thresholds. A consent/captcha page cuts the limit
+    immediately and holds it for ``block_cooldown`` seconds.
+    """
+
+    def __init__(self, initial: int = 2, min_workers: int = 1, max_workers: int = 6,
+                 increase_step: int = 1, decrease_factor: float = 0.5, window: int = 10,
+                 latency_target: float = 30.0, max_error_rate: float = 0.2,
+                 min_free_memory_mb: float = 1024, block_cooldown: float = 120):
+        """
+        Args:
+            initial: Starting number of active workers
+            min_workers: Floor for the limit
+            max_workers: Ceiling for the limit (size the thread pool to this)
+            increase_step: Additive increase after a healthy window
+            decrease_factor: Multiplicative decrease after an unhealthy window
+            window: Pages per evaluation window
+            latency_target: Mean seconds per page above which the window is unhealthy
+            max_error_rate: Error/timeout fraction above which the window is unhealthy
+            min_free_memory_mb: Free host memory below which the window is unhealthy
+            block_cooldown: Seconds without increases after a consent/captcha page
+        """
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.window = window
+        self.latency_target = latency_target
+        self.max_error_rate = max_error_rate
+        self.min_free_memory_mb = min_free_memory_mb
+        self.block_cooldown = block_cooldown
+
+        self._limit = max(min_workers, min(initial, max_workers))
+        self._active = 0
+        self._samples = deque()
+        self._hold_until = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def acquire(self) -> None:
+        """Block until a worker slot is free under the current limit"""
+        with self._cond:
+            while self._active >= self._limit:
+                self._cond.wait()
+            self._active += 1
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free right now"""
+        with self._cond:
+            if self._active >= self._limit:
+                return False
+            self._active += 1
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def record(self, latency: float, ok: bool, blocked: bool = False) -> None:
+        """
+        Feed the outcome of one page into the controller
+
+        Args:
+            latency: Seconds the page took
+            ok: False for errors and timeouts
+            blocked: True if a consent or captcha page was detected
+        """
+        with self._cond:
+            if blocked:
+                self._hold_until = time.monotonic() + self.block_cooldown
+                self._samples.clear()
+                self._decrease("consent/captcha page detected")
+                return
+
+            self._samples.append((latency, ok))
+            if len(self._samples) < self.window:
+                return
+
+            mean_latency = sum(sample[0] for sample in self._samples) / len(self._samples)
+            error_rate = sum(1 for sample in self._samples if not sample[1]) / len(self._samples)
+            self._samples.clear()
+            free_memory = available_memory_mb()
+
+            if error_rate > self.max_error_rate:
+                self._decrease(f"error rate {error_rate:.0%}")
+            elif mean_latency > self.latency_target:
+                self._decrease(f"mean latency {mean_latency:.1f}s")
+            elif free_memory is not None and free_memory < self.min_free_memory_mb:
+                self._decrease(f"free memory {free_memory:.0f} MB")
+            elif time.monotonic() >= self._hold_until:
+                self._increase(f"mean latency {mean_latency:.1f}s, error rate {error_rate:.0%}")
+
+    def _decrease(self, reason: str) -> None:
+        new_limit = max(self.min_workers, int(self._limit * self.decrease_factor))
+        if new_limit != self._limit:
+            print(f"🔽 Concurrency {self._limit} -> {new_limit} ({reason})")
+            self._limit = new_limit
+
+    def _increase(self, reason: str) -> None:
+        new_limit = min(self.max_workers, self._limit + self.increase_step)
+        if new_limit != self._limit:
+            print(f"🔼 Concurrency {self._limit} -> {new_limit} ({reason})")
+            self._limit = new_limit
+            self._cond.notify_all()
@@ -0,0 +1,93 @@
+import re
+from typing import Optional, Tuple
+
+# Place coordinates in the data segment: ...!8m2!3d28.6291627!4d77.2249081...
+# (the "!" may arrive percent-encoded). Anchoring on "!" keeps "3d" inside
+# hex feature IDs or slugs from matching.
+LAT_PATTERN = re.compile(r'(?:!|%21)3d([+-]?\d+\.?\d*)')
+LON_PATTERN = re.compile(r'(?:!|%21)4d([+-]?\d+\.?\d*)')
+# Map center in search and viewport URLs: /@28.6315,77.2167,15z
+AT_PATTERN = re.compile(r'/@([-+]?\d+\.\d+),([-+]?\d+\.\d+)')
+
+NOT_FOUND = "Not Found"
+
+
+def extract_coordinates_from_url(url):
+    """
+    Extract latitude and longitude coordinates from Google Maps URL
+
+    Args:
+        url (str): Google Maps URL containing coordinates
+
+    Returns:
+        tuple: (latitude, longitude) as strings, or ("Not Found", "Not Found") if not found
+    """
+    if not isinstance(url, str):
+        return NOT_FOUND, NOT_FOUND
+    lat_match = LAT_PATTERN.search(url)
+    lon_match = LON_PATTERN.search(url)
+    latitude = lat_match.group(1) if lat_match else NOT_FOUND
+    longitude = lon_match.group(1) if lon_match else NOT_FOUND
+    return latitude, longitude
+
+
+def parse_coordinates(url, fallback: bool = True) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Place coordinates of a Google Maps URL as floats
+
+    Uses the !3d/!4d pair, falling back to the /@lat,lon map center when the
+    URL has no place coordinates.
+
+    Returns:
+        (latitude, longitude), or (None, None) if not found
+    """
+    if not isinstance(url, str):
+        return None, None
+    lat_match = LAT_PATTERN.search(url)
+    lon_match = LON_PATTERN.search(url)
+    if lat_match and lon_match:
+        return float(lat_match.group(1)), float(lon_match.group(1))
+    if fallback:
+        match = AT_PATTERN.search(url)
+        if match:
+            return float(match.group(1)), float(match.group(2))
+    return None, None
+
+
+def extract_coordinates_column(urls, fallback: bool = True):
+    """
+    Vectorized parse_coordinates over a pandas Series of URLs
+
+    Returns:
+        DataFrame with float ``latitude`` and ``longitude`` columns on the same
+        index; NaN where a URL has no coordinates
+    """
+    import pandas as pd
+
+    urls = urls.astype("string")
+    latitude = pd.to_numeric(urls.str.extract(LAT_PATTERN, expand=False), errors="coerce")
+    longitude = pd.to_numeric(urls.str.extract(LON_PATTERN, expand=False), errors="coerce")
+    if fallback:
+        missing = latitude.isna() | longitude.isna()
+        if missing.any():
+            center = urls[missing].str.extract(AT_PATTERN).apply(pd.to_numeric, errors="coerce")
+            latitude = latitude.where(~missing, center[0])
+            longitude = longitude.where(~missing, center[1])
+    return pd.DataFrame({"latitude": latitude.astype(float), "longitude": longitude.astype(float)},
+                        index=urls.index)
+
+
+def fill_missing_coordinates(df, url_column: str = "url", lat_column: str = "url_lat",
+                             lon_column: str = "url_lon"):
+    """Fill absent or empty coordinate columns of a DataFrame from its URL column in one pass"""
+    import pandas as pd
+
+    result = df.copy()
+    for column in (lat_column, lon_column):
+        result[column] = pd.to_numeric(result[column], errors="coerce") if column in result else float("nan")
+    missing = result[lat_column].isna() | result[lon_column].isna()
+    if missing.any():
+        parsed = extract_coordinates_column(result.loc[missing, url_column])
+        result.loc[missing, lat_column] = parsed["latitude"]
+        result.loc[missing, lon_column] = parsed["longitude"]
+    return result
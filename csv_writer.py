@@ -0,0 +1,151 @@
+import csv
+import os
+import queue
+import threading
+import time
+import traceback
+from typing import Callable, Dict, List, Optional
+
+# When to fsync the output file: after every flushed batch, only on close, or never
+FSYNC_POLICIES = ("batch", "close", "never")
+
+_STOP = object()
+
+
+class BatchedCSVWriter:
+    """
+    Appends rows to a CSV file from a single dedicated writer thread
+
+    Scraper threads only put rows on a queue. The writer thread keeps the file
+    open and group-commits rows once ``batch_size`` are pending or the oldest
+    pending row has waited ``flush_interval`` seconds, whichever comes first.
+
+    The file is opened by ``start``, so an unwritable output fails there. If
+    the writer thread dies later, ``write`` and ``close`` re-raise its error
+    instead of accepting rows that would never be saved.
+    """
+
+    def __init__(self, filename: str, fieldnames: List[str], batch_size: int = 25,
+                 flush_interval: float = 2.0, fsync_policy: str = "batch",
+                 on_flush: Optional[Callable[[List[Dict]], None]] = None):
+        """
+        Args:
+            filename: CSV file to append to; a header is written if it is empty
+            fieldnames: Column order for csv.DictWriter
+            batch_size: Flush once this many rows are pending
+            flush_interval: Flush once the oldest pending row is this many seconds old
+            fsync_policy: One of FSYNC_POLICIES
+            on_flush: Called from the writer thread with each batch after it is written
+        """
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"fsync_policy must be one of {FSYNC_POLICIES}, got {fsync_policy!r}")
+
+        self.filename = filename
+        self.fieldnames = fieldnames
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_policy = fsync_policy
+        self.on_flush = on_flush
+        self.rows_written = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def __enter__(self) -> "BatchedCSVWriter":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """
+        Open the output file and start the writer thread
+
+        Raises:
+            OSError: If the file cannot be opened for appending (locked, no permission, ...)
+        """
+        file = open(self.filename, 'a', newline='', encoding='utf-8')
+        try:
+            writer = csv.DictWriter(file, fieldnames=self.fieldnames, extrasaction='ignore')
+            if file.tell() == 0:
+                writer.writeheader()
+                file.flush()
+        except BaseException:
+            file.close()
+            raise
+
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(file, writer), name="csv-writer", daemon=True)
+        self._thread.start()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def write(self, row: Dict) -> bool:
+        """Queue a row for writing; never blocks on file I/O"""
+        self._raise_if_failed()
+        self._queue.put(row)
+        return True
+
+    def close(self) -> None:
+        """Flush every queued row, fsync if configured and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        self._raise_if_failed()
+
+    def _run(self, file, writer) -> None:
+        try:
+            self._write_loop(file, writer)
+        except BaseException as e:
+            print(f"Error: CSV writer for {self.filename} stopped: {e}")
+            traceback.print_exc()
+            self._error = e
+        finally:
+            file.close()
+
+    def _write_loop(self, file, writer) -> None:
+        pending: List[Dict] = []
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if pending else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush(file, writer, pending, self.fsync_policy != "never")
+                break
+
+            if item is not None:
+                if not pending:
+                    deadline = time.monotonic() + self.flush_interval
+                pending.append(item)
+
+            if pending and (len(pending) >= self.batch_size or time.monotonic() >= deadline):
+                self._flush(file, writer, pending, self.fsync_policy == "batch")
+                pending = []
+
+    def _flush(self, file, writer, rows: List[Dict], fsync: bool) -> None:
+        try:
+            if rows:
+                writer.writerows(rows)
+            file.flush()
+            if fsync:
+                os.fsync(file.fileno())
+        except Exception as e:
+            print(f"Error writing {len(rows)} rows to {self.filename}: {e}")
+            traceback.print_exc()
+            return
+
+        self.rows_written += len(rows)
+        if rows and self.on_flush:
+            try:
+                self.on_flush(rows)
+            except Exception as e:
+                print(f"Warning: on_flush callback failed: {e}")
@@ -0,0 +1,105 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+
+class _PooledDriver:
+    """A live driver together with the number of pages it has served"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages_served = 0
+
+
+class DriverPool:
+    """
+    Keeps one long-lived Chrome driver per worker thread.
+
+    Drivers are created lazily by ``factory`` the first time a thread checks one
+    out, health-checked on every checkout and recycled after ``max_pages`` pages
+    or as soon as a page crashes the browser.
+    """
+
+    def __init__(self, factory: Callable[[int], object], quit_driver: Callable[[object], None],
+                 max_pages: int = 50):
+        """
+        Args:
+            factory: Called with the worker thread id, returns a new driver
+            quit_driver: Called with a driver to shut it down (e.g. safe_driver_quit)
+            max_pages: Number of pages a driver serves before it is recycled
+        """
+        self.factory = factory
+        self.quit_driver = quit_driver
+        self.max_pages = max_pages
+        self._drivers: Dict[int, _PooledDriver] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_healthy(driver) -> bool:
+        """Check that the browser behind a driver still answers commands"""
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _take(self, key: int) -> Optional[_PooledDriver]:
+        with self._lock:
+            return self._drivers.pop(key, None)
+
+    def _put(self, key: int, pooled: _PooledDriver) -> None:
+        with self._lock:
+            self._drivers[key] = pooled
+
+    @contextmanager
+    def checkout(self, thread_id: int = 0):
+        """
+        Check out the calling thread's driver for one page.
+
+        The driver is returned to the pool when the block exits normally and
+        discarded if the block raises, so a crashed browser is never reused.
+
+        Args:
+            thread_id: Worker id passed to the factory, used only for logging
+
+        Yields:
+            A ready-to-use driver
+        """
+        key = threading.get_ident()
+        pooled = self._take(key)
+
+        if pooled is not None and not self.is_healthy(pooled.driver):
+            print(f"♻️ [Thread {thread_id}] Pooled driver is unresponsive - recycling")
+            self.quit_driver(pooled.driver)
+            pooled = None
+
+        if pooled is None:
+            pooled = _PooledDriver(self.factory(thread_id))
+
+        try:
+            yield pooled.driver
+        except BaseException:
+            self.quit_driver(pooled.driver)
+            raise
+
+        pooled.pages_served += 1
+        if pooled.pages_served >= self.max_pages:
+            print(f"♻️ [Thread {thread_id}] Driver served {pooled.pages_served} pages - recycling")
+            self.quit_driver(pooled.driver)
+        else:
+            self._put(key, pooled)
+
+    def close_current(self) -> None:
+        """Quit the calling thread's idle driver, e.g. while the thread is parked"""
+        pooled = self._take(threading.get_ident())
+        if pooled is not None:
+            self.quit_driver(pooled.driver)
+
+    def close_all(self) -> None:
+        """Quit every pooled driver; call once when all workers are done"""
+        with self._lock:
+            pooled_drivers = list(self._drivers.values())
+            self._drivers.clear()
+
+        for pooled in pooled_drivers:
+            self.quit_driver(pooled.driver)
@@ -0,0 +1,91 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+DISTANCE_THRESHOLD_KM = 7
+
+# Column names used by all_scraped_urls.csv / filtered_places.csv
+CENTER_COLUMNS = ("search_lat", "search_lon")
+PLACE_COLUMNS = ("url_lat", "url_lon")
+DISTANCE_COLUMN = "distance_km"
+FLAG_COLUMN = "within_7km"
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Great-circle distance in km between points given in degrees
+
+    Accepts scalars or array-likes and broadcasts them against each other, so
+    one center against many places and one center per place both work.
+    Missing coordinates (NaN) give NaN distances.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=float)) for value in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def within_radius(center_lat, center_lon, lats, lons,
+                  radius_km: float = DISTANCE_THRESHOLD_KM) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Distances from the center(s) and the within-radius mask in one pass
+
+    Returns:
+        (distances_km, mask); the mask is False wherever a coordinate is missing
+    """
+    distances = haversine_km(center_lat, center_lon, lats, lons)
+    mask = np.less_equal(distances, radius_km, where=~np.isnan(distances), out=np.zeros(distances.shape, dtype=bool))
+    return distances, mask
+
+
+def refilter_frame(df, radius_km: float = DISTANCE_THRESHOLD_KM, center: Optional[Tuple[float, float]] = None):
+    """
+    Recompute distance_km and within_7km for stored places at a new radius
+
+    Uses each row's search_lat/search_lon as the center unless ``center`` is
+    given. The flag column keeps its historical name so existing readers work;
+    its YES/NO values follow ``radius_km``.
+
+    Returns:
+        A copy of the DataFrame with both columns recomputed
+    """
+    if center is None:
+        center_lat, center_lon = df[CENTER_COLUMNS[0]].to_numpy(float), df[CENTER_COLUMNS[1]].to_numpy(float)
+    else:
+        center_lat, center_lon = center
+
+    distances, mask = within_radius(center_lat, center_lon,
+                                    df[PLACE_COLUMNS[0]].to_numpy(float), df[PLACE_COLUMNS[1]].to_numpy(float),
+                                    radius_km)
+    result = df.copy()
+    result[DISTANCE_COLUMN] = np.round(distances, 2)
+    result[FLAG_COLUMN] = np.where(mask, "YES", "NO")
+    return result
+
+
+def refilter_csv(input_csv: str, radius_km: float, output_csv: Optional[str] = None,
+                 only_within: bool = True):
+    """
+    Re-filter a stored places CSV (e.g. all_scraped_urls.csv) at a new radius without re-scraping
+
+    Rows stored without coordinates get them parsed from their URL first.
+
+    Args:
+        input_csv: CSV with search_lat/search_lon/url_lat/url_lon columns
+        radius_km: New radius
+        output_csv: Where to write the result (not written if omitted)
+        only_within: Keep only rows inside the radius
+
+    Returns:
+        The re-filtered DataFrame
+    """
+    import pandas as pd
+    from coordinates import fill_missing_coordinates
+
+    result = refilter_frame(fill_missing_coordinates(pd.read_csv(input_csv)), radius_km)
+    if only_within:
+        result = result[result[FLAG_COLUMN] == "YES"]
+    if output_csv:
+        result.to_csv(output_csv, index=False)
+    return result
@@ -0,0 +1,104 @@
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from coordinates import parse_coordinates
+from geo_distance import DISTANCE_THRESHOLD_KM, within_radius
+
+# URLs are parsed and measured this many at a time
+DEFAULT_CHUNK_SIZE = 500
+
+
+def points_in_polygon(lats, lons, polygon: Sequence[Tuple[float, float]]) -> np.ndarray:
+    """
+    Even-odd ray casting for many points against one polygon of (lat, lon) vertices
+
+    Treats coordinates as planar, which is accurate for city-sized polygons
+    that do not cross the antimeridian.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    inside = np.zeros(lats.shape, dtype=bool)
+    vertices = list(polygon)
+    for (lat1, lon1), (lat2, lon2) in zip(vertices, vertices[1:] + vertices[:1]):
+        if lat1 == lat2:
+            continue
+        crosses = (lat1 > lats) != (lat2 > lats)
+        crossing_lon = lon1 + (lats - lat1) * (lon2 - lon1) / (lat2 - lat1)
+        inside ^= crosses & (lons < crossing_lon)
+    return inside
+
+
+class GeoFilter:
+    """
+    Pre-scrape filter that drops place URLs outside a radius or polygon
+
+    Place URLs carry the place's coordinates (!3d/!4d), so places outside the
+    area of interest can be dropped before a browser ever opens them. URLs are
+    processed in chunks, parsed and measured in one vectorized pass each, and
+    the stream stays lazy. URLs without coordinates are kept by default, since
+    their position is unknown until the page is scraped.
+    """
+
+    def __init__(self, center: Optional[Tuple[float, float]] = None, radius_km: float = DISTANCE_THRESHOLD_KM,
+                 polygon: Optional[Sequence[Tuple[float, float]]] = None, keep_unknown: bool = True,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if (center is None) == (polygon is None):
+            raise ValueError("GeoFilter needs either a center or a polygon")
+        if polygon is not None and len(polygon) < 3:
+            raise ValueError("A polygon needs at least 3 vertices")
+        self.center = center
+        self.radius_km = radius_km
+        self.polygon = list(polygon) if polygon is not None else None
+        self.keep_unknown = keep_unknown
+        self.chunk_size = chunk_size
+        self.kept = 0
+        self.dropped = 0
+        self.unknown = 0
+
+    @classmethod
+    def from_config(cls, center=None, radius_km: float = DISTANCE_THRESHOLD_KM,
+                    polygon=None) -> Optional["GeoFilter"]:
+        """Build a filter from script settings, or None when neither a center nor a polygon is set"""
+        if center is None and polygon is None:
+            return None
+        return cls(center=center, radius_km=radius_km, polygon=polygon)
+
+    def describe(self) -> str:
+        if self.polygon is not None:
+            return f"polygon with {len(self.polygon)} vertices"
+        return f"{self.radius_km} km around {self.center[0]}, {self.center[1]}"
+
+    def mask(self, lats, lons) -> np.ndarray:
+        """True for coordinates inside the area (NaN coordinates count as outside)"""
+        if self.polygon is not None:
+            return points_in_polygon(lats, lons, self.polygon)
+        return within_radius(self.center[0], self.center[1], lats, lons, self.radius_km)[1]
+
+    def filter(self, urls: Iterable[str]) -> Iterator[str]:
+        """Yield the URLs inside the area, in input order"""
+        urls = iter(urls)
+        while True:
+            chunk = list(islice(urls, self.chunk_size))
+            if not chunk:
+                return
+
+            coordinates = [parse_coordinates(url, fallback=False) for url in chunk]
+            lats = np.array([lat if lat is not None else np.nan for lat, _ in coordinates])
+            lons = np.array([lon if lon is not None else np.nan for _, lon in coordinates])
+            unknown = np.isnan(lats) | np.isnan(lons)
+            keep = self.mask(lats, lons)
+            if self.keep_unknown:
+                keep |= unknown
+
+            self.unknown += int(unknown.sum())
+            self.kept += int(keep.sum())
+            self.dropped += len(chunk) - int(keep.sum())
+            for url, is_kept in zip(chunk, keep):
+                if is_kept:
+                    yield url
+
+    def summary(self) -> str:
+        return (f"Geo filter ({self.describe()}): kept {self.kept}, dropped {self.dropped} "
+                f"outside the area, {self.unknown} without coordinates")
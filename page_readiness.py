@@ -0,0 +1,184 @@
+import time
+from typing import Dict, Optional
+
+# CSS selector for the place-panel title (same element scrape_data reads the name from)
+PLACE_TITLE_SELECTOR = "h1.DUwDvf"
+
+# Ceiling for a full page load and for a short post-scroll settle
+DEFAULT_READY_TIMEOUT = 15
+DEFAULT_SETTLE_TIMEOUT = 3
+
+# How long the network and the DOM must stay quiet before the page counts as ready
+DEFAULT_QUIET_PERIOD = 0.5
+POLL_INTERVAL = 0.1
+
+# In-flight requests older than this are ignored (long polls, streaming
+# connections) so they cannot keep a page from ever counting as ready
+STALE_REQUEST_MS = 10000
+
+# Tracks page activity in window.__scraperReadiness; safe to run more than once.
+# Network: fetch/XHR calls are counted while in flight, and finished resources are
+# seen through a PerformanceObserver, which keeps reporting after the resource
+# timing buffer is full. Runs before page scripts when installed as a new-document
+# script (install_readiness_tracker), so requests the page starts early are counted.
+READINESS_TRACKER_JS = """
+(function () {
+    var state = window.__scraperReadiness;
+    if (!state) {
+        state = window.__scraperReadiness = {
+            lastMutation: Date.now(), lastNetwork: 0, pending: {}, nextId: 0, observing: false
+        };
+        var noteResponse = function (entry) {
+            if (entry.responseEnd > state.lastNetwork) {
+                state.lastNetwork = entry.responseEnd;
+            }
+        };
+        performance.getEntriesByType('resource').forEach(noteResponse);
+        try {
+            performance.setResourceTimingBufferSize(10000);
+            new PerformanceObserver(function (list) {
+                list.getEntries().forEach(noteResponse);
+            }).observe({type: 'resource'});
+        } catch (e) {}
+
+        var begin = function () {
+            var id = ++state.nextId;
+            state.pending[id] = performance.now();
+            return id;
+        };
+        var end = function (id) {
+            delete state.pending[id];
+            state.lastNetwork = performance.now();
+        };
+        var send = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            var id = begin();
+            this.addEventListener('loadend', function () { end(id); });
+            return send.apply(this, arguments);
+        };
+        if (window.fetch) {
+            var fetch = window.fetch;
+            window.fetch = function () {
+                var id = begin();
+                return fetch.apply(this, arguments).then(
+                    function (response) { end(id); return response; },
+                    function (error) { end(id); throw error; });
+            };
+        }
+    }
+    if (!state.observing && document.documentElement) {
+        state.observing = true;
+        new MutationObserver(function () {
+            state.lastMutation = Date.now();
+        }).observe(document.documentElement, {
+            childList: true, subtree: true, attributes: true, characterData: true
+        });
+    }
+    return state;
+})();
+"""
+
+# Reports the page's readiness signals, installing the tracker if it is not there yet.
+READINESS_PROBE_JS = """
+var selector = arguments[0];
+var staleMs = arguments[1];
+""" + READINESS_TRACKER_JS.replace("(function () {", "var state = (function () {", 1) + """
+var now = performance.now();
+var pending = 0;
+for (var id in state.pending) {
+    if (now - state.pending[id] < staleMs) {
+        pending++;
+    }
+}
+return {
+    documentComplete: document.readyState === 'complete',
+    selectorPresent: selector ? document.querySelector(selector) !== null : true,
+    domQuietMs: Date.now() - state.lastMutation,
+    networkQuietMs: now - state.lastNetwork,
+    pendingRequests: pending
+};
+"""
+
+
+def install_readiness_tracker(driver) -> bool:
+    """
+    Have Chrome run the readiness tracker before page scripts on every new document
+
+    Without it the tracker is installed by the first probe on each page, and
+    requests the page started before that are only seen once they finish.
+    Needs CDP (Chrome); returns False if it could not be installed.
+    """
+    if getattr(driver, '_readiness_tracker_installed', False):
+        return True
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {'source': READINESS_TRACKER_JS})
+    except Exception:
+        return False
+    try:
+        driver._readiness_tracker_installed = True
+    except AttributeError:
+        pass
+    return True
+
+
+def probe_readiness(driver, selector: Optional[str] = PLACE_TITLE_SELECTOR) -> Optional[Dict]:
+    """
+    Read the current readiness signals from the page in one script call
+
+    Returns:
+        dict with documentComplete, selectorPresent, domQuietMs, networkQuietMs and
+        pendingRequests, or None if the page could not be probed (e.g. mid-navigation)
+    """
+    try:
+        return driver.execute_script(READINESS_PROBE_JS, selector, STALE_REQUEST_MS)
+    except Exception:
+        return None
+
+
+def is_ready(signals: Optional[Dict], quiet_period: float = DEFAULT_QUIET_PERIOD) -> bool:
+    """Decide whether a set of probed signals means the page is ready"""
+    if not signals:
+        return False
+
+    quiet_ms = quiet_period * 1000
+    return (signals.get('documentComplete', False)
+            and signals.get('selectorPresent', False)
+            and signals.get('pendingRequests', 0) == 0
+            and signals.get('domQuietMs', 0) >= quiet_ms
+            and signals.get('networkQuietMs', 0) >= quiet_ms)
+
+
+def wait_until_ready(driver, timeout: float = DEFAULT_READY_TIMEOUT,
+                     selector: Optional[str] = PLACE_TITLE_SELECTOR,
+                     quiet_period: float = DEFAULT_QUIET_PERIOD) -> bool:
+    """
+    Wait until the page is ready instead of sleeping for a fixed time
+
+    The page is ready once the document has loaded, ``selector`` is present, no
+    fetch/XHR request is in flight, and both the network and the DOM have been
+    quiet for ``quiet_period`` seconds. The first call on a driver also installs
+    the tracker for the pages it loads next (install_readiness_tracker).
+
+    Args:
+        driver: Selenium WebDriver
+        timeout: Ceiling in seconds; the wait never lasts longer than this
+        selector: CSS selector that must be present, or None to skip that check
+        quiet_period: Seconds of network and DOM inactivity required
+
+    Returns:
+        bool: True if the page became ready, False if the ceiling was reached
+    """
+    install_readiness_tracker(driver)
+    deadline = time.monotonic() + timeout
+    while True:
+        if is_ready(probe_readiness(driver, selector), quiet_period):
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(POLL_INTERVAL)
+
+
+def wait_until_settled(driver, timeout: float = DEFAULT_SETTLE_TIMEOUT,
+                       quiet_period: float = DEFAULT_QUIET_PERIOD) -> bool:
+    """Wait for network and DOM activity to settle, e.g. after scrolling"""
+    return wait_until_ready(driver, timeout=timeout, selector=None, quiet_period=quiet_period)
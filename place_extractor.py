@@ -0,0 +1,270 @@
+import re
+from typing import Dict, List, Optional
+
+# Maximum nodes collected per XPath, so loose fallbacks cannot flood the result
+MAX_CANDIDATES_PER_XPATH = 20
+
+# Walks the place panel once: every XPath of every field's fallback chain is
+# evaluated in order inside the page, and the matching nodes come back as plain
+# candidates. Python then picks the first candidate that validates.
+COLLECT_CANDIDATES_JS = """
+var chains = arguments[0];
+var limit = arguments[1];
+var result = {};
+Object.keys(chains).forEach(function (field) {
+    var candidates = [];
+    chains[field].forEach(function (xpath, index) {
+        var snapshot;
+        try {
+            snapshot = document.evaluate(xpath, document, null,
+                                         XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        } catch (e) {
+            return;
+        }
+        var count = Math.min(snapshot.snapshotLength, limit);
+        for (var i = 0; i < count; i++) {
+            var node = snapshot.snapshotItem(i);
+            candidates.push({
+                xpath: index,
+                text: (node.innerText || node.textContent || '').trim(),
+                href: node.href || node.getAttribute('href') || '',
+                ariaLabel: node.getAttribute('aria-label') || ''
+            });
+        }
+    });
+    result[field] = candidates;
+});
+return result;
+"""
+
+
+def collect_candidates(driver, xpath_chains: Dict[str, List[str]],
+                       limit: int = MAX_CANDIDATES_PER_XPATH) -> Optional[Dict[str, List[Dict]]]:
+    """
+    Collect candidate nodes for every field in a single WebDriver round trip
+
+    Args:
+        driver: Selenium WebDriver on a loaded place page
+        xpath_chains: Field name -> XPaths in priority order (the fallback chain)
+        limit: Maximum nodes taken from each XPath
+
+    Returns:
+        dict: Field name -> list of candidates ({xpath, text, href, ariaLabel}) in
+        chain order, or None if the script could not run
+    """
+    try:
+        candidates = driver.execute_script(COLLECT_CANDIDATES_JS, xpath_chains, limit)
+    except Exception as e:
+        print(f"Warning: JS field extraction failed: {str(e)}")
+        return None
+
+    if not isinstance(candidates, dict):
+        return None
+    return candidates
+
+
+def first_match(candidates: List[Dict], parse):
+    """
+    Return the first non-None result of ``parse`` over a field's candidates
+
+    Args:
+        candidates: Candidates for one field, in fallback-chain order
+        parse: Callable taking a candidate dict, returning a value or None
+    """
+    for candidate in candidates or []:
+        value = parse(candidate)
+        if value is not None:
+            return value
+    return None
+
+
+# Phone number regex patterns for Indian numbers
+PHONE_PATTERNS = [
+    r'\+91[-.\s]?[6-9]\d{4}[-.\s]?\d{5}',  # +91 mobile as Maps shows it (+91 98765 43210)
+    r'0[6-9]\d{4}[-.\s]?\d{5}',  # 0 prefix mobile as Maps shows it (098765 43210)
+    r'\+91[-.\s]?\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}',  # +91 format with spaces
+    r'0\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}',  # 0 prefix format (like 044 2522 2944)
+    r'0\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}'
+    r'\d{3}[-.\s]?\d{4}[-.\s]?\d{4}',  # 3-4-4 format
+    r'\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}',  # General landline format
+    r'[6-9]\d{9}',  # 10-digit mobile format
+    r'\+91[-.\s]?[6-9]\d{9}'  # +91 mobile format
+]
+
+# Filter out common non-category buttons
+# IMPORTANT: "book" should NOT be in excluded_terms as "Book store" is a valid category
+EXCLUDED_CATEGORY_TERMS = ['directions', 'save', 'share', 'nearby', 'call', 'website', 'menu', 'order']
+
+
+def parse_phone_number(candidate):
+    """Return a cleaned phone number from a candidate, or None"""
+    # Extract href for tel: links, text otherwise
+    if candidate['href'].startswith("tel:"):
+        phone_text = candidate['href'].replace("tel:", "").strip()
+    else:
+        phone_text = candidate['text']
+
+    if not phone_text:
+        return None
+
+    for pattern in PHONE_PATTERNS:
+        phone_matches = re.findall(pattern, phone_text)
+        if phone_matches:
+            phone_number = phone_matches[0]
+            # Clean the phone number (keep digits and + only)
+            cleaned_number = ''.join(c for c in phone_number if c.isdigit() or c == '+')
+
+            # Validate length (Indian numbers: 10-13 digits)
+            digit_count = len(re.findall(r'\d', cleaned_number))
+            if 11 <= digit_count <= 13:
+                return cleaned_number
+    return None
+
+
+def parse_store_type(candidate):
+    """Return the category text from a candidate, or None for non-category buttons"""
+    category_text = candidate['text']
+    if category_text and not any(term in category_text.lower() for term in EXCLUDED_CATEGORY_TERMS):
+        return category_text
+    return None
+
+
+def parse_operating_status(candidate):
+    """Return (status, operating_hours) parsed from a status candidate, or None"""
+    status_text = candidate['text']
+    if not status_text or not any(keyword in status_text.lower() for keyword in ['open', 'closed', 'closes', 'opens']):
+        return None
+
+    status_text_lower = status_text.lower()
+    operating_hours = "Not Found"
+
+    # CRITICAL: If operating hours exist, business is operational (status = "Open")
+    # Only set status to "Closed" if NO operating hours are found
+
+    # Handle "Closed ⋅ Opens 8 am" format - business is OPEN (has operating hours)
+    if "closed" in status_text_lower and "opens" in status_text_lower:
+        opens_patterns = [
+            r'opens\s+(.+?)(?:\s+\w{3})?$',  # "Opens 8 am Tue" -> "8 am"
+            r'opens\s+(.+)',  # General opens pattern
+        ]
+        for pattern in opens_patterns:
+            opens_match = re.search(pattern, status_text, re.IGNORECASE)
+            if opens_match:
+                time_part = opens_match.group(1).strip()
+                # Remove day abbreviations (Mon, Tue, etc.)
+                time_part = re.sub(r'\s+\w{3}$', '', time_part).strip()
+                operating_hours = f"Opens {time_part}"
+                break
+        return "Open", operating_hours
+
+    # Handle "Open ⋅ Closes 9 pm" format - business is OPEN
+    if "open" in status_text_lower and "closes" in status_text_lower:
+        status = "Open now" if "open now" in status_text_lower else "Open"
+        closes_patterns = [
+            r'closes\s+(.+?)(?:\s+\w{3})?$',  # "Closes 9 pm" -> "9 pm"
+            r'closes\s+(.+)',  # General closes pattern
+        ]
+        for pattern in closes_patterns:
+            closes_match = re.search(pattern, status_text, re.IGNORECASE)
+            if closes_match:
+                time_part = closes_match.group(1).strip()
+                # Remove day abbreviations
+                time_part = re.sub(r'\s+\w{3}$', '', time_part).strip()
+                operating_hours = f"Closes {time_part}"
+                break
+        return status, operating_hours
+
+    # Handle simple "Open now" or "Open" status
+    if "open now" in status_text_lower:
+        return "Open now", operating_hours
+    if "open" in status_text_lower:
+        return "Open", operating_hours
+
+    # Only set to "Closed" if no operating hours are found
+    if "closed" in status_text_lower and "opens" not in status_text_lower:
+        return "Closed", operating_hours
+
+    return None
+
+
+def parse_operating_hours(candidate):
+    """Return today's hours from an hours-table cell candidate, or None"""
+    hours_text = candidate['text']
+    if hours_text and ("–" in hours_text or "-" in hours_text):
+        return hours_text
+    return None
+
+
+def parse_rating(candidate):
+    """Return a 0-5 rating string from a candidate, or None"""
+    rating_text = candidate['text']
+    if not rating_text:
+        return None
+
+    # Validate that it's a numeric rating
+    if rating_text.replace('.', '').replace(',', '').isdigit():
+        try:
+            rating_value = float(rating_text.replace(',', '.'))
+            if 0 <= rating_value <= 5:  # Valid rating range
+                return rating_text
+        except ValueError:
+            return None
+
+    # Also check for patterns like "4.5" or "5.0"
+    rating_match = re.search(r'^([0-5](?:\.[0-9])?)$', rating_text)
+    if rating_match:
+        return rating_match.group(1)
+    return None
+
+
+def parse_review_count(candidate):
+    """Return the review count from a candidate's aria-label or text, or None"""
+    # Extract number from aria-label like "40 reviews", "1 review" or "1,234 reviews"
+    review_match = re.search(r'(\d[\d,]*)\s+reviews?', candidate['ariaLabel'])
+    if review_match:
+        return review_match.group(1).replace(',', '')
+
+    # Also try extracting from visible text in parentheses like "(40)" or "(1,234)"
+    text_match = re.search(r'\((\d[\d,]*)\)', candidate['text'])
+    if text_match:
+        return text_match.group(1).replace(',', '')
+    return None
+
+
+def parse_place_fields(candidates):
+    """
+    Turn per-field candidates into the business fields of a scrape_data record
+
+    Args:
+        candidates: Field name -> candidates (list or iterator) in fallback-chain order
+
+    Returns:
+        dict: Name, Address, Website, Phone, Store_Type, Operating_Status,
+        Operating_Hours, Rating, Review_Count and Permanently_Closed
+    """
+    name = first_match(candidates['name'], lambda c: c['text'] or None)
+    address = first_match(candidates['address'], lambda c: c['text'] or None)
+    website = first_match(candidates['website'], lambda c: c['href'] or None)
+
+    # Status line first; the hours table is only consulted when no status was found
+    status_and_hours = first_match(candidates['status'], parse_operating_status)
+    if status_and_hours:
+        operating_status, operating_hours = status_and_hours
+    else:
+        operating_status = "Not Found"
+        operating_hours = first_match(candidates['hours'], parse_operating_hours) or "Not Found"
+
+    closed = first_match(candidates['closed'], lambda c: "Yes")
+
+    return {
+        'Name': name or "Name Not Found",
+        'Address': address or "Not Found",
+        'Website': website or "Not Found",
+        'Phone': first_match(candidates['phone'], parse_phone_number) or "Phone Number Not Found",
+        'Store_Type': first_match(candidates['store_type'], parse_store_type) or "Not Found",
+        'Operating_Status': operating_status,
+        'Operating_Hours': operating_hours,
+        'Rating': first_match(candidates['rating'], parse_rating) or "Not Found",
+        'Review_Count': first_match(candidates['review_count'], parse_review_count) or "Not Found",
+        'Permanently_Closed': closed or "No"
+    }
@@ -0,0 +1,169 @@
+import json
+import re
+import sys
+import urllib.request
+from typing import Any, Dict, Optional, Sequence
+
+HTTP_TIMEOUT = 15
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36")
+
+# Anti-JSON-hijacking prefix Google puts in front of embedded JSON payloads
+XSSI_PREFIX = ")]}'"
+
+STATE_MARKER = re.compile(r'window\.APP_INITIALIZATION_STATE\s*=\s*')
+
+# Index paths into the place-info array embedded in the page state, tried in order.
+# Google does not document this layout; keep every path here so a format change
+# is a one-line fix.
+PLACE_INFO_PATHS = {
+    'Name': [(11,)],
+    'Address': [(39,), (18,)],
+    'Website': [(7, 0)],
+    'Phone': [(178, 0, 0), (3, 0)],
+    'Store_Type': [(13, 0)],
+    'Rating': [(4, 7)],
+    'Review_Count': [(4, 8)],
+    'Latitude': [(9, 2)],
+    'Longitude': [(9, 3)],
+    'Status_Text': [(203, 1, 4, 0)],
+    'Hours': [(34, 1, 0, 1)],
+}
+
+# Status_Text values that mean the place is closed for good or for now
+CLOSED_MARKERS = ("Permanently closed", "Temporarily closed")
+
+
+def _get_path(data: Any, path: Sequence[int]) -> Any:
+    """Follow an index path into nested lists, returning None if it does not exist"""
+    for index in path:
+        if not isinstance(data, list) or index >= len(data):
+            return None
+        data = data[index]
+    return data
+
+
+def _first_value(info: list, field: str) -> Any:
+    for path in PLACE_INFO_PATHS[field]:
+        value = _get_path(info, path)
+        if value not in (None, "", []):
+            return value
+    return None
+
+
+def extract_initialization_state(html: str) -> Optional[list]:
+    """Decode the APP_INITIALIZATION_STATE array from a place page's HTML"""
+    match = STATE_MARKER.search(html)
+    if not match:
+        return None
+    try:
+        state, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except ValueError:
+        return None
+    return state if isinstance(state, list) else None
+
+
+def find_place_info(state: list) -> Optional[list]:
+    """
+    Locate the place-info array inside the initialization state
+
+    The place payload is one of the XSSI-prefixed JSON strings in state[3];
+    the info array is element 6 of that payload.
+    """
+    for payload in _get_path(state, (3,)) or []:
+        if not isinstance(payload, str) or not payload.startswith(XSSI_PREFIX):
+            continue
+        try:
+            decoded = json.loads(payload[len(XSSI_PREFIX):])
+        except ValueError:
+            continue
+        info = _get_path(decoded, (6,))
+        if isinstance(info, list) and isinstance(_get_path(info, (11,)), str):
+            return info
+    return None
+
+
+def parse_place_page(html: str, url: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a saved or fetched place page into a scrape_data-style record
+
+    Operating_Status, Phone, Store_Type and Rating are the raw payload values;
+    callers normalise them with the same parsers as the Selenium path. Returns
+    None when the page does not carry a usable place payload (consent page,
+    layout change, missing name or address), so the caller can fall back to
+    the browser.
+    """
+    state = extract_initialization_state(html)
+    info = find_place_info(state) if state else None
+    if info is None:
+        return None
+
+    name = _first_value(info, 'Name')
+    address = _first_value(info, 'Address')
+    if not name or not address:
+        return None
+
+    hours = _first_value(info, 'Hours')
+    if isinstance(hours, list):
+        hours = ", ".join(str(part) for part in hours)
+
+    status_text = _first_value(info, 'Status_Text')
+    closed = isinstance(status_text, str) and status_text.startswith(CLOSED_MARKERS)
+
+    def text(field, default="Not Found"):
+        value = _first_value(info, field)
+        return default if value is None else str(value)
+
+    return {
+        'URL': url,
+        'Name': name,
+        'Address': address,
+        'Website': text('Website'),
+        'Phone': text('Phone', "Phone Number Not Found"),
+        'Store_Type': text('Store_Type'),
+        'Operating_Status': text('Status_Text'),
+        'Operating_Hours': hours or "Not Found",
+        'Rating': text('Rating'),
+        'Review_Count': text('Review_Count'),
+        'Permanently_Closed': "Yes" if closed else "No",
+        'Latitude': text('Latitude'),
+        'Longitude': text('Longitude'),
+    }
+
+
+def fetch_place_page(url: str, timeout: float = HTTP_TIMEOUT) -> Optional[str]:
+    """Download a place page without a browser; returns None on any failure"""
+    request = urllib.request.Request(url, headers={
+        'User-Agent': USER_AGENT,
+        'Accept-Language': 'en-US,en;q=0.9',
+    })
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            # A redirect to consent.google.com means the payload is not there
+            if 'consent.' in response.geturl():
+                return None
+            charset = response.headers.get_content_charset() or 'utf-8'
+            return response.read().decode(charset, errors='replace')
+    except Exception as e:
+        print(f"Warning: HTTP fetch failed for {url[:80]}: {e}")
+        return None
+
+
+def fetch_place_record(url: str, timeout: float = HTTP_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """Fetch and parse a place page over plain HTTP; None means use the browser"""
+    html = fetch_place_page(url, timeout)
+    if html is None:
+        return None
+    return parse_place_page(html, url)
+
+
+if __name__ == "__main__":
+    # Save a place page as a parser fixture: python place_fetcher.py <place URL> <output.html>
+    if len(sys.argv) != 3:
+        sys.exit("usage: python place_fetcher.py <place URL> <output.html>")
+    page = fetch_place_page(sys.argv[1])
+    if page is None:
+        sys.exit("Could not fetch the page")
+    with open(sys.argv[2], 'w', encoding='utf-8') as file:
+        file.write(page)
+    print(json.dumps(parse_place_page(page, sys.argv[1]), ensure_ascii=False, indent=2))
@@ -0,0 +1,132 @@
+import base64
+import re
+import struct
+import threading
+from typing import Iterable, Iterator, Optional, Set
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+# Feature ID embedded in place URLs: data=...!1s0x390ce3607036239d:0x4ae2a2b7c1882de7...
+FEATURE_ID_PATTERN = re.compile(r'!1s(0x[0-9a-fA-F]+):(0x[0-9a-fA-F]+)')
+# A key that is already canonical
+CANONICAL_KEY_PATTERN = re.compile(r'^0x[0-9a-f]+:0x[0-9a-f]+$')
+# Place ID embedded in place URLs: ...!19sChIJnSM2cGDjDDkR5y2Iwbei4ko?authuser=0
+PLACE_ID_PATTERN = re.compile(r'!19s(ChIJ[A-Za-z0-9_-]+)')
+# The same IDs in query parameters (ftid=0x..:0x.., query_place_id=ChIJ..)
+FTID_PARAM_PATTERN = re.compile(r'^(0x[0-9a-fA-F]+):(0x[0-9a-fA-F]+)$')
+
+
+def _format_feature_id(high: int, low: int) -> str:
+    return f"0x{high:x}:0x{low:x}"
+
+
+def place_id_to_feature_id(place_id: str) -> Optional[str]:
+    """
+    Decode a ChIJ... place ID into its feature ID
+
+    A ChIJ place ID is URL-safe base64 of a small protobuf holding the two
+    64-bit halves of the feature ID as little-endian fixed64 fields.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(place_id + '=' * (-len(place_id) % 4))
+    except (ValueError, TypeError):
+        return None
+    # 0x0a 0x12 (field 1, 18 bytes) 0x09 <8 bytes> 0x11 <8 bytes>
+    if len(raw) < 20 or raw[:3] != b'\x0a\x12\x09' or raw[11] != 0x11:
+        return None
+    high, = struct.unpack('<Q', raw[3:11])
+    low, = struct.unpack('<Q', raw[12:20])
+    return _format_feature_id(high, low)
+
+
+def normalize_url(url: str) -> str:
+    """Drop the query string and fragment (authuser, hl, rclk, ...) from a URL"""
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, '', ''))
+
+
+def place_key(url: Optional[str]) -> Optional[str]:
+    """
+    Canonical identity of the place a Google Maps URL points to
+
+    The key is the feature ID ("0x...:0x...", lowercase), taken from the
+    ``!1s`` data segment, an ``ftid`` parameter, or decoded from a ``!19sChIJ``
+    place ID, so the same place gets the same key whatever the slug or query
+    parameters. URLs without either ID fall back to the URL without its query
+    string. Passing a key returns it unchanged.
+
+    Returns:
+        The key, or None for an empty URL
+    """
+    if not url or not isinstance(url, str):
+        return None
+    url = url.strip()
+    if CANONICAL_KEY_PATTERN.match(url):
+        return url
+
+    match = FEATURE_ID_PATTERN.search(url)
+    if match:
+        return _format_feature_id(int(match.group(1), 16), int(match.group(2), 16))
+
+    match = PLACE_ID_PATTERN.search(url)
+    if match:
+        feature_id = place_id_to_feature_id(match.group(1))
+        if feature_id:
+            return feature_id
+
+    query = parse_qs(urlsplit(url).query)
+    for ftid in query.get('ftid', []):
+        match = FTID_PARAM_PATTERN.match(ftid)
+        if match:
+            return _format_feature_id(int(match.group(1), 16), int(match.group(2), 16))
+    for place_id in query.get('query_place_id', []):
+        feature_id = place_id_to_feature_id(place_id)
+        if feature_id:
+            return feature_id
+
+    return normalize_url(url)
+
+
+class PlaceKeySet:
+    """
+    Thread-safe set of places, keyed by place_key
+
+    Accepts URLs or keys for every operation, so existing ``url in seen`` and
+    ``seen.add(url)`` call sites dedupe on the place instead of the URL string.
+    """
+
+    def __init__(self, urls: Iterable[str] = ()):
+        self._keys: Set[str] = set()
+        self._lock = threading.Lock()
+        self.update(urls)
+
+    def __contains__(self, url: str) -> bool:
+        return place_key(url) in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._keys))
+
+    def add(self, url: str) -> None:
+        key = place_key(url)
+        if key:
+            with self._lock:
+                self._keys.add(key)
+
+    def update(self, urls: Iterable[str]) -> None:
+        keys = {place_key(url) for url in urls}
+        keys.discard(None)
+        with self._lock:
+            self._keys.update(keys)
+
+    def claim(self, url: str) -> bool:
+        """Add a place unless it is already present; True if this call added it"""
+        key = place_key(url)
+        if not key:
+            return False
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+            return True
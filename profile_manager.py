@@ -0,0 +1,216 @@
+import itertools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Callable, Optional
+
+# All per-worker profiles and the template live under this directory
+PROFILE_ROOT = os.path.join(tempfile.gettempdir(), "maps_scraper_profiles")
+TEMPLATE_DIRNAME = "template"
+WORKER_PREFIX = "worker_"
+OWNER_FILE = ".owner"
+
+# Worker profiles whose owner cannot be checked are removed after this long
+STALE_PROFILE_AGE = 12 * 3600
+
+# Written into the template before Chrome ever opens it
+TEMPLATE_PREFERENCES = {
+    'intl': {'accept_languages': 'en-US,en', 'selected_languages': 'en-US,en'},
+    'translate': {'enabled': False},
+    'profile': {'exit_type': 'Normal', 'exited_cleanly': True},
+    'credentials_enable_service': False,
+}
+
+# Pre-accepted consent cookie so place pages skip the consent interstitial
+CONSENT_COOKIES = [
+    {'name': 'CONSENT', 'value': 'YES+cb', 'domain': '.google.com', 'path': '/'},
+]
+
+
+def _pid_alive(pid: int) -> Optional[bool]:
+    """True/False if the process state is known, None if it cannot be checked safely"""
+    try:
+        import psutil
+        return psutil.pid_exists(pid)
+    except ImportError:
+        pass
+
+    # os.kill(pid, 0) terminates the process on Windows, so only probe on POSIX
+    if os.name != 'posix':
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _clone_tree(source: str, destination: str) -> None:
+    """
+    Copy a directory tree, using filesystem copy-on-write clones where available
+
+    Hardlinks are not used: Chrome rewrites its SQLite files in place, which
+    would corrupt the template through a shared inode.
+    """
+    system = platform.system()
+    command = None
+    if system == "Linux":
+        command = ["cp", "-r", "--reflink=auto", source, destination]
+    elif system == "Darwin":
+        command = ["cp", "-R", "-c", source, destination]
+
+    if command:
+        try:
+            subprocess.run(command, check=True, capture_output=True, timeout=60)
+            return
+        except Exception:
+            shutil.rmtree(destination, ignore_errors=True)
+
+    shutil.copytree(source, destination)
+
+
+class ProfileManager:
+    """
+    Hands out per-worker Chrome user-data-dirs cloned from one warm template
+
+    The template is prepared once (language preferences, consent cookie and
+    whatever Chrome writes on first start) so each driver launches on a warm
+    profile. Clones are removed when their driver quits, and ``gc`` removes
+    clones left behind by crashed or killed runs.
+    """
+
+    def __init__(self, root: str = PROFILE_ROOT, stale_age: float = STALE_PROFILE_AGE):
+        self.root = root
+        self.stale_age = stale_age
+        self.template_dir = os.path.join(root, TEMPLATE_DIRNAME)
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+
+    def ensure_template(self, warm: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Create the template profile if it does not exist yet
+
+        Args:
+            warm: Optional callable that opens Chrome on the template directory
+                  once (see warm_with_selenium); failures leave a cold but usable template
+        """
+        with self._lock:
+            if os.path.isdir(self.template_dir):
+                return self.template_dir
+
+            building_dir = f"{self.template_dir}.building_{os.getpid()}"
+            shutil.rmtree(building_dir, ignore_errors=True)
+            os.makedirs(os.path.join(building_dir, "Default"))
+            with open(os.path.join(building_dir, "Default", "Preferences"), 'w', encoding='utf-8') as file:
+                json.dump(TEMPLATE_PREFERENCES, file)
+            with open(os.path.join(building_dir, "First Run"), 'w', encoding='utf-8'):
+                pass
+
+            if warm is not None:
+                try:
+                    warm(building_dir)
+                    print("🔥 Warmed Chrome profile template")
+                except Exception as e:
+                    print(f"Warning: Could not warm Chrome profile template: {e}")
+
+            # Drop lock files Chrome leaves behind so clones do not look in use
+            for name in ("SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile"):
+                path = os.path.join(building_dir, name)
+                if os.path.lexists(path):
+                    os.remove(path)
+
+            try:
+                os.rename(building_dir, self.template_dir)
+            except OSError:
+                # Another process finished its template first
+                shutil.rmtree(building_dir, ignore_errors=True)
+            return self.template_dir
+
+    def clone(self, worker_id, warm: Optional[Callable[[str], None]] = None) -> str:
+        """Create a fresh profile directory for one driver and return its path"""
+        template = self.ensure_template(warm)
+        profile_dir = os.path.join(
+            self.root, f"{WORKER_PREFIX}{worker_id}_{os.getpid()}_{next(self._counter)}")
+        try:
+            _clone_tree(template, profile_dir)
+        except Exception as e:
+            print(f"Warning: Could not clone profile template ({e}), starting from an empty profile")
+            os.makedirs(profile_dir, exist_ok=True)
+
+        with open(os.path.join(profile_dir, OWNER_FILE), 'w', encoding='utf-8') as file:
+            file.write(str(os.getpid()))
+        return profile_dir
+
+    def release(self, profile_dir: Optional[str]) -> None:
+        """Delete a cloned profile once its browser has exited"""
+        if profile_dir and os.path.basename(profile_dir).startswith(WORKER_PREFIX):
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+    def _is_stale(self, profile_dir: str) -> bool:
+        try:
+            with open(os.path.join(profile_dir, OWNER_FILE), 'r', encoding='utf-8') as file:
+                owner = int(file.read().strip())
+        except (OSError, ValueError):
+            owner = None
+
+        if owner == os.getpid():
+            return False
+        if owner is not None:
+            alive = _pid_alive(owner)
+            if alive is not None:
+                return not alive
+
+        try:
+            return time.time() - os.path.getmtime(profile_dir) > self.stale_age
+        except OSError:
+            return False
+
+    def gc(self) -> int:
+        """Remove worker profiles left by processes that are gone; returns how many"""
+        if not os.path.isdir(self.root):
+            return 0
+
+        removed = 0
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.startswith(WORKER_PREFIX) and os.path.isdir(path) and self._is_stale(path):
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+
+        if removed:
+            print(f"🧹 Removed {removed} stale Chrome profiles from {self.root}")
+        return removed
+
+
+def warm_with_selenium(template_dir: str, url: str = "https://www.google.com/maps?hl=en") -> None:
+    """Open headless Chrome on the template once to set the consent cookie and fill caches"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from browser_discovery import discover_browser
+
+    browser = discover_browser()
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument(f'--user-data-dir={template_dir}')
+    service = Service(browser['driver_path']) if browser['driver_path'] else Service()
+
+    driver = webdriver.Chrome(service=service, options=options)
+    try:
+        driver.get("https://www.google.com/")
+        for cookie in CONSENT_COOKIES:
+            driver.add_cookie(dict(cookie, expiry=int(time.time()) + 365 * 24 * 3600))
+        driver.get(url)
+    finally:
+        driver.quit()
+
+
+# Shared by every scraper in this process
+profile_manager = ProfileManager()
@@ -0,0 +1,110 @@
+from typing import Dict, List
+
+# URL patterns (Network.setBlockedURLs wildcard syntax) for each resource class.
+# Scripts, stylesheets and XHR are never blocked: the place panel and the results
+# feed are rendered from them.
+IMAGE_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico", "*.bmp",
+    "*googleusercontent.com/*",  # place photos and avatars
+    "*ggpht.com/*",
+]
+
+FONT_PATTERNS = [
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*fonts.gstatic.com/*",
+]
+
+MEDIA_PATTERNS = [
+    "*.mp4", "*.webm", "*.mp3", "*.ogg",
+]
+
+MAP_TILE_PATTERNS = [
+    "*/maps/vt?*",  # raster road tiles
+    "*/maps/vt/*",
+    "*/kh/v=*",  # satellite tiles
+    "*khms*.google.com/*",
+    "*streetviewpixels-pa.googleapis.com/*",
+    "*/maps/rpc/photo*",
+]
+
+RESOURCE_CLASSES = {
+    'images': IMAGE_PATTERNS,
+    'fonts': FONT_PATTERNS,
+    'media': MEDIA_PATTERNS,
+    'map_tiles': MAP_TILE_PATTERNS,
+}
+
+# Named profiles: which resource classes each scraping stage blocks
+RESOURCE_PROFILES: Dict[str, List[str]] = {
+    'full': [],
+    'no_media': ['images', 'fonts', 'media'],
+    'search_results': ['images', 'fonts', 'media', 'map_tiles'],
+    'place_details': ['images', 'fonts', 'media', 'map_tiles'],
+}
+
+
+def profile_classes(profile: str) -> List[str]:
+    """
+    Return the resource classes a profile blocks
+
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    if profile not in RESOURCE_PROFILES:
+        raise ValueError(f"Unknown resource profile {profile!r}, expected one of {list(RESOURCE_PROFILES)}")
+    return RESOURCE_PROFILES[profile]
+
+
+def blocked_patterns(profile: str) -> List[str]:
+    """
+    Return the URL patterns a profile blocks
+
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    patterns = []
+    for resource_class in profile_classes(profile):
+        patterns.extend(RESOURCE_CLASSES[resource_class])
+    return patterns
+
+
+def apply_resource_options(options, profile: str):
+    """
+    Add browser preferences for a profile to Chrome options before launch
+
+    Image blocking is also set as a content setting so images are skipped by the
+    renderer even before the CDP block list is installed.
+
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    if 'images' in profile_classes(profile):
+        prefs = dict(options.experimental_options.get("prefs", {}))
+        prefs["profile.managed_default_content_settings.images"] = 2
+        options.add_experimental_option("prefs", prefs)
+    return options
+
+
+def apply_resource_policy(driver, profile: str):
+    """
+    Install a profile's block list on a running Chromium driver via CDP
+
+    Failures are reported and ignored: a driver without the policy still works,
+    it only downloads more.
+
+    Returns:
+        The same driver, so this can wrap a constructor call
+
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    patterns = blocked_patterns(profile)
+    if not patterns:
+        return driver
+
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception as e:
+        print(f"Warning: Could not apply resource profile '{profile}': {e}")
+    return driver
@@ -0,0 +1,204 @@
+import json
+from typing import Dict, List, Optional
+
+from page_readiness import wait_until_settled
+
+# Google Maps renders this line under the last search result
+END_OF_LIST_TEXT = "You've reached the end of the list"
+END_OF_LIST_SELECTOR = "span.HlvSq"
+FEED_ITEM_SELECTOR = "a[href*='/maps/place/']"
+
+# Selector that is present once a search has rendered (a results feed, or a
+# single place panel when the search matched exactly one place)
+SEARCH_READY_SELECTOR = "div[role='feed'], h1.DUwDvf"
+
+# Ceiling for one scroll's wait for new results, and how long the feed must stop
+# changing before a batch of results counts as fully rendered
+DEFAULT_GROWTH_TIMEOUT = 5
+DEFAULT_FEED_QUIET_MS = 400
+
+# Stop after this many scrolls in a row that loaded nothing new
+MAX_STALLED_SCROLLS = 3
+
+# Shared by both scripts: measures the feed and looks for the end-of-list marker
+_FEED_STATE_FUNCTION = """
+function feedState(feed) {
+    var tail = '';
+    var child = feed.lastElementChild;
+    for (var i = 0; child && i < 3; i++, child = child.previousElementSibling) {
+        tail += child.textContent || '';
+    }
+    return {
+        scrollHeight: feed.scrollHeight,
+        itemCount: feed.querySelectorAll(%(item)s).length,
+        endOfList: document.querySelector(%(end_selector)s) !== null
+                   || tail.indexOf(%(end_text)s) !== -1
+    };
+}
+""" % {'item': json.dumps(FEED_ITEM_SELECTOR), 'end_selector': json.dumps(END_OF_LIST_SELECTOR),
+       'end_text': json.dumps(END_OF_LIST_TEXT)}
+
+FEED_STATE_JS = _FEED_STATE_FUNCTION + """
+return feedState(arguments[0] || document.scrollingElement);
+"""
+
+# Async script: scroll the feed to the bottom, then resolve once the feed has
+# mutated and gone quiet for arguments[2] ms, or after arguments[1] ms without growth
+SCROLL_AND_WAIT_JS = _FEED_STATE_FUNCTION + """
+var feed = arguments[0] || document.scrollingElement;
+var timeoutMs = arguments[1];
+var quietMs = arguments[2];
+var done = arguments[arguments.length - 1];
+
+var before = feedState(feed);
+feed.scrollTop = feed.scrollHeight;
+if (before.endOfList) {
+    done(before);
+    return;
+}
+
+var finished = false, quietTimer = null, observer = null;
+function finish() {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    clearTimeout(quietTimer);
+    clearTimeout(ceilingTimer);
+    done(feedState(feed));
+}
+observer = new MutationObserver(function () {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(finish, quietMs);
+});
+observer.observe(feed, {childList: true, subtree: true});
+var ceilingTimer = setTimeout(finish, timeoutMs);
+"""
+
+
+# Returns [{href, name, rating}] for result links not returned by an earlier call
+# on this page, deduplicated by href. arguments[0] is the list of link selectors.
+# The seen-set lives on window, so it resets whenever a new search is loaded.
+HARVEST_FEED_JS = """
+var selectors = arguments[0];
+var seen = window.__scraperHarvested || (window.__scraperHarvested = {});
+var items = [];
+for (var s = 0; s < selectors.length; s++) {
+    var links = document.querySelectorAll(selectors[s]);
+    for (var i = 0; i < links.length; i++) {
+        var link = links[i].closest('a') || links[i];
+        var href = link.href;
+        if (!href || seen[href]) { continue; }
+        seen[href] = true;
+        var card = link.closest('div[role="article"]') || link.parentElement;
+        var ratingNode = card ? card.querySelector('span.MW4etd') : null;
+        var nameNode = card ? card.querySelector('.qBF1Pd, .fontHeadlineSmall') : null;
+        items.push({
+            href: href,
+            name: link.getAttribute('aria-label') || (nameNode ? nameNode.textContent.trim() : ''),
+            rating: ratingNode ? ratingNode.textContent.trim() : ''
+        });
+    }
+}
+return items;
+"""
+
+
+def harvest_new_results(driver, selectors: List[str]) -> Optional[List[Dict]]:
+    """
+    Collect the feed's result links in one script call
+
+    Only results that appeared since the previous call on the same page are
+    returned, so each scroll processes just the newly loaded items.
+
+    Returns:
+        List of {'href', 'name', 'rating'} dicts, or None if the script failed
+    """
+    try:
+        return driver.execute_script(HARVEST_FEED_JS, selectors) or []
+    except Exception:
+        return None
+
+
+def read_feed_state(driver, feed=None) -> Optional[Dict]:
+    """Measure the results feed: scrollHeight, itemCount and endOfList"""
+    try:
+        return driver.execute_script(FEED_STATE_JS, feed)
+    except Exception:
+        return None
+
+
+def scroll_and_wait(driver, feed=None, timeout: float = DEFAULT_GROWTH_TIMEOUT,
+                    quiet_ms: int = DEFAULT_FEED_QUIET_MS) -> Optional[Dict]:
+    """
+    Scroll the feed once and wait for it to grow instead of sleeping a fixed time
+
+    Returns as soon as new results have rendered, the end-of-list marker is
+    visible, or ``timeout`` passes with no change.
+
+    Returns:
+        The feed state after the wait, or None if the feed could not be read
+    """
+    try:
+        driver.set_script_timeout(timeout + 5)
+        return driver.execute_async_script(SCROLL_AND_WAIT_JS, feed, int(timeout * 1000), quiet_ms)
+    except Exception:
+        # Fall back to a plain scroll and a settle wait (e.g. the feed was re-rendered)
+        try:
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        except Exception:
+            pass
+        wait_until_settled(driver, timeout=timeout)
+        return read_feed_state(driver, feed)
+
+
+class FeedProgress:
+    """
+    Decides when a results-feed scroll loop should stop
+
+    The loop stops when Google shows the end-of-list marker, when the target
+    number of results is reached, when ``max_stalled`` scrolls in a row neither
+    grew the feed nor yielded new URLs, or at the ``max_scrolls`` ceiling.
+    """
+
+    def __init__(self, max_scrolls: int, max_stalled: int = MAX_STALLED_SCROLLS,
+                 target_count: Optional[int] = None):
+        self.max_scrolls = max_scrolls
+        self.max_stalled = max_stalled
+        self.target_count = target_count
+        self.scrolls = 0
+        self.stalled = 0
+        self.reached_end = False
+        self._last_height = None
+        self._last_count = None
+
+    def update(self, state: Optional[Dict], results_so_far: int, new_results: int) -> Optional[str]:
+        """
+        Record one scroll
+
+        Args:
+            state: Feed state after the scroll (see read_feed_state)
+            results_so_far: Results collected for this search so far
+            new_results: Results that this scroll added
+
+        Returns:
+            The reason to stop, or None to keep scrolling
+        """
+        self.scrolls += 1
+        state = state or {}
+
+        grew = (state.get('scrollHeight') != self._last_height
+                or state.get('itemCount') != self._last_count)
+        self._last_height = state.get('scrollHeight')
+        self._last_count = state.get('itemCount')
+        self.stalled = 0 if grew or new_results else self.stalled + 1
+
+        if state.get('endOfList'):
+            self.reached_end = True
+            return "reached end of list"
+        if self.target_count is not None and results_so_far >= self.target_count:
+            return f"reached target of {self.target_count} results"
+        if self.stalled >= self.max_stalled:
+            return f"feed stopped growing for {self.stalled} scrolls"
+        if self.scrolls >= self.max_scrolls:
+            return f"hit the {self.max_scrolls}-scroll ceiling"
+        return None
@@ -0,0 +1,110 @@
+import csv
+import os
+import threading
+from typing import Iterable, Optional, Set
+
+from place_keys import place_key
+
+# Sidecar key log written next to the output CSV
+SIDECAR_SUFFIX = ".keys"
+
+
+class ResumeIndex:
+    """
+    In-memory index of places already written to an output CSV
+
+    Built once at startup and updated on every successful append, so resume
+    checks are a set lookup instead of a rescan of the output file. URLs are
+    stored as canonical place keys (see place_keys.place_key), so a place is
+    recognised under any slug or query string. When a sidecar key log is
+    enabled every added key is also appended to it, and the next run loads the
+    index from the sidecar instead of parsing the CSV.
+    """
+
+    def __init__(self, keys: Iterable[str] = (), sidecar_path: Optional[str] = None):
+        self._keys: Set[str] = {place_key(key) for key in keys if key}
+        self._lock = threading.Lock()
+        self.sidecar_path = sidecar_path
+
+    @classmethod
+    def load(cls, output_filename: str, key_column: str = 'URL', use_sidecar: bool = True) -> "ResumeIndex":
+        """
+        Build the index for an output CSV
+
+        The sidecar is trusted only if it is at least as new as the CSV; a CSV
+        edited by hand after the last run is re-read and the sidecar rewritten.
+
+        Args:
+            output_filename: Output CSV the scraper appends results to
+            key_column: Column holding the URL
+            use_sidecar: Persist keys to ``<output_filename>.keys``
+        """
+        sidecar_path = output_filename + SIDECAR_SUFFIX if use_sidecar else None
+
+        if sidecar_path and cls._sidecar_is_current(sidecar_path, output_filename):
+            with open(sidecar_path, 'r', encoding='utf-8') as file:
+                keys = [line.rstrip('\n') for line in file if line.strip()]
+            print(f"📋 Loaded {len(keys)} processed URLs from {sidecar_path}")
+            return cls(keys, sidecar_path)
+
+        keys = cls._read_csv_keys(output_filename, key_column)
+        index = cls(keys, sidecar_path)
+        if sidecar_path:
+            index._rewrite_sidecar()
+        print(f"📋 Indexed {len(index)} processed URLs from {output_filename}")
+        return index
+
+    @staticmethod
+    def _sidecar_is_current(sidecar_path: str, output_filename: str) -> bool:
+        if not os.path.exists(sidecar_path):
+            return False
+        if not os.path.exists(output_filename):
+            return False
+        return os.path.getmtime(sidecar_path) >= os.path.getmtime(output_filename)
+
+    @staticmethod
+    def _read_csv_keys(output_filename: str, key_column: str) -> Set[str]:
+        keys = set()
+        if not os.path.exists(output_filename):
+            return keys
+
+        try:
+            with open(output_filename, 'r', newline='', encoding='utf-8') as file:
+                for row in csv.DictReader(file):
+                    key = place_key(row.get(key_column))
+                    if key:
+                        keys.add(key)
+        except Exception as e:
+            print(f"Warning: Error reading processed URLs from {output_filename}: {e}")
+        return keys
+
+    def _rewrite_sidecar(self) -> None:
+        try:
+            with open(self.sidecar_path, 'w', encoding='utf-8') as file:
+                for key in self._keys:
+                    file.write(key + '\n')
+        except OSError as e:
+            print(f"Warning: Could not write resume sidecar {self.sidecar_path}: {e}")
+            self.sidecar_path = None
+
+    def __contains__(self, url: str) -> bool:
+        return place_key(url) in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, url: str) -> None:
+        """Record a URL as processed; call after its row has been appended"""
+        key = place_key(url)
+        if not key:
+            return
+        with self._lock:
+            if key in self._keys:
+                return
+            self._keys.add(key)
+            if self.sidecar_path:
+                try:
+                    with open(self.sidecar_path, 'a', encoding='utf-8') as file:
+                        file.write(key + '\n')
+                except OSError as e:
+                    print(f"Warning: Could not append to resume sidecar {self.sidecar_path}: {e}")
@@ -0,0 +1,381 @@
+import bisect
+import csv
+import hashlib
+import heapq
+import io
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from typing import Dict, Iterable, Optional
+
+from place_keys import place_key
+
+# Companion files next to the sorted hash file
+LOG_SUFFIX = ".log"
+BLOOM_SUFFIX = ".bloom"
+SOURCES_SUFFIX = ".sources"
+
+# Fold the append log into the sorted file once it holds this many hashes
+COMPACT_THRESHOLD = 100_000
+
+BLOOM_FALSE_POSITIVE_RATE = 0.01
+
+HASH_STRUCT = struct.Struct('<Q')
+
+# Bloom file header: bit count, hash count, and the number of hashes in the sorted file it was built from
+BLOOM_HEADER = struct.Struct('<QIQ')
+
+# A synced CSV is fingerprinted by the bytes just before its synced offset, so a
+# rewrite is told apart from an append without re-reading the file
+SOURCE_TAIL_BYTES = 4096
+
+# URLs read from a CSV are added to the store this many at a time
+SYNC_BATCH_SIZE = 10_000
+
+
+def key_hash(url_or_key: str) -> Optional[int]:
+    """64-bit hash of a URL's canonical place key (stable across runs and machines)"""
+    key = place_key(url_or_key)
+    if not key:
+        return None
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _hash_array(data: bytes = b'') -> array:
+    hashes = array('Q')
+    hashes.frombytes(data)
+    if sys.byteorder != 'little':
+        hashes.byteswap()
+    return hashes
+
+
+def _hash_bytes(hashes: array) -> bytes:
+    if sys.byteorder != 'little':
+        hashes = array('Q', hashes)
+        hashes.byteswap()
+    return hashes.tobytes()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 64-bit hashes (double hashing on the two halves)"""
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytearray] = None):
+        self.num_bits = max(8, num_bits)
+        self.num_hashes = max(1, num_hashes)
+        self.bits = bits if bits is not None else bytearray((self.num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float = BLOOM_FALSE_POSITIVE_RATE) -> "BloomFilter":
+        capacity = max(1, capacity)
+        num_bits = int(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))
+        num_hashes = int(round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, value: int):
+        low, high = value & 0xFFFFFFFF, value >> 32
+        for i in range(self.num_hashes):
+            yield (low + i * high) % self.num_bits
+
+    def add(self, value: int) -> None:
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: int) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    def save(self, path: str, sorted_count: int) -> None:
+        """Save the filter, recording how many sorted-file hashes it covers"""
+        with open(path, 'wb') as file:
+            file.write(BLOOM_HEADER.pack(self.num_bits, self.num_hashes, sorted_count))
+            file.write(self.bits)
+
+    @classmethod
+    def load(cls, path: str, sorted_count: int) -> Optional["BloomFilter"]:
+        """Load a saved filter, or None if it is missing, damaged or built from a different sorted file"""
+        try:
+            with open(path, 'rb') as file:
+                num_bits, num_hashes, saved_count = BLOOM_HEADER.unpack(file.read(BLOOM_HEADER.size))
+                bits = bytearray(file.read())
+        except (OSError, struct.error):
+            return None
+        if saved_count != sorted_count or len(bits) != (num_bits + 7) // 8:
+            return None
+        return cls(num_bits, num_hashes, bits)
+
+
+class SeenStore:
+    """
+    Persistent set of seen places stored as 64-bit hashes of their place keys
+
+    The main file is a sorted array of little-endian uint64 hashes that is
+    memory-mapped and binary-searched, so opening it costs nothing and it
+    takes 8 bytes per place on disk and almost nothing on the heap. New places
+    are appended to a small ``.log`` file (and kept in memory) until
+    ``compact`` merges them into the sorted file. An optional Bloom filter,
+    saved alongside, answers most "never seen" lookups without touching the map.
+
+    ``sync_csv`` fills the store from a CSV of URLs and records the CSV's size,
+    mtime and synced offset in a ``.sources`` file, so later syncs read only
+    the rows appended since, including rows written by other processes.
+
+    Hash collisions are possible but negligible (about 1 in 10^7 at a million
+    places); a collision only means one place is treated as already scraped.
+    """
+
+    def __init__(self, path: str, use_bloom: bool = False, compact_threshold: int = COMPACT_THRESHOLD):
+        self.path = path
+        self.log_path = path + LOG_SUFFIX
+        self.bloom_path = path + BLOOM_SUFFIX
+        self.sources_path = path + SOURCES_SUFFIX
+        self.use_bloom = use_bloom
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self._file = None
+        self._map = None
+        self._view = None
+        self._sorted = array('Q')
+        self._pending = set()
+        self._bloom: Optional[BloomFilter] = None
+        self._sources = self._load_sources()
+        self._open()
+
+    @classmethod
+    def exists(cls, path: str) -> bool:
+        return os.path.exists(path) or os.path.exists(path + LOG_SUFFIX)
+
+    @classmethod
+    def remove(cls, path: str) -> None:
+        """Delete a store and its companion files"""
+        for name in (path, path + LOG_SUFFIX, path + BLOOM_SUFFIX, path + SOURCES_SUFFIX):
+            if os.path.exists(name):
+                os.remove(name)
+
+    def _open(self) -> None:
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= HASH_STRUCT.size:
+            self._file = open(self.path, 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if sys.byteorder == 'little':
+                self._view = memoryview(self._map)
+                self._sorted = self._view.cast('Q')
+            else:
+                self._sorted = _hash_array(self._map[:])
+
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'rb') as file:
+                data = file.read()
+            usable = len(data) - len(data) % HASH_STRUCT.size  # ignore a torn final write
+            self._pending = set(_hash_array(data[:usable]))
+
+        if self.use_bloom:
+            self._bloom = BloomFilter.load(self.bloom_path, len(self._sorted))
+            if self._bloom is None:
+                self._bloom = self._build_bloom()
+            for value in self._pending:
+                self._bloom.add(value)
+
+    def _build_bloom(self) -> BloomFilter:
+        bloom = BloomFilter.for_capacity(2 * (len(self._sorted) + len(self._pending) + self.compact_threshold))
+        for value in self._sorted:
+            bloom.add(value)
+        return bloom
+
+    def _in_sorted(self, value: int) -> bool:
+        index = bisect.bisect_left(self._sorted, value)
+        return index < len(self._sorted) and self._sorted[index] == value
+
+    def _contains_hash(self, value: int) -> bool:
+        if self._bloom is not None and value not in self._bloom:
+            return False
+        return value in self._pending or self._in_sorted(value)
+
+    def __contains__(self, url: str) -> bool:
+        value = key_hash(url)
+        if value is None:
+            return False
+        with self._lock:
+            return self._contains_hash(value)
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._pending)
+
+    def _append(self, values) -> None:
+        with open(self.log_path, 'ab') as file:
+            file.write(_hash_bytes(array('Q', values)))
+        self._pending.update(values)
+        if self._bloom is not None:
+            for value in values:
+                self._bloom.add(value)
+        if len(self._pending) >= self.compact_threshold:
+            self._compact_locked()
+
+    def claim(self, url: str) -> bool:
+        """Add a place unless it is already present; True if this call added it"""
+        value = key_hash(url)
+        if value is None:
+            return False
+        with self._lock:
+            if self._contains_hash(value):
+                return False
+            self._append([value])
+            return True
+
+    def add(self, url: str) -> None:
+        self.claim(url)
+
+    def update(self, urls: Iterable[str]) -> None:
+        with self._lock:
+            values = set()
+            for url in urls:
+                value = key_hash(url)
+                if value is not None and not self._contains_hash(value):
+                    values.add(value)
+            if values:
+                self._append(sorted(values))
+
+    # CSV sources
+
+    def _load_sources(self) -> Dict[str, Dict]:
+        try:
+            with open(self.sources_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_sources(self) -> None:
+        temp_path = self.sources_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self._sources, file)
+        os.replace(temp_path, self.sources_path)
+
+    @staticmethod
+    def _tail_digest(file, offset: int) -> str:
+        file.seek(max(0, offset - SOURCE_TAIL_BYTES))
+        return hashlib.blake2b(file.read(offset - file.tell()), digest_size=16).hexdigest()
+
+    def csv_rewritten(self, csv_path: str) -> bool:
+        """
+        True if a CSV synced earlier no longer starts with the rows that were synced
+
+        That happens when it was truncated, deduplicated or regenerated; the
+        store may then hold places the CSV no longer has and should be rebuilt.
+        Appends alone never count as a rewrite.
+        """
+        source = self._sources.get(os.path.abspath(csv_path))
+        if source is None:
+            return False
+        try:
+            with open(csv_path, 'rb') as file:
+                if os.fstat(file.fileno()).st_size < source['offset']:
+                    return True
+                return self._tail_digest(file, source['offset']) != source['tail']
+        except OSError:
+            return True
+
+    def sync_csv(self, csv_path: str, url_column: str = 'url') -> int:
+        """
+        Add the URLs a CSV gained since its last sync (all of them the first time)
+
+        Only complete lines are read, so a row another process is still writing
+        is picked up by the next sync. Call ``csv_rewritten`` first if the CSV
+        may have been rewritten rather than appended to.
+
+        Returns:
+            Number of URLs read
+        """
+        key = os.path.abspath(csv_path)
+        try:
+            stat = os.stat(csv_path)
+        except OSError:
+            return 0
+        source = self._sources.get(key)
+        if source is not None and (source['size'], source['mtime']) == (stat.st_size, stat.st_mtime):
+            return 0
+
+        read = 0
+        with open(csv_path, 'rb') as file:
+            header = next(csv.reader([file.readline().decode('utf-8-sig')]), [])
+            if url_column not in header:
+                return 0
+            column = header.index(url_column)
+            offset = file.tell()
+            if source is not None and source['offset'] > offset:
+                offset = source['offset']
+                file.seek(offset)
+
+            batch = []
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break  # torn final row; read it on the next sync
+                offset += len(line)
+                row = next(csv.reader(io.StringIO(line.decode('utf-8', errors='replace'))), [])
+                if len(row) > column and row[column]:
+                    batch.append(row[column])
+                if len(batch) >= SYNC_BATCH_SIZE:
+                    self.update(batch)
+                    read += len(batch)
+                    batch = []
+            self.update(batch)
+            read += len(batch)
+            tail = self._tail_digest(file, offset)
+
+        with self._lock:
+            self._sources[key] = {'size': stat.st_size, 'mtime': stat.st_mtime, 'offset': offset, 'tail': tail}
+            self._save_sources()
+        return read
+
+    def _close_map(self) -> None:
+        if isinstance(self._sorted, memoryview):
+            self._sorted.release()
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        self._sorted = array('Q')
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _compact_locked(self) -> None:
+        # Pending hashes are never in the sorted file, so a streaming merge keeps it unique
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'wb') as file:
+            chunk = array('Q')
+            for value in heapq.merge(self._sorted, sorted(self._pending)):
+                chunk.append(value)
+                if len(chunk) >= 65536:
+                    file.write(_hash_bytes(chunk))
+                    chunk = array('Q')
+            file.write(_hash_bytes(chunk))
+            file.flush()
+            os.fsync(file.fileno())
+
+        self._close_map()
+        os.replace(temp_path, self.path)
+        open(self.log_path, 'wb').close()
+
+        self._pending = set()
+        self._bloom = None
+        self._open()
+        if self.use_bloom:
+            self._bloom = self._build_bloom()
+            self._bloom.save(self.bloom_path, len(self._sorted))
+
+    def compact(self) -> None:
+        """Merge the append log into the sorted file"""
+        with self._lock:
+            if self._pending:
+                self._compact_locked()
+
+    def close(self) -> None:
+        """Compact and release the memory map"""
+        with self._lock:
+            if self._pending:
+                self._compact_locked()
+            self._close_map()
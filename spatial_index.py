@@ -0,0 +1,205 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from geo_distance import DISTANCE_THRESHOLD_KM, haversine_km
+
+KM_PER_DEGREE = 111.195  # along a meridian, for the 6371 km sphere used by haversine_km
+
+# Grid cell edge; about the radius of the typical query so a radius search
+# touches a handful of cells
+DEFAULT_CELL_KM = 2.0
+
+# Column names for the stored places and the two center files
+PLACE_COORD_COLUMNS = ("url_lat", "url_lon")
+CENTER_COORD_COLUMNS = ("latitude", "longitude")
+
+
+class GridIndex:
+    """
+    Grid-bucket spatial index over latitude/longitude points
+
+    Points are sorted by their grid cell once, so each cell is a contiguous
+    slice of the coordinate arrays. A radius query only measures the points in
+    the cells overlapping the query's bounding box, with one vectorized
+    haversine call; a kNN query widens the radius until it holds k points.
+    Points with missing coordinates are left out of the index.
+
+    Query results are positions in the arrays passed to the constructor.
+    """
+
+    def __init__(self, lats, lons, cell_km: float = DEFAULT_CELL_KM):
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        valid = ~(np.isnan(lats) | np.isnan(lons))
+        positions = np.flatnonzero(valid)
+
+        self.cell_deg = cell_km / KM_PER_DEGREE
+        rows = np.floor(lats[valid] / self.cell_deg).astype(np.int64)
+        cols = np.floor(lons[valid] / self.cell_deg).astype(np.int64)
+        order = np.lexsort((cols, rows))
+
+        self.positions = positions[order]
+        self.lats = lats[valid][order]
+        self.lons = lons[valid][order]
+        self.size = len(lats)
+
+        self._cells: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        rows, cols = rows[order], cols[order]
+        if len(order):
+            starts = np.flatnonzero(np.r_[True, (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])])
+            ends = np.r_[starts[1:], len(order)]
+            for start, end in zip(starts, ends):
+                self._cells[(int(rows[start]), int(cols[start]))] = (int(start), int(end))
+
+    @classmethod
+    def from_frame(cls, df, columns: Tuple[str, str] = PLACE_COORD_COLUMNS,
+                   cell_km: float = DEFAULT_CELL_KM) -> "GridIndex":
+        return cls(df[columns[0]].to_numpy(float), df[columns[1]].to_numpy(float), cell_km)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def _candidates(self, lat: float, lon: float, radius_km: float) -> Optional[np.ndarray]:
+        """Sorted-array slots in the cells overlapping the query box, or None to scan everything"""
+        dlat = radius_km / KM_PER_DEGREE
+        max_abs_lat = min(90.0, abs(lat) + dlat)
+        cos_lat = math.cos(math.radians(max_abs_lat))
+        if max_abs_lat >= 89.0 or cos_lat <= 0:
+            return None
+        dlon = dlat / cos_lat
+        if lon - dlon < -180 or lon + dlon > 180 or dlon >= 180:
+            return None  # box wraps the antimeridian
+
+        row_range = range(math.floor((lat - dlat) / self.cell_deg), math.floor((lat + dlat) / self.cell_deg) + 1)
+        col_range = range(math.floor((lon - dlon) / self.cell_deg), math.floor((lon + dlon) / self.cell_deg) + 1)
+        if len(row_range) * len(col_range) > len(self._cells):
+            return None  # cheaper to walk the occupied cells than the box
+
+        slices = [self._cells[(row, col)] for row in row_range for col in col_range if (row, col) in self._cells]
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(start, end) for start, end in slices])
+
+    def query_radius(self, lat: float, lon: float, radius_km: float = DISTANCE_THRESHOLD_KM
+                     ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Points within radius_km of (lat, lon)
+
+        Returns:
+            (positions, distances_km), nearest first
+        """
+        slots = self._candidates(lat, lon, radius_km)
+        if slots is None:
+            slots = np.arange(len(self.positions))
+        distances = haversine_km(lat, lon, self.lats[slots], self.lons[slots])
+        inside = distances <= radius_km
+        slots, distances = slots[inside], distances[inside]
+        order = np.argsort(distances, kind='stable')
+        return self.positions[slots[order]], distances[order]
+
+    def query_knn(self, lat: float, lon: float, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The k points nearest to (lat, lon)
+
+        Returns:
+            (positions, distances_km), nearest first; fewer than k if the index is smaller
+        """
+        k = min(k, len(self.positions))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        radius_km = self.cell_deg * KM_PER_DEGREE
+        while True:
+            positions, distances = self.query_radius(lat, lon, radius_km)
+            # A radius query is exact, so once it holds k points they are the k nearest
+            if len(positions) >= k or radius_km > math.pi * 6371.0:
+                return positions[:k], distances[:k]
+            radius_km *= 2
+
+
+def assign_to_centers(places_df, centers_df, radius_km: float = DISTANCE_THRESHOLD_KM,
+                      place_columns: Tuple[str, str] = PLACE_COORD_COLUMNS,
+                      center_columns: Tuple[str, str] = CENTER_COORD_COLUMNS,
+                      index: Optional[GridIndex] = None):
+    """
+    Every (center, place) pair within radius_km, using one index over the places
+
+    Args:
+        places_df: Stored places, e.g. all_scraped_urls.csv
+        centers_df: Search centers, e.g. maps_results.csv or sample_input_with_coordinates.csv
+        index: A prebuilt GridIndex over places_df, reused across calls
+
+    Returns:
+        DataFrame with center_index, place_index (row labels of the inputs) and distance_km
+    """
+    import pandas as pd
+
+    if index is None:
+        index = GridIndex.from_frame(places_df, place_columns)
+
+    center_lats = centers_df[center_columns[0]].to_numpy(float)
+    center_lons = centers_df[center_columns[1]].to_numpy(float)
+    pairs: List[Tuple[int, np.ndarray, np.ndarray]] = []
+    for position, (lat, lon) in enumerate(zip(center_lats, center_lons)):
+        if np.isnan(lat) or np.isnan(lon):
+            continue
+        positions, distances = index.query_radius(lat, lon, radius_km)
+        pairs.append((position, positions, distances))
+
+    if not pairs:
+        return pd.DataFrame({"center_index": [], "place_index": [], "distance_km": []})
+    return pd.DataFrame({
+        "center_index": centers_df.index[np.concatenate([np.full(len(p), c) for c, p, _ in pairs])],
+        "place_index": places_df.index[np.concatenate([p for _, p, _ in pairs])],
+        "distance_km": np.round(np.concatenate([d for _, _, d in pairs]), 2),
+    })
+
+
+def nearest_centers(places_df, centers_df, k: int = 1,
+                    place_columns: Tuple[str, str] = PLACE_COORD_COLUMNS,
+                    center_columns: Tuple[str, str] = CENTER_COORD_COLUMNS):
+    """
+    The k nearest search centers for every stored place
+
+    Returns:
+        DataFrame with place_index, center_index and distance_km, k rows per place
+    """
+    import pandas as pd
+
+    index = GridIndex.from_frame(centers_df, center_columns)
+    place_lats = places_df[place_columns[0]].to_numpy(float)
+    place_lons = places_df[place_columns[1]].to_numpy(float)
+    rows = []
+    for position, (lat, lon) in enumerate(zip(place_lats, place_lons)):
+        if np.isnan(lat) or np.isnan(lon):
+            continue
+        positions, distances = index.query_knn(lat, lon, k)
+        for center, distance in zip(positions, distances):
+            rows.append((places_df.index[position], centers_df.index[center], round(float(distance), 2)))
+    return pd.DataFrame(rows, columns=["place_index", "center_index", "distance_km"])
+
+
+def main():
+    import pandas as pd
+
+    places_csv = "all_scraped_urls.csv"
+    center_files = ["maps_results.csv", "sample_input_with_coordinates.csv"]
+
+    places = pd.read_csv(places_csv)
+    index = GridIndex.from_frame(places)
+    print(f"📍 Indexed {len(index)} places from {places_csv}")
+
+    for centers_csv in center_files:
+        centers = pd.read_csv(centers_csv)
+        pairs = assign_to_centers(places, centers, DISTANCE_THRESHOLD_KM, index=index)
+        assigned = pairs.merge(centers[["search_item"]], left_on="center_index", right_index=True)
+        assigned = assigned.merge(places[["url"]], left_on="place_index", right_index=True)
+        output_csv = centers_csv.replace(".csv", "_assignments.csv")
+        assigned[["search_item", "url", "distance_km"]].to_csv(output_csv, index=False)
+        print(f"✅ {centers_csv}: {len(pairs)} place/center pairs within {DISTANCE_THRESHOLD_KM} km -> {output_csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from place_keys import place_key
+
+# State database kept next to an output CSV (Delhi_op.csv -> Delhi_op.state.db)
+STATE_SUFFIX = ".state.db"
+
+# Seconds a writer waits for another thread's or process's write to finish
+BUSY_TIMEOUT = 30
+
+# Search job states
+JOB_PENDING = "pending"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS places (
+    place_key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    name TEXT,
+    latitude REAL,
+    longitude REAL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    place_key TEXT PRIMARY KEY REFERENCES places(place_key),
+    url TEXT NOT NULL,
+    record TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scrape_attempts (
+    id INTEGER PRIMARY KEY,
+    place_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    duration REAL,
+    attempted_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scrape_attempts_place ON scrape_attempts(place_key);
+CREATE TABLE IF NOT EXISTS search_jobs (
+    id INTEGER PRIMARY KEY,
+    search_item TEXT NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    result_count INTEGER,
+    error TEXT,
+    updated_at TEXT NOT NULL,
+    UNIQUE (search_item, latitude, longitude)
+);
+CREATE INDEX IF NOT EXISTS search_jobs_status ON search_jobs(status);
+CREATE TABLE IF NOT EXISTS csv_sync (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+"""
+
+UPSERT_PLACE = """
+INSERT INTO places (place_key, url, name, latitude, longitude, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (place_key) DO UPDATE SET
+    url = excluded.url,
+    name = COALESCE(excluded.name, places.name),
+    latitude = COALESCE(excluded.latitude, places.latitude),
+    longitude = COALESCE(excluded.longitude, places.longitude),
+    last_seen = excluded.last_seen
+"""
+
+UPSERT_RESULT = """
+INSERT INTO results (place_key, url, record, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (place_key) DO UPDATE SET
+    url = excluded.url,
+    record = COALESCE(excluded.record, results.record),
+    updated_at = excluded.updated_at
+"""
+
+
+def state_path(output_filename: str) -> str:
+    return os.path.splitext(output_filename)[0] + STATE_SUFFIX
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class StateStore:
+    """
+    Scrape state in one SQLite database: places, results, scrape attempts and search jobs
+
+    The database runs in WAL mode, so readers never block the writer and worker
+    threads can record results without a global CSV lock. Each thread gets its
+    own connection, and concurrent writers wait up to BUSY_TIMEOUT seconds.
+    Places and results are upserted on their place key (see
+    place_keys.place_key), which makes a resume check one indexed lookup.
+
+    A StateStore can stand in for a ResumeIndex: ``url in store``, ``len(store)``
+    and ``store.add(url)`` behave the same.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = BUSY_TIMEOUT):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # Autocommit mode; writes use explicit transactions in _transaction
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None,
+                                         check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close every thread's connection"""
+        with self._connections_lock:
+            for connection in self._connections:
+                try:
+                    connection.close()
+                except sqlite3.Error:
+                    pass
+            self._connections = []
+        self._local = threading.local()
+
+    # Results (ResumeIndex-compatible)
+
+    def __contains__(self, url: str) -> bool:
+        key = place_key(url)
+        if not key:
+            return False
+        return self._connection().execute(
+            "SELECT 1 FROM results WHERE place_key = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def add(self, url: str) -> None:
+        """Record a URL as processed without its result record"""
+        self.save_results([{'URL': url}], store_record=False)
+
+    def save_results(self, rows: Iterable[Dict], url_column: str = 'URL', store_record: bool = True) -> int:
+        """
+        Upsert output rows and their places in one transaction
+
+        Args:
+            rows: Output rows keyed like the CSV (URL, Name, Latitude, Longitude, ...)
+            store_record: Keep the whole row as JSON in results.record
+
+        Returns:
+            Number of rows stored
+        """
+        now = _now()
+        places, results = [], []
+        for row in rows:
+            url = row.get(url_column)
+            key = place_key(url)
+            if not key:
+                continue
+            name = row.get('Name')
+            if name in ('Error', 'Not Found', ''):
+                name = None
+            places.append((key, url, name, _to_float(row.get('Latitude')), _to_float(row.get('Longitude')),
+                           now, now))
+            results.append((key, url, json.dumps(row, ensure_ascii=False) if store_record else None, now))
+
+        if results:
+            with self._transaction() as connection:
+                connection.executemany(UPSERT_PLACE, places)
+                connection.executemany(UPSERT_RESULT, results)
+        return len(results)
+
+    def get_result(self, url: str) -> Optional[Dict]:
+        """The stored output row for a place, or None"""
+        row = self._connection().execute(
+            "SELECT record FROM results WHERE place_key = ?", (place_key(url),)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    # Scrape attempts
+
+    def record_attempt(self, url: str, status: str, error: Optional[str] = None,
+                       duration: Optional[float] = None) -> None:
+        key = place_key(url)
+        if not key:
+            return
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT INTO scrape_attempts (place_key, status, error, duration, attempted_at) "
+                "VALUES (?, ?, ?, ?, ?)", (key, status, error, duration, _now()))
+
+    def attempt_count(self, url: str) -> int:
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM scrape_attempts WHERE place_key = ?", (place_key(url),)).fetchone()[0]
+
+    # Search jobs
+
+    def add_search_jobs(self, searches: Iterable[Tuple[str, float, float]]) -> None:
+        """Register (search_item, latitude, longitude) searches; known ones keep their status"""
+        now = _now()
+        with self._transaction() as connection:
+            connection.executemany(
+                "INSERT INTO search_jobs (search_item, latitude, longitude, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (search_item, latitude, longitude) DO NOTHING",
+                [(item, lat, lon, JOB_PENDING, now) for item, lat, lon in searches])
+
+    def pending_search_jobs(self) -> List[Tuple[str, float, float]]:
+        """Searches not finished yet (pending or failed), in the order they were added"""
+        return self._connection().execute(
+            "SELECT search_item, latitude, longitude FROM search_jobs WHERE status != ? ORDER BY id",
+            (JOB_DONE,)).fetchall()
+
+    def finish_search_job(self, search_item: str, latitude: float, longitude: float,
+                          result_count: Optional[int] = None, error: Optional[str] = None) -> None:
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE search_jobs SET status = ?, result_count = ?, error = ?, updated_at = ? "
+                "WHERE search_item = ? AND latitude = ? AND longitude = ?",
+                (JOB_FAILED if error else JOB_DONE, result_count, error, _now(), search_item, latitude, longitude))
+
+    # CSV migration
+
+    def _csv_signature(self, csv_path: str) -> Optional[Tuple[int, float]]:
+        try:
+            stat = os.stat(csv_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime
+
+    def sync_csv(self, csv_path: str, url_column: str = 'URL') -> int:
+        """
+        Import the rows of an existing output CSV, unless it is unchanged since the last sync
+
+        Imports are upserts, so re-importing a CSV this store already holds is harmless.
+
+        Returns:
+            Number of rows imported
+        """
+        signature = self._csv_signature(csv_path)
+        if signature is None:
+            return 0
+        stored = self._connection().execute(
+            "SELECT size, mtime FROM csv_sync WHERE path = ?", (os.path.abspath(csv_path),)).fetchone()
+        if stored is not None and tuple(stored) == signature:
+            return 0
+
+        imported = 0
+        with open(csv_path, 'r', newline='', encoding='utf-8') as file:
+            batch = []
+            for row in csv.DictReader(file):
+                batch.append(row)
+                if len(batch) >= 1000:
+                    imported += self.save_results(batch, url_column)
+                    batch = []
+            imported += self.save_results(batch, url_column)
+        self.mark_csv_synced(csv_path)
+        return imported
+
+    def mark_csv_synced(self, csv_path: str) -> None:
+        """Remember a CSV's size and mtime after this store has recorded everything in it"""
+        signature = self._csv_signature(csv_path)
+        if signature is None:
+            return
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT INTO csv_sync (path, size, mtime) VALUES (?, ?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET size = excluded.size, mtime = excluded.mtime",
+                (os.path.abspath(csv_path), *signature))
@@ -0,0 +1,166 @@
+import asyncio
+import json
+
+import async_engine
+from async_engine import AsyncScrapeEngine, BlockedPageError, BrowserProcess, CDPConnection, CDPError
+
+
+class FakeWebSocket:
+    """Answers every command with its id, in reverse order, plus an unrelated event"""
+
+    def __init__(self):
+        self.sent = []
+        self.incoming = asyncio.Queue()
+
+    async def send(self, raw):
+        message = json.loads(raw)
+        self.sent.append(message)
+        if message['method'] == "Fail.me":
+            await self.incoming.put(json.dumps({'id': message['id'], 'error': {'message': "nope"}}))
+        elif len(self.sent) == 2:
+            # Answer both commands once the second is in, the newer one first
+            await self.incoming.put(json.dumps({'method': "Page.loadEventFired", 'params': {}}))
+            for earlier in reversed(self.sent):
+                await self.incoming.put(json.dumps({'id': earlier['id'], 'result': {'echo': earlier['method']}}))
+
+    async def close(self):
+        await self.incoming.put(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raw = await self.incoming.get()
+        if raw is None:
+            raise StopAsyncIteration
+        return raw
+
+
+def test_cdp_responses_are_dispatched_by_id():
+    async def scenario():
+        connection = CDPConnection("ws://fake")
+        connection._ws = FakeWebSocket()
+        connection._reader = asyncio.create_task(connection._read_loop())
+
+        first, second = await asyncio.gather(
+            connection.send("Page.navigate", {'url': "about:blank"}),
+            connection.send("Runtime.evaluate", session_id="session-1"))
+        assert first == {'echo': "Page.navigate"}
+        assert second == {'echo': "Runtime.evaluate"}
+        assert connection._ws.sent[1]['sessionId'] == "session-1"
+        assert [message['id'] for message in connection._ws.sent] == [1, 2]
+
+        try:
+            await connection.send("Fail.me")
+            raise AssertionError("expected a CDPError")
+        except CDPError as e:
+            assert "nope" in str(e)
+        assert not connection._pending
+
+        await connection.close()
+
+    asyncio.run(scenario())
+
+
+def test_pending_commands_fail_when_the_connection_drops():
+    async def scenario():
+        connection = CDPConnection("ws://fake")
+        connection._ws = FakeWebSocket()
+        connection._reader = asyncio.create_task(connection._read_loop())
+        command = asyncio.create_task(connection.send("Browser.getVersion"))
+        await asyncio.sleep(0)
+        await connection._ws.close()
+        try:
+            await command
+            raise AssertionError("expected a CDPError")
+        except CDPError as e:
+            assert "closed" in str(e)
+
+    asyncio.run(scenario())
+
+
+class FakeChromeProcess:
+    def __init__(self, stderr_lines):
+        self.stderr = asyncio.StreamReader()
+        for line in stderr_lines:
+            self.stderr.feed_data(line)
+        self.stderr.feed_eof()
+
+
+def test_devtools_url_is_read_from_chrome_stderr():
+    async def scenario(lines):
+        process = BrowserProcess("chrome")
+        process.process = FakeChromeProcess(lines)
+        return await process._read_ws_url()
+
+    ws_url = asyncio.run(scenario([
+        b"[1017/101500.000:WARNING:sandbox.cc(42)] Running without the sandbox\n",
+        b"\n",
+        b"DevTools listening on ws://127.0.0.1:45123/devtools/browser/0f1e-aa\r\n",
+        b"later noise\n",
+    ]))
+    assert ws_url == "ws://127.0.0.1:45123/devtools/browser/0f1e-aa"
+
+    try:
+        asyncio.run(scenario([b"[ERROR] Failed to launch\n"]))
+        raise AssertionError("expected a CDPError")
+    except CDPError as e:
+        assert "exited" in str(e)
+
+
+class FakeTab:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowserProcess:
+    instances = []
+
+    def __init__(self, binary, headless, resource_profile):
+        self.tabs = []
+        FakeBrowserProcess.instances.append(self)
+
+    async def start(self):
+        pass
+
+    async def new_tab(self):
+        tab = FakeTab(len(self.tabs))
+        self.tabs.append(tab)
+        return tab
+
+    async def close(self):
+        pass
+
+
+def test_timed_out_tab_is_replaced_and_blocked_pages_are_not_results(monkeypatch):
+    monkeypatch.setattr(async_engine, "WEBSOCKETS_AVAILABLE", True)
+    monkeypatch.setattr(async_engine, "BrowserProcess", FakeBrowserProcess)
+    FakeBrowserProcess.instances = []
+
+    async def scrape_page(tab, url):
+        if url == "slow":
+            await asyncio.sleep(10)
+        if url == "consent":
+            raise BlockedPageError(url)
+        return {'URL': url, 'tab': tab.number}
+
+    results, errors, blocked = {}, {}, []
+    engine = AsyncScrapeEngine(
+        scrape_page, browsers=1, tabs_per_browser=1, page_timeout=0.05, chrome_binary="chrome",
+        on_result=lambda url, record: results.__setitem__(url, record),
+        on_error=lambda url, error: errors.__setitem__(url, error),
+        on_blocked=blocked.append)
+
+    counts = engine.run_sync(["a", "slow", "consent", "b"])
+
+    assert counts == {'succeeded': 2, 'failed': 1, 'blocked': 1}
+    assert isinstance(errors["slow"], CDPError) and "Timed out" in str(errors["slow"])
+    assert blocked == ["consent"]
+    # The wedged tab was closed and the remaining URLs ran on its replacement
+    tabs = FakeBrowserProcess.instances[0].tabs
+    assert len(tabs) == 2 and all(tab.closed for tab in tabs)
+    assert results["a"]['tab'] == 0 and results["b"]['tab'] == 1
@@ -0,0 +1,57 @@
+import json
+import os
+
+import browser_discovery
+
+
+def setup_fake_browser(tmp_path, monkeypatch):
+    binary = tmp_path / "chrome"
+    binary.write_text("v1")
+    driver = tmp_path / "chromedriver"
+    driver.write_text("")
+    calls = []
+
+    monkeypatch.setenv("CHROME_BINARY", str(binary))
+    monkeypatch.setattr(browser_discovery, "_discovered", None)
+    monkeypatch.setattr(browser_discovery, "get_chrome_version", lambda path: calls.append(path) or 124)
+    monkeypatch.setattr(browser_discovery, "_install_chromedriver", lambda: str(driver))
+    return binary, calls
+
+
+def test_discovery_is_cached_on_disk(tmp_path, monkeypatch):
+    binary, calls = setup_fake_browser(tmp_path, monkeypatch)
+    cache_file = str(tmp_path / "browser.json")
+
+    info = browser_discovery.discover_browser(cache_file)
+    assert info['version'] == 124
+    assert info['binary'] == str(binary)
+
+    # A new process (cleared memo) reuses the on-disk result without probing
+    monkeypatch.setattr(browser_discovery, "_discovered", None)
+    assert browser_discovery.discover_browser(cache_file) == info
+    assert len(calls) == 1
+
+
+def test_changed_binary_invalidates_cache(tmp_path, monkeypatch):
+    binary, calls = setup_fake_browser(tmp_path, monkeypatch)
+    cache_file = str(tmp_path / "browser.json")
+    browser_discovery.discover_browser(cache_file)
+
+    binary.write_text("v2 is a larger build")
+    monkeypatch.setattr(browser_discovery, "_discovered", None)
+    browser_discovery.discover_browser(cache_file)
+    assert len(calls) == 2
+
+    with open(cache_file, encoding='utf-8') as file:
+        assert json.load(file)['fingerprint'] == browser_discovery.binary_fingerprint(str(binary))
+
+
+def test_missing_driver_invalidates_cache(tmp_path, monkeypatch):
+    _, calls = setup_fake_browser(tmp_path, monkeypatch)
+    cache_file = str(tmp_path / "browser.json")
+    browser_discovery.discover_browser(cache_file)
+
+    os.remove(str(tmp_path / "chromedriver"))
+    monkeypatch.setattr(browser_discovery, "_discovered", None)
+    browser_discovery.discover_browser(cache_file)
+    assert len(calls) == 2
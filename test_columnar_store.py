@@ -0,0 +1,93 @@
+import csv
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from columnar_store import KEY_COLUMN, PARTITION_COLUMN, PLACE_DETAIL_FIELDS, SEARCH_RESULT_FIELDS, ColumnarStore
+
+URL = "https://www.google.com/maps/place/A/data=!1s0x390ce3607036239d:0x4ae2a2b7c1882de7!8m2!3d28.63!4d77.22"
+
+
+def row(url, distance):
+    return {"search_item": "IELTS", "search_lat": "28.6315", "search_lon": 77.2167, "url": url,
+            "url_lat": 28.63, "url_lon": 77.22, "distance_km": distance, "within_7km": "YES", "extra": 1}
+
+
+def test_round_trip_and_csv_view(tmp_path):
+    store = ColumnarStore(str(tmp_path / "all.parquet"), SEARCH_RESULT_FIELDS, rows_per_file=2)
+    store.write_batch([row(URL, 0.8), row(URL + "?hl=en", 0.8)])
+    store.write(row("https://www.google.com/maps/place/B", "Not Found"))
+    store.close()
+
+    table = store.read()
+    assert table.num_rows == 3
+    assert table.schema.field("search_lat").type == pa.float64()
+    assert table.column("distance_km").to_pylist().count(None) == 1
+    assert len(store.place_keys()) == 2
+
+    output = tmp_path / "view.csv"
+    assert store.export_csv(str(output), deduplicate=True) == 2
+    with open(output, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert list(rows[0]) == [name for name, _ in SEARCH_RESULT_FIELDS]
+    assert KEY_COLUMN not in rows[0]
+
+
+def test_rows_lost_from_the_buffer_are_backfilled_from_the_csv(tmp_path):
+    csv_path = tmp_path / "all.csv"
+    other = "https://www.google.com/maps/place/B/data=!1s0x1:0x2"
+    with open(csv_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=[name for name, _ in SEARCH_RESULT_FIELDS])
+        writer.writeheader()
+        writer.writerow({key: value for key, value in row(URL, 0.8).items() if key != "extra"})
+        writer.writerow({key: value for key, value in row(other, 1.5).items() if key != "extra"})
+
+    # The first row reached Parquet; the second was still buffered when the run was killed
+    store = ColumnarStore(str(tmp_path / "all.parquet"), SEARCH_RESULT_FIELDS)
+    store.write(row(URL, 0.8))
+    store.flush()
+    store.write(row(other, 1.5))
+
+    reopened = ColumnarStore(str(tmp_path / "all.parquet"), SEARCH_RESULT_FIELDS)
+    assert reopened.sync_csv(str(csv_path)) == 1
+    assert reopened.sync_csv(str(csv_path)) == 0
+    table = reopened.read()
+    assert table.num_rows == 2
+    assert sorted(table.column("distance_km").to_pylist()) == [0.8, 1.5]
+
+
+def test_buffered_rows_are_flushed_after_the_interval(tmp_path):
+    store = ColumnarStore(str(tmp_path / "all.parquet"), SEARCH_RESULT_FIELDS, flush_interval=0)
+    store.write(row(URL, 0.8))
+    assert store.read().num_rows == 1
+
+
+def test_place_details_store_filters_on_run_date(tmp_path):
+    """The Extract_Mps layout: PLACE_DETAIL_FIELDS keyed on the URL column"""
+    store = ColumnarStore(str(tmp_path / "op.parquet"), PLACE_DETAIL_FIELDS, url_column="URL")
+    store.write_batch([
+        {"URL": URL, "Name": "Y-Axis", "Phone": "09876543210", "Rating": 4.6, "Latitude": "28.63"},
+        {"URL": "https://www.google.com/maps/place/B", "Name": "Not Found"},
+    ])
+    store.close()
+
+    # A run on an earlier day left its rows in their own partition
+    old_partition = tmp_path / "op.parquet" / f"{PARTITION_COLUMN}=2020-01-01"
+    old_partition.mkdir()
+    old_table = store.read().drop_columns([PARTITION_COLUMN]).slice(0, 1)
+    pq.write_table(old_table, str(old_partition / "part-old.parquet"))
+
+    table = store.read()
+    assert table.num_rows == 3
+    assert table.schema.field("Rating").type == pa.string()
+    assert table.column("Rating").to_pylist().count("4.6") == 2
+    assert table.column(KEY_COLUMN).to_pylist()[0] == "0x390ce3607036239d:0x4ae2a2b7c1882de7"
+
+    old_rows = store.read(filter=ds.field(PARTITION_COLUMN) == "2020-01-01")
+    assert old_rows.num_rows == 1
+    assert old_rows.column("Name").to_pylist() == ["Y-Axis"]
+    assert store.read(filter=ds.field(PARTITION_COLUMN) != "2020-01-01").num_rows == 2
@@ -0,0 +1,53 @@
+from concurrency import AdaptiveConcurrency, is_block_page
+
+
+def test_healthy_window_increases_limit():
+    controller = AdaptiveConcurrency(initial=2, max_workers=4, window=3, min_free_memory_mb=0)
+    for _ in range(3):
+        controller.record(1.0, ok=True)
+    assert controller.limit == 3
+
+
+def test_error_rate_halves_limit():
+    controller = AdaptiveConcurrency(initial=4, max_workers=6, window=4)
+    for ok in (True, False, False, True):
+        controller.record(1.0, ok=ok)
+    assert controller.limit == 2
+
+
+def test_slow_window_decreases_limit():
+    controller = AdaptiveConcurrency(initial=4, window=2, latency_target=10)
+    controller.record(25.0, ok=True)
+    controller.record(25.0, ok=True)
+    assert controller.limit == 2
+
+
+def test_block_page_cuts_limit_and_holds_increases():
+    controller = AdaptiveConcurrency(initial=4, max_workers=6, window=2, min_free_memory_mb=0)
+    controller.record(1.0, ok=True, blocked=True)
+    assert controller.limit == 2
+
+    controller.record(1.0, ok=True)
+    controller.record(1.0, ok=True)
+    assert controller.limit == 2
+
+
+def test_limit_never_drops_below_minimum():
+    controller = AdaptiveConcurrency(initial=1, min_workers=1)
+    controller.record(1.0, ok=False, blocked=True)
+    assert controller.limit == 1
+
+
+def test_try_acquire_respects_limit():
+    controller = AdaptiveConcurrency(initial=1)
+    assert controller.try_acquire()
+    assert not controller.try_acquire()
+    controller.release()
+    assert controller.try_acquire()
+
+
+def test_is_block_page():
+    assert is_block_page("https://consent.google.com/ml?continue=https://www.google.com/maps")
+    assert is_block_page("https://www.google.com/sorry/index?continue=x")
+    assert not is_block_page("https://www.google.com/maps/place/Cafe")
+    assert not is_block_page(None)
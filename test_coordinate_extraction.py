@@ -1,42 +1,6 @@
-import re
-
-def extract_coordinates_from_url(url):
-    """
-    Extract latitude and longitude coordinates from Google Maps URL
-
-    Args:
-        url (str): Google Maps URL containing coordinates
-
-    Returns:
-        tuple: (latitude, longitude) as floats, or (None, None) if not found
-    """
-    try:
-        # Use regex to find latitude (3d parameter) and longitude (4d parameter)
-        lat_pattern = r'3d([+-]?\d+\.?\d*)'
-        lng_pattern = r'4d([+-]?\d+\.?\d*)'
-
-        lat_match = re.search(lat_pattern, url)
-        lng_match = re.search(lng_pattern, url)
-
-        if lat_match and lng_match:
-            latitude = float(lat_match.group(1))
-            longitude = float(lng_match.group(1))
-            print(f"    ✅ Coordinates extracted: {latitude}, {longitude}")
-            return latitude, longitude
-        else:
-            # Fallback to original pattern for URLs with @lat,lon format
-            match = re.search(r'/@([-+]?\d+\.\d+),([-+]?\d+\.\d+)', url)
-            if match:
-                latitude = float(match.group(1))
-                longitude = float(match.group(2))
-                print(f"    ✅ Coordinates extracted (fallback): {latitude}, {longitude}")
-                return latitude, longitude
-            else:
-                print(f"    ❌ No coordinates found in URL")
-                return None, None
-    except Exception as e:
-        print(f"    ❌ Error extracting coordinates: {str(e)}")
-        return None, None
+import pytest
+
+from coordinates import extract_coordinates_from_url, parse_coordinates
 
 # Test URLs
 test_urls = [
@@ -46,14 +10,109 @@ test_urls = [
     "https://www.google.com/maps/search/IELTS+Coaching/@28.6315,77.2167,13000m"
 ]
 
-print("Testing coordinate extraction function:")
-print("=" * 50)
-
-for i, url in enumerate(test_urls, 1):
-    print(f"\nTest {i}:")
-    print(f"URL: {url[:80]}...")
-    lat, lon = extract_coordinates_from_url(url)
-    if lat and lon:
-        print(f"Result: SUCCESS - Lat: {lat}, Lon: {lon}")
-    else:
-        print(f"Result: FAILED - No coordinates found")
+
+def test_place_coordinates():
+    assert parse_coordinates(test_urls[0]) == (28.6291627, 77.2249081)
+    assert parse_coordinates(test_urls[1]) == (28.6296381, 77.2257202)
+    assert extract_coordinates_from_url(test_urls[0]) == ("28.6291627", "77.2249081")
+
+
+def test_map_center_fallback():
+    assert parse_coordinates(test_urls[2]) == (28.6315, 77.2167)
+    assert parse_coordinates(test_urls[3]) == (28.6315, 77.2167)
+    assert parse_coordinates(test_urls[3], fallback=False) == (None, None)
+    # The string form used by the extractors reports place coordinates only
+    assert extract_coordinates_from_url(test_urls[3]) == ("Not Found", "Not Found")
+
+
+def test_hex_ids_do_not_match():
+    url = "https://www.google.com/maps/place/X/data=!1s0x3d123:0x4d456!8m2!3d-33.8688!4d151.2093"
+    assert parse_coordinates(url) == (-33.8688, 151.2093)
+    assert parse_coordinates(None) == (None, None)
+
+
+def mixed_urls():
+    return test_urls + [
+        "https://www.google.com/maps/place/X/data=!1s0x3d123:0x4d456!8m2!3d-33.8688!4d151.2093",
+        "https://www.google.com/maps/place/Y/data=%213d51.5072%214d-0.1276",
+        "https://www.google.com/maps/place/No+Coordinates/data=!1s0x1:0x2",
+        "",
+        None,
+        float("nan"),
+        12345,
+    ]
+
+
+def test_vectorized_column_matches_parse_coordinates():
+    pd = pytest.importorskip("pandas")
+    from coordinates import extract_coordinates_column
+
+    urls = pd.Series(mixed_urls(), index=range(100, 100 + len(mixed_urls())), dtype=object)
+    for fallback in (True, False):
+        parsed = extract_coordinates_column(urls, fallback=fallback)
+        assert list(parsed.index) == list(urls.index)
+        assert list(parsed.dtypes) == [float, float]
+        for url, (lat, lon) in zip(urls, parsed.itertuples(index=False)):
+            expected = parse_coordinates(url, fallback=fallback)
+            # The column path parses any value as text; parse_coordinates skips non-strings
+            if not isinstance(url, str):
+                expected = (None, None)
+            actual = tuple(None if pd.isna(value) else value for value in (lat, lon))
+            assert actual == expected, url
+
+
+def test_fill_missing_coordinates_keeps_stored_values():
+    pd = pytest.importorskip("pandas")
+    from coordinates import fill_missing_coordinates
+
+    df = pd.DataFrame({
+        "url": [test_urls[0], test_urls[1], test_urls[3], None],
+        "url_lat": [1.5, "", None, None],
+        "url_lon": [2.5, None, "Not Found", None],
+    })
+    filled = fill_missing_coordinates(df)
+    assert filled["url_lat"].tolist()[:3] == [1.5, 28.6296381, 28.6315]
+    assert filled["url_lon"].tolist()[:3] == [2.5, 77.2257202, 77.2167]
+    assert pd.isna(filled.loc[3, "url_lat"]) and pd.isna(filled.loc[3, "url_lon"])
+    # The input frame is left untouched
+    assert df["url_lat"].tolist()[0] == 1.5 and df["url_lat"].tolist()[1] == ""
+
+    no_columns = fill_missing_coordinates(pd.DataFrame({"url": [test_urls[0]]}))
+    assert no_columns.loc[0, "url_lat"] == 28.6291627
+
+
+def test_refilter_csv_parses_missing_coordinates(tmp_path):
+    pd = pytest.importorskip("pandas")
+    from geo_distance import refilter_csv
+
+    input_csv = tmp_path / "all_scraped_urls.csv"
+    pd.DataFrame({
+        "url": [test_urls[0], test_urls[1], "https://www.google.com/maps/place/Far/data=!3d19.0760!4d72.8777"],
+        "search_lat": [28.6315] * 3,
+        "search_lon": [77.2167] * 3,
+        "url_lat": [None, 28.6296381, None],
+        "url_lon": [None, 77.2257202, None],
+    }).to_csv(input_csv, index=False)
+
+    output_csv = tmp_path / "filtered.csv"
+    result = refilter_csv(str(input_csv), 7, str(output_csv))
+    assert result["url"].tolist() == test_urls[:2]
+    assert result["url_lat"].tolist() == [28.6291627, 28.6296381]
+    assert pd.read_csv(output_csv)["url"].tolist() == test_urls[:2]
+
+    everything = refilter_csv(str(input_csv), 7, only_within=False)
+    assert everything["within_7km"].tolist() == ["YES", "YES", "NO"]
+
+
+if __name__ == "__main__":
+    print("Testing coordinate extraction function:")
+    print("=" * 50)
+
+    for i, url in enumerate(test_urls, 1):
+        print(f"\nTest {i}:")
+        print(f"URL: {url[:80]}...")
+        lat, lon = parse_coordinates(url)
+        if lat and lon:
+            print(f"Result: SUCCESS - Lat: {lat}, Lon: {lon}")
+        else:
+            print(f"Result: FAILED - No coordinates found")
@@ -0,0 +1,76 @@
+import csv
+import time
+
+from csv_writer import BatchedCSVWriter
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+
+def test_rows_are_flushed_in_batches_and_on_close(tmp_path):
+    """Full batches flush immediately, the remainder on close, header written once"""
+    output = str(tmp_path / "out.csv")
+    flushed = []
+
+    with BatchedCSVWriter(output, ['URL', 'Name'], batch_size=2, flush_interval=60,
+                          on_flush=lambda rows: flushed.append([r['URL'] for r in rows])) as writer:
+        for i in range(5):
+            writer.write({'URL': f"https://{i}", 'Name': str(i)})
+
+    assert [row['URL'] for row in read_rows(output)] == [f"https://{i}" for i in range(5)]
+    assert flushed == [["https://0", "https://1"], ["https://2", "https://3"], ["https://4"]]
+
+    with BatchedCSVWriter(output, ['URL', 'Name']) as writer:
+        writer.write({'URL': "https://5", 'Name': '5', 'Extra': 'ignored'})
+    assert len(read_rows(output)) == 6
+
+
+def test_partial_batch_is_flushed_after_interval(tmp_path):
+    output = str(tmp_path / "out.csv")
+    writer = BatchedCSVWriter(output, ['URL'], batch_size=100, flush_interval=0.05, fsync_policy="never")
+    writer.start()
+    writer.write({'URL': "https://a"})
+
+    deadline = time.monotonic() + 2
+    while writer.rows_written == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer.rows_written == 1
+
+    writer.close()
+    assert read_rows(output) == [{'URL': "https://a"}]
+
+
+def test_unwritable_output_fails_on_start(tmp_path):
+    writer = BatchedCSVWriter(str(tmp_path / "missing_dir" / "out.csv"), ['URL'])
+    try:
+        writer.start()
+        raise AssertionError("expected an OSError")
+    except OSError:
+        pass
+    writer.close()
+
+
+def test_writer_thread_failure_is_raised_to_callers(tmp_path):
+    output = str(tmp_path / "out.csv")
+    writer = BatchedCSVWriter(output, ['URL'], batch_size=1)
+
+    def broken_flush(file, writer_, rows, fsync):
+        raise OSError("disk full")
+
+    writer._flush = broken_flush
+    writer.start()
+    writer.write({'URL': "https://0"})
+    writer._thread.join(timeout=5)
+
+    try:
+        writer.write({'URL': "https://1"})
+        raise AssertionError("expected the writer thread's error")
+    except OSError as e:
+        assert "disk full" in str(e)
+    try:
+        writer.close()
+        raise AssertionError("expected the writer thread's error")
+    except OSError:
+        pass
@@ -0,0 +1,60 @@
+from driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self, name):
+        self.name = name
+        self.alive = True
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("browser is gone")
+        return 1
+
+
+def make_pool(max_pages=3):
+    created, quit_drivers = [], []
+
+    def factory(thread_id):
+        driver = FakeDriver(f"driver-{len(created)}")
+        created.append(driver)
+        return driver
+
+    pool = DriverPool(factory, quit_drivers.append, max_pages=max_pages)
+    return pool, created, quit_drivers
+
+
+def test_driver_is_reused_then_recycled_after_max_pages():
+    """The same thread keeps its browser until it has served max_pages pages"""
+    pool, created, quit_drivers = make_pool(max_pages=3)
+
+    seen = []
+    for _ in range(4):
+        with pool.checkout() as driver:
+            seen.append(driver.name)
+
+    assert seen == ["driver-0", "driver-0", "driver-0", "driver-1"]
+    assert [d.name for d in quit_drivers] == ["driver-0"]
+
+    pool.close_all()
+    assert [d.name for d in quit_drivers] == ["driver-0", "driver-1"]
+
+
+def test_dead_or_crashed_driver_is_replaced():
+    """Unresponsive drivers and drivers whose page raised are never handed out again"""
+    pool, created, quit_drivers = make_pool()
+
+    with pool.checkout() as driver:
+        driver.alive = False
+    with pool.checkout() as driver:
+        assert driver.name == "driver-1"
+
+    try:
+        with pool.checkout() as driver:
+            raise RuntimeError("tab crashed")
+    except RuntimeError:
+        pass
+
+    with pool.checkout() as driver:
+        assert driver.name == "driver-2"
+    assert [d.name for d in quit_drivers] == ["driver-0", "driver-1"]
@@ -0,0 +1,41 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from geo_distance import haversine_km, refilter_frame, within_radius
+
+
+def scalar_haversine(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin(math.radians(lat2 - lat1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * 6371.0 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def test_matches_scalar_formula():
+    lats = np.array([28.6139, 28.70, 19.0760, 28.6139])
+    lons = np.array([77.2090, 77.10, 72.8777, 77.2090])
+    distances = haversine_km(28.6139, 77.2090, lats, lons)
+    expected = [scalar_haversine(28.6139, 77.2090, lat, lon) for lat, lon in zip(lats, lons)]
+    assert np.allclose(distances, expected)
+    assert distances[-1] == 0
+
+
+def test_mask_threshold_and_missing_coordinates():
+    distances, mask = within_radius(28.6139, 77.2090, [28.62, 28.70, np.nan], [77.21, 77.10, 77.2])
+    assert mask.tolist() == [True, False, False]
+    assert np.isnan(distances[2])
+
+
+def test_refilter_frame_per_row_centers():
+    df = pd.DataFrame({
+        "search_lat": [28.6139, 19.0760], "search_lon": [77.2090, 72.8777],
+        "url_lat": [28.65, 19.20], "url_lon": [77.21, 72.88],
+        "distance_km": [0.0, 0.0], "within_7km": ["NO", "NO"],
+    })
+    wide = refilter_frame(df, radius_km=20)
+    assert wide["within_7km"].tolist() == ["YES", "YES"]
+    narrow = refilter_frame(df, radius_km=5)
+    assert narrow["within_7km"].tolist() == ["YES", "NO"]
+    assert narrow["distance_km"].iloc[1] > 13
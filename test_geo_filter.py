@@ -0,0 +1,28 @@
+import pytest
+
+from geo_filter import GeoFilter, points_in_polygon
+
+NEAR = "https://www.google.com/maps/place/A/data=!4m7!3m6!1s0x1:0x2!8m2!3d28.6305706!4d77.2247533!16s"
+FAR = "https://www.google.com/maps/place/B/data=!4m7!3m6!1s0x3:0x4!8m2!3d19.0760!4d72.8777!16s"
+UNKNOWN = "https://www.google.com/maps/place/C"
+
+
+def test_radius_filter_keeps_order_and_unknowns():
+    geo_filter = GeoFilter(center=(28.6315, 77.2167), radius_km=7, chunk_size=2)
+    assert list(geo_filter.filter([NEAR, FAR, UNKNOWN, NEAR])) == [NEAR, UNKNOWN, NEAR]
+    assert (geo_filter.kept, geo_filter.dropped, geo_filter.unknown) == (3, 1, 1)
+
+    strict = GeoFilter(center=(28.6315, 77.2167), keep_unknown=False)
+    assert list(strict.filter([NEAR, FAR, UNKNOWN])) == [NEAR]
+
+
+def test_polygon_filter():
+    delhi = [(28.40, 76.80), (28.90, 76.80), (28.90, 77.40), (28.40, 77.40)]
+    assert points_in_polygon([28.63, 19.07, 28.95], [77.22, 72.88, 77.0], delhi).tolist() == [True, False, False]
+    assert list(GeoFilter(polygon=delhi).filter([FAR, NEAR])) == [NEAR]
+
+
+def test_from_config():
+    assert GeoFilter.from_config() is None
+    with pytest.raises(ValueError):
+        GeoFilter(center=(0, 0), polygon=[(0, 0), (1, 1), (1, 0)])
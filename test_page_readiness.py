@@ -0,0 +1,73 @@
+from page_readiness import (READINESS_PROBE_JS, READINESS_TRACKER_JS, STALE_REQUEST_MS, install_readiness_tracker,
+                            is_ready, probe_readiness, wait_until_ready)
+
+
+def signals(**overrides):
+    ready = {'documentComplete': True, 'selectorPresent': True, 'domQuietMs': 800,
+             'networkQuietMs': 800, 'pendingRequests': 0}
+    ready.update(overrides)
+    return ready
+
+
+def test_is_ready_needs_every_signal():
+    assert is_ready(signals())
+    assert not is_ready(None)
+    assert not is_ready({})
+    assert not is_ready(signals(documentComplete=False))
+    assert not is_ready(signals(selectorPresent=False))
+    assert not is_ready(signals(domQuietMs=100))
+    assert not is_ready(signals(networkQuietMs=100))
+
+
+def test_in_flight_request_keeps_a_quiet_page_not_ready():
+    # A slow place-details XHR leaves no finished resource entry behind, so the
+    # network looks quiet; only the in-flight count shows the page is still loading
+    assert not is_ready(signals(networkQuietMs=60000, pendingRequests=1))
+
+
+def test_quiet_period_is_configurable():
+    assert not is_ready(signals(domQuietMs=800, networkQuietMs=800), quiet_period=1.0)
+    assert is_ready(signals(domQuietMs=0, networkQuietMs=0), quiet_period=0)
+
+
+class FakeDriver:
+    def __init__(self, probes):
+        self.probes = list(probes)
+        self.scripts = []
+        self.cdp_commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp_commands.append((command, params))
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        probe = self.probes.pop(0)
+        if isinstance(probe, Exception):
+            raise probe
+        return probe
+
+
+def test_wait_until_ready_installs_the_tracker_once_and_polls():
+    driver = FakeDriver([RuntimeError("navigating"), signals(pendingRequests=2), signals()])
+    assert wait_until_ready(driver, timeout=5, quiet_period=0.5)
+    assert driver.cdp_commands == [("Page.addScriptToEvaluateOnNewDocument", {'source': READINESS_TRACKER_JS})]
+    assert driver.scripts[0] == (READINESS_PROBE_JS, ("h1.DUwDvf", STALE_REQUEST_MS))
+
+    driver.probes = [signals()]
+    assert wait_until_ready(driver, timeout=5)
+    assert len(driver.cdp_commands) == 1
+
+
+def test_wait_until_ready_gives_up_at_the_ceiling():
+    driver = FakeDriver([signals(pendingRequests=1)] * 100)
+    assert not wait_until_ready(driver, timeout=0.15)
+
+
+def test_probe_and_tracker_degrade_without_cdp():
+    class NoCDPDriver:
+        def execute_script(self, script, *args):
+            raise RuntimeError("no page")
+
+    driver = NoCDPDriver()
+    assert not install_readiness_tracker(driver)
+    assert probe_readiness(driver) is None
@@ -0,0 +1,103 @@
+from place_extractor import (first_match, parse_operating_hours, parse_operating_status, parse_phone_number,
+                             parse_place_fields, parse_rating, parse_review_count, parse_store_type)
+
+FIELDS = ('name', 'address', 'website', 'phone', 'store_type', 'status', 'hours', 'rating', 'review_count', 'closed')
+
+
+def candidate(text='', href='', aria_label='', xpath=0):
+    """A candidate as produced by COLLECT_CANDIDATES_JS / iter_element_candidates"""
+    return {'xpath': xpath, 'text': text, 'href': href, 'ariaLabel': aria_label}
+
+
+def candidates(**fields):
+    result = {field: [] for field in FIELDS}
+    result.update(fields)
+    return result
+
+
+def test_phone_numbers_are_cleaned_and_validated():
+    assert parse_phone_number(candidate("044 2522 2944")) == "04425222944"
+    assert parse_phone_number(candidate("098765 43210")) == "09876543210"
+    assert parse_phone_number(candidate("+91 98765 43210")) == "+919876543210"
+    assert parse_phone_number(candidate(href="tel:+919876543210")) == "+919876543210"
+    # Addresses and short numbers share the phone XPaths and must be rejected
+    assert parse_phone_number(candidate("Connaught Place, New Delhi 110001")) is None
+    assert parse_phone_number(candidate("040-1234")) is None
+    assert parse_phone_number(candidate("")) is None
+    assert parse_phone_number(candidate(href="tel:")) is None
+
+
+def test_operating_status_lines():
+    assert parse_operating_status(candidate("Closed ⋅ Opens 8 am Tue")) == ("Open", "Opens 8 am")
+    assert parse_operating_status(candidate("Open ⋅ Closes 9 pm")) == ("Open", "Closes 9 pm")
+    assert parse_operating_status(candidate("Open now")) == ("Open now", "Not Found")
+    assert parse_operating_status(candidate("Open 24 hours")) == ("Open", "Not Found")
+    assert parse_operating_status(candidate("Permanently closed")) == ("Closed", "Not Found")
+    assert parse_operating_status(candidate("Hours might differ")) is None
+    assert parse_operating_status(candidate("")) is None
+
+
+def test_hours_rating_review_count_and_category():
+    assert parse_operating_hours(candidate("9 am–7 pm")) == "9 am–7 pm"
+    assert parse_operating_hours(candidate("10-6")) == "10-6"
+    assert parse_operating_hours(candidate("Closed")) is None
+
+    assert parse_rating(candidate("4.6")) == "4.6"
+    assert parse_rating(candidate("5.0")) == "5.0"
+    assert parse_rating(candidate("6.1")) is None
+    assert parse_rating(candidate("(120)")) is None
+
+    assert parse_review_count(candidate(aria_label="1 review")) == "1"
+    assert parse_review_count(candidate(aria_label="1,234 reviews")) == "1234"
+    assert parse_review_count(candidate("(40)")) == "40"
+    assert parse_review_count(candidate("4.6")) is None
+
+    assert parse_store_type(candidate("Book store")) == "Book store"
+    assert parse_store_type(candidate("Directions")) is None
+
+
+def test_first_match_walks_the_fallback_chain():
+    chain = [candidate("Directions", xpath=0), candidate("Cafe", xpath=1), candidate("Bakery", xpath=2)]
+    assert first_match(chain, parse_store_type) == "Cafe"
+    assert first_match(iter(chain), parse_store_type) == "Cafe"
+    assert first_match(None, parse_store_type) is None
+
+
+def test_place_fields_from_candidates():
+    fields = parse_place_fields(candidates(
+        name=[candidate("Y-Axis")],
+        address=[candidate("Connaught Place, New Delhi")],
+        website=[candidate("y-axis.com", href="https://www.y-axis.com/")],
+        phone=[candidate("Connaught Place, New Delhi"), candidate("098765 43210")],
+        store_type=[candidate("Share"), candidate("Immigration consultant")],
+        status=[candidate("Open ⋅ Closes 7 pm")],
+        hours=[candidate("9 am–7 pm")],
+        rating=[candidate("4.6")],
+        review_count=[candidate("(1,234)", aria_label="1,234 reviews")],
+    ))
+    assert fields == {
+        'Name': "Y-Axis",
+        'Address': "Connaught Place, New Delhi",
+        'Website': "https://www.y-axis.com/",
+        'Phone': "09876543210",
+        'Store_Type': "Immigration consultant",
+        'Operating_Status': "Open",
+        'Operating_Hours': "Closes 7 pm",
+        'Rating': "4.6",
+        'Review_Count': "1234",
+        'Permanently_Closed': "No",
+    }
+
+
+def test_missing_fields_fall_back_to_not_found():
+    fields = parse_place_fields(candidates(
+        hours=[candidate("Closed"), candidate("10 am–6 pm")],
+        closed=[candidate("Permanently closed")],
+    ))
+    assert fields['Name'] == "Name Not Found"
+    assert fields['Phone'] == "Phone Number Not Found"
+    assert fields['Operating_Status'] == "Not Found"
+    # Without a status line the hours table is used
+    assert fields['Operating_Hours'] == "10 am–6 pm"
+    assert fields['Permanently_Closed'] == "Yes"
+    assert all(fields[name] == "Not Found" for name in ('Address', 'Website', 'Store_Type', 'Rating', 'Review_Count'))
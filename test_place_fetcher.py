@@ -0,0 +1,77 @@
+import glob
+import json
+import os
+
+import pytest
+
+from place_fetcher import parse_place_page
+
+# Place pages saved with `python place_fetcher.py <URL> <name>.html`, each next to
+# a <name>.json holding the URL and the fields the page is expected to yield
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "place_pages")
+
+URL = "https://www.google.com/maps/place/Y-Axis/data=!4m7!3m6!1s0x390ce3607036239d:0x4ae2a2b7c1882de7!8m2!3d28.6305706!4d77.2247533"
+
+
+def make_place_page(info):
+    """Build a page shaped like a saved Google Maps place page"""
+    info_list = [None] * 204
+    for index, value in info.items():
+        info_list[index] = value
+    payload = ")]}'\n" + json.dumps([None] * 6 + [info_list])
+    state = [[1, 2], None, None, ["", None, None, None, None, None, payload]]
+    return ("<html><head><script>window.APP_INITIALIZATION_STATE="
+            + json.dumps(state)
+            + ";window.APP_FLAGS=[];</script></head><body></body></html>")
+
+
+def test_place_page_payload_is_parsed_into_record():
+    html = make_place_page({
+        11: "Y-Axis",
+        39: "Connaught Place, New Delhi, Delhi 110001",
+        7: ["https://www.y-axis.com/"],
+        178: [["098765 43210"]],
+        13: ["Immigration consultant"],
+        4: [None] * 7 + [4.6, 1234],
+        34: [None, [["Friday", ["9 am–7 pm"]]]],
+    })
+
+    record = parse_place_page(html, URL)
+
+    assert record['Name'] == "Y-Axis"
+    assert record['Address'] == "Connaught Place, New Delhi, Delhi 110001"
+    assert record['Website'] == "https://www.y-axis.com/"
+    assert record['Phone'] == "098765 43210"
+    assert record['Store_Type'] == "Immigration consultant"
+    assert record['Rating'] == "4.6"
+    assert record['Review_Count'] == "1234"
+    assert record['Operating_Hours'] == "9 am–7 pm"
+    assert record['Permanently_Closed'] == "No"
+
+
+def test_closed_status_and_missing_payload():
+    html = make_place_page({11: "Old Shop", 39: "Somewhere", 203: [None, [None] * 4 + [["Permanently closed"]]]})
+    assert parse_place_page(html, URL)['Permanently_Closed'] == "Yes"
+
+    # Only the status field counts, not a review or description that mentions the phrase
+    html = make_place_page({11: "New Shop", 39: "Somewhere", 32: [["Not permanently closed, just moved!"]],
+                            203: [None, [None] * 4 + [["Open ⋅ Closes 9 pm"]]]})
+    assert parse_place_page(html, URL)['Permanently_Closed'] == "No"
+
+    # Consent pages and pages without a name/address must fall back to the browser
+    assert parse_place_page("<html>consent.google.com</html>", URL) is None
+    assert parse_place_page(make_place_page({11: "No Address"}), URL) is None
+
+
+@pytest.mark.parametrize("page_path", sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))))
+def test_saved_place_page(page_path):
+    with open(page_path, encoding="utf-8") as file:
+        html = file.read()
+    with open(os.path.splitext(page_path)[0] + ".json", encoding="utf-8") as file:
+        expected = json.load(file)
+
+    record = parse_place_page(html, expected["URL"])
+
+    assert record is not None
+    for field, value in expected.items():
+        assert record[field] == value, field
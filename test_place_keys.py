@@ -0,0 +1,41 @@
+from place_keys import PlaceKeySet, normalize_url, place_id_to_feature_id, place_key
+
+FEATURE_ID = "0x390ce3607036239d:0x4ae2a2b7c1882de7"
+URL = ("https://www.google.com/maps/place/Y-Axis/data=!4m7!3m6!1s0x390ce3607036239d:0x4ae2a2b7c1882de7"
+       "!8m2!3d28.6305706!4d77.2247533!16s%2Fg%2F11h04gb_xp!19sChIJnSM2cGDjDDkR5y2Iwbei4ko?authuser=0&hl=en&rclk=1")
+
+
+def test_feature_id_is_the_key():
+    assert place_key(URL) == FEATURE_ID
+
+
+def test_slug_and_query_do_not_change_the_key():
+    variant = URL.replace("/Y-Axis/", "/Y-Axis+Connaught+Place/").replace("?authuser=0&hl=en&rclk=1", "?hl=de")
+    assert place_key(variant) == FEATURE_ID
+
+
+def test_place_id_decodes_to_feature_id():
+    assert place_id_to_feature_id("ChIJnSM2cGDjDDkR5y2Iwbei4ko") == FEATURE_ID
+    only_place_id = "https://www.google.com/maps/place/Y-Axis/data=!4m2!3m1!19sChIJnSM2cGDjDDkR5y2Iwbei4ko"
+    assert place_key(only_place_id) == FEATURE_ID
+    assert place_key("https://www.google.com/maps/search/?api=1&query=x&query_place_id=ChIJnSM2cGDjDDkR5y2Iwbei4ko") == FEATURE_ID
+
+
+def test_ftid_parameter_and_key_passthrough():
+    assert place_key(f"https://www.google.com/maps?ftid={FEATURE_ID}") == FEATURE_ID
+    assert place_key(FEATURE_ID) == FEATURE_ID
+
+
+def test_urls_without_ids_fall_back_to_normalised_url():
+    assert place_key("https://www.google.com/maps/place/Cafe?hl=en") == "https://www.google.com/maps/place/Cafe"
+    assert normalize_url("HTTPS://WWW.GOOGLE.COM/maps#x") == "https://www.google.com/maps"
+    assert place_key("") is None
+
+
+def test_place_key_set_matches_by_place():
+    seen = PlaceKeySet([URL])
+    assert URL.replace("rclk=1", "rclk=2") in seen
+    assert len(seen) == 1
+    assert not seen.claim(FEATURE_ID)
+    assert seen.claim("https://www.google.com/maps/place/Other/data=!1s0x1:0x2")
+    assert len(seen) == 2
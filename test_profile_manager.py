@@ -0,0 +1,67 @@
+import json
+import os
+import time
+
+from profile_manager import OWNER_FILE, ProfileManager
+
+
+def test_clone_copies_warm_template(tmp_path):
+    manager = ProfileManager(root=str(tmp_path))
+    warmed = []
+
+    def warm(template_dir):
+        warmed.append(template_dir)
+        with open(os.path.join(template_dir, "Cookies"), 'w') as file:
+            file.write("consent")
+
+    first = manager.clone(0, warm=warm)
+    second = manager.clone(1, warm=warm)
+
+    assert len(warmed) == 1
+    assert first != second
+    with open(os.path.join(second, "Cookies")) as file:
+        assert file.read() == "consent"
+    with open(os.path.join(first, "Default", "Preferences")) as file:
+        assert json.load(file)['intl']['accept_languages'] == 'en-US,en'
+
+    # Writing to a clone never touches the template
+    with open(os.path.join(first, "Cookies"), 'w') as file:
+        file.write("changed")
+    with open(os.path.join(manager.template_dir, "Cookies")) as file:
+        assert file.read() == "consent"
+
+    manager.release(first)
+    assert not os.path.exists(first)
+    assert os.path.exists(manager.template_dir)
+
+
+def test_failed_warmup_still_gives_a_template(tmp_path):
+    manager = ProfileManager(root=str(tmp_path))
+
+    def warm(template_dir):
+        raise RuntimeError("no chrome here")
+
+    profile = manager.clone(0, warm=warm)
+    assert os.path.isdir(profile)
+
+
+def test_gc_removes_only_stale_profiles(tmp_path):
+    manager = ProfileManager(root=str(tmp_path), stale_age=60)
+    mine = manager.clone(0)
+
+    # A profile whose owner is unknown and that has not been touched for hours
+    orphan = str(tmp_path / "worker_9_1_0")
+    os.makedirs(orphan)
+    old = time.time() - 3600
+    os.utime(orphan, (old, old))
+
+    # A profile owned by a process id that cannot exist
+    dead = manager.clone(1)
+    with open(os.path.join(dead, OWNER_FILE), 'w') as file:
+        file.write("999999999")
+
+    assert manager.gc() == 2
+    assert os.path.exists(mine)
+    assert not os.path.exists(orphan)
+    assert not os.path.exists(dead)
+    assert os.path.exists(manager.template_dir)
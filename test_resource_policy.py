@@ -0,0 +1,104 @@
+from fnmatch import fnmatchcase
+
+import pytest
+
+from resource_policy import (RESOURCE_PROFILES, apply_resource_options, apply_resource_policy,
+                             blocked_patterns)
+
+IMAGE_PREF = "profile.managed_default_content_settings.images"
+
+# One representative request per resource class, plus the requests the place panel needs
+SAMPLE_URLS = {
+    'images': "https://lh5.googleusercontent.com/p/AF1QipN=w408-h306",
+    'fonts': "https://fonts.gstatic.com/s/googlesans/v58/font.woff2",
+    'media': "https://www.gstatic.com/maps/intro.mp4",
+    'map_tiles': "https://www.google.com/maps/vt?pb=!1m5!1m4!1i15!2i23390",
+}
+PANEL_URLS = [
+    "https://www.google.com/maps/_/js/k=maps.m.en.abc/m=sc2,per/rt=j",
+    "https://www.google.com/maps/_/ss/k=maps.m.abc.L.W.O/am=AAAA/d=1/rs=ACT90o.css",
+    "https://www.google.com/maps/preview/place?authuser=0&hl=en&pb=!1m18",
+    "https://www.google.com/search?tbm=map&authuser=0&hl=en&pb=!4m12",
+]
+
+
+class FakeOptions:
+    def __init__(self, prefs=None):
+        self.experimental_options = {"prefs": prefs} if prefs is not None else {}
+
+    def add_experimental_option(self, name, value):
+        self.experimental_options[name] = value
+
+
+class FakeDriver:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        if self.fail:
+            raise RuntimeError("CDP not available")
+        self.commands.append((cmd, params))
+
+
+def is_blocked(url, patterns):
+    return any(fnmatchcase(url, pattern) for pattern in patterns)
+
+
+@pytest.mark.parametrize("profile", sorted(RESOURCE_PROFILES))
+def test_profile_blocks_exactly_its_resource_classes(profile):
+    patterns = blocked_patterns(profile)
+    for resource_class, url in SAMPLE_URLS.items():
+        assert is_blocked(url, patterns) == (resource_class in RESOURCE_PROFILES[profile]), url
+    for url in PANEL_URLS:
+        assert not is_blocked(url, patterns), url
+
+
+def test_place_details_keeps_panel_but_blocks_tiles_fonts_and_media():
+    patterns = blocked_patterns('place_details')
+    assert not any(is_blocked(url, patterns) for url in PANEL_URLS)
+    for resource_class in ('map_tiles', 'fonts', 'media'):
+        assert is_blocked(SAMPLE_URLS[resource_class], patterns)
+
+
+@pytest.mark.parametrize("profile", sorted(RESOURCE_PROFILES))
+def test_images_preference_follows_profile(profile):
+    options = apply_resource_options(FakeOptions(prefs={"intl.accept_languages": "en"}), profile)
+    prefs = options.experimental_options["prefs"]
+    assert prefs["intl.accept_languages"] == "en"
+    if 'images' in RESOURCE_PROFILES[profile]:
+        assert prefs[IMAGE_PREF] == 2
+    else:
+        assert IMAGE_PREF not in prefs
+
+
+def test_policy_installs_block_list_via_cdp():
+    driver = FakeDriver()
+    assert apply_resource_policy(driver, 'search_results') is driver
+    assert driver.commands == [
+        ("Network.enable", {}),
+        ("Network.setBlockedURLs", {"urls": blocked_patterns('search_results')}),
+    ]
+
+    full = FakeDriver()
+    apply_resource_policy(full, 'full')
+    assert full.commands == []
+
+
+def test_policy_failure_leaves_driver_usable():
+    driver = FakeDriver(fail=True)
+    assert apply_resource_policy(driver, 'place_details') is driver
+
+
+@pytest.mark.parametrize("apply, target", [
+    (apply_resource_options, FakeOptions()),
+    (apply_resource_policy, FakeDriver()),
+    (lambda _, profile: blocked_patterns(profile), None),
+])
+def test_unknown_profile_names_the_valid_ones(apply, target):
+    with pytest.raises(ValueError) as excinfo:
+        apply(target, 'place_detail')
+    message = str(excinfo.value)
+    assert "'place_detail'" in message
+    for name in RESOURCE_PROFILES:
+        assert name in message
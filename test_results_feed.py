@@ -0,0 +1,34 @@
+from results_feed import FeedProgress
+
+
+def state(height, count, end=False):
+    return {'scrollHeight': height, 'itemCount': count, 'endOfList': end}
+
+
+def test_stops_at_end_of_list():
+    progress = FeedProgress(max_scrolls=60)
+    assert progress.update(state(1000, 20), 20, 20) is None
+    assert progress.update(state(2000, 40, end=True), 40, 20) == "reached end of list"
+
+
+def test_stops_when_feed_stops_growing():
+    progress = FeedProgress(max_scrolls=60, max_stalled=2)
+    assert progress.update(state(1000, 20), 20, 20) is None
+    assert progress.update(state(1000, 20), 20, 0) is None
+    assert "stopped growing" in progress.update(state(1000, 20), 20, 0)
+
+
+def test_growth_resets_stall_counter():
+    progress = FeedProgress(max_scrolls=60, max_stalled=2)
+    progress.update(state(1000, 20), 20, 20)
+    progress.update(state(1000, 20), 20, 0)
+    assert progress.update(state(1500, 30), 30, 10) is None
+    assert progress.stalled == 0
+
+
+def test_stops_at_target_and_ceiling():
+    assert "target" in FeedProgress(max_scrolls=60, target_count=30).update(state(1000, 40), 40, 40)
+
+    progress = FeedProgress(max_scrolls=2)
+    assert progress.update(state(1000, 20), 20, 20) is None
+    assert "ceiling" in progress.update(state(2000, 40), 40, 20)
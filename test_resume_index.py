@@ -0,0 +1,53 @@
+import csv
+import os
+import time
+
+from resume_index import ResumeIndex
+
+
+def write_output(path, urls):
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=['URL', 'Name'])
+        writer.writeheader()
+        for url in urls:
+            writer.writerow({'URL': url, 'Name': 'x'})
+
+
+def test_index_is_built_from_csv_and_persisted_to_sidecar(tmp_path):
+    """First load reads the CSV; later adds land in the sidecar and survive a reload"""
+    output = str(tmp_path / "out.csv")
+    write_output(output, ["https://a", "https://b"])
+
+    index = ResumeIndex.load(output)
+    assert "https://a" in index and "https://b" in index
+    assert "https://c" not in index
+
+    index.add("https://c")
+    index.add("https://c")
+
+    reloaded = ResumeIndex.load(output)
+    assert len(reloaded) == 3
+    assert "https://c" in reloaded
+    with open(output + ".keys", encoding='utf-8') as file:
+        assert file.read().count("https://c") == 1
+
+
+def test_csv_edited_after_sidecar_is_reread(tmp_path):
+    """A CSV newer than its sidecar wins, so hand edits are not ignored"""
+    output = str(tmp_path / "out.csv")
+    write_output(output, ["https://a"])
+    ResumeIndex.load(output)
+
+    write_output(output, ["https://z"])
+    future = time.time() + 5
+    os.utime(output, (future, future))
+
+    index = ResumeIndex.load(output)
+    assert "https://z" in index
+    assert "https://a" not in index
+
+
+def test_missing_output_gives_empty_index_without_sidecar(tmp_path):
+    index = ResumeIndex.load(str(tmp_path / "missing.csv"), use_sidecar=False)
+    assert len(index) == 0
+    assert not os.path.exists(str(tmp_path / "missing.csv.keys"))
@@ -0,0 +1,124 @@
+import threading
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("undetected_chromedriver")
+pytest.importorskip("selenium")
+
+from Improved_Refactored import MapsScraper, MapsScraperError, SearchCollector, URLManager
+from state_store import StateStore
+
+CENTER = (28.6315, 77.2167)
+
+
+def place_url(name, index):
+    return (f"https://www.google.com/maps/place/{name}/data=!4m7!3m6!1s0x390cfd0000000000:0x{index:x}"
+            f"!8m2!3d{CENTER[0] + index / 10000}!4d{CENTER[1]}")
+
+
+# Results every search's feed shows; each must be saved by exactly one search
+SHARED_PLACES = [{'href': place_url(f"Shared+{i}", i), 'name': f"Shared {i}"} for i in range(1, 6)]
+
+
+class FakeDriver:
+    def __init__(self, name, quit_drivers):
+        self.name = name
+        self.quit_drivers = quit_drivers
+
+    def execute_script(self, script):
+        return 1
+
+    def quit(self):
+        self.quit_drivers.append(self)
+
+
+class StubScraper(MapsScraper):
+    """Serves canned feed results through the real place processing instead of driving a browser"""
+
+    def __init__(self, url_manager, barrier=None, failing=()):
+        super().__init__(url_manager)
+        self.barrier = barrier
+        self.failing = set(failing)
+        self.drivers_used = {}
+        self._lock = threading.Lock()
+
+    def scrape_area(self, search_item, search_lat, search_lon, driver, target_count=None):
+        with self._lock:
+            self.drivers_used[search_item] = driver
+            own_index = 100 + len(self.drivers_used)
+        if self.barrier is not None:
+            # Opens only once every worker is inside a search at the same time
+            self.barrier.wait()
+        if search_item in self.failing:
+            raise MapsScraperError(f"Scraping failed for '{search_item}': browser crashed")
+
+        own_place = {'href': place_url(search_item, own_index), 'name': search_item}
+        places_data = self._process_places(SHARED_PLACES + [own_place], search_item, search_lat, search_lon)
+        for place_data in places_data:
+            self.url_manager.save_place_data(place_data)
+        return places_data
+
+
+def make_collector(tmp_path, max_browsers, **scraper_options):
+    url_manager = URLManager(str(tmp_path / "all_scraped_urls.csv"), str(tmp_path / "filtered_places.csv"))
+    scraper = StubScraper(url_manager, **scraper_options)
+    created, quit_drivers = [], []
+
+    def driver_factory(thread_id):
+        driver = FakeDriver(f"driver-{len(created)}", quit_drivers)
+        created.append(driver)
+        return driver
+
+    collector = SearchCollector(scraper, max_browsers=max_browsers, adaptive_tiling=True,
+                                driver_factory=driver_factory)
+    return collector, scraper, created, quit_drivers
+
+
+def test_searches_run_concurrently_and_claim_each_place_once(tmp_path):
+    searches = [(item, *CENTER) for item in ("cafe", "gym", "school")]
+    collector, scraper, created, quit_drivers = make_collector(
+        tmp_path, max_browsers=3, barrier=threading.Barrier(3, timeout=5))
+
+    results = list(collector.collect(searches))
+    scraper.url_manager.close()
+
+    assert [result.error for result in results] == [None, None, None]
+    assert len({id(driver) for driver in scraper.drivers_used.values()}) == 3
+
+    saved_urls = [place.url for result in results for place in result.places]
+    assert len(saved_urls) == len(set(saved_urls)) == len(SHARED_PLACES) + 3
+    assert {place['href'] for place in SHARED_PLACES} <= set(saved_urls)
+    assert sorted(pd.read_csv(tmp_path / "all_scraped_urls.csv")["url"]) == sorted(saved_urls)
+
+    # Every browser is shut down once the searches are done
+    assert sorted(d.name for d in quit_drivers) == sorted(d.name for d in created)
+
+
+def test_failed_search_is_reported_and_retried_without_stopping_the_pool(tmp_path):
+    searches = [(item, *CENTER) for item in ("broken", "cafe", "gym", "school")]
+    collector, scraper, created, quit_drivers = make_collector(tmp_path, max_browsers=2, failing={"broken"})
+    state = StateStore(str(tmp_path / "state.sqlite"))
+    state.add_search_jobs(searches)
+
+    results = {}
+    for result in collector.collect(searches):
+        if result.error:
+            # The browser the failed search ran in was discarded, not returned to the pool
+            assert scraper.drivers_used[result.search_item] in quit_drivers
+        results[result.search_item] = result
+        state.finish_search_job(result.search_item, result.search_lat, result.search_lon,
+                                result_count=len(result.places), error=result.error)
+    scraper.url_manager.close()
+
+    assert "browser crashed" in results["broken"].error
+    assert results["broken"].places == []
+    assert all(results[item].error is None for item in ("cafe", "gym", "school"))
+    assert sum(len(result.places) for result in results.values()) == len(SHARED_PLACES) + 3
+
+    broken_driver = scraper.drivers_used["broken"]
+    assert all(scraper.drivers_used[item] is not broken_driver for item in ("cafe", "gym", "school"))
+
+    # Only the failed search is left for the next run
+    assert state.pending_search_jobs() == [("broken", *CENTER)]
+    state.close()
@@ -0,0 +1,132 @@
+import os
+
+from seen_store import BloomFilter, SeenStore, key_hash
+
+URL = "https://www.google.com/maps/place/A/data=!1s0x390ce3607036239d:0x4ae2a2b7c1882de7?hl=en"
+
+
+def test_add_and_reopen(tmp_path):
+    path = str(tmp_path / "seen.bin")
+    store = SeenStore(path)
+    assert URL not in store
+    assert store.claim(URL)
+    assert not store.claim(URL.replace("hl=en", "hl=de"))
+    store.update([f"https://www.google.com/maps/place/P/data=!1s0x{i:x}:0x{i:x}" for i in range(1, 50)])
+    assert len(store) == 50
+
+    # Without compaction the log alone carries the new places
+    reopened = SeenStore(path)
+    assert URL in reopened
+    assert len(reopened) == 50
+    reopened.close()
+    store.close()
+
+
+def test_compaction_writes_sorted_hashes(tmp_path):
+    path = str(tmp_path / "seen.bin")
+    store = SeenStore(path, compact_threshold=10)
+    urls = [f"https://www.google.com/maps/place/P/data=!1s0x1:0x{i:x}" for i in range(25)]
+    for url in urls:
+        store.add(url)
+    store.close()
+
+    assert os.path.getsize(path) == 25 * 8
+    assert os.path.getsize(path + ".log") == 0
+
+    reopened = SeenStore(path, use_bloom=True)
+    assert all(url in reopened for url in urls)
+    assert "https://www.google.com/maps/place/P/data=!1s0x2:0x1" not in reopened
+    reopened.claim("https://www.google.com/maps/place/P/data=!1s0x2:0x1")
+    reopened.close()
+    assert os.path.getsize(path) == 26 * 8
+    assert os.path.exists(path + ".bloom")
+
+
+def test_torn_log_write_is_ignored(tmp_path):
+    path = str(tmp_path / "seen.bin")
+    store = SeenStore(path)
+    store.add(URL)
+    with open(path + ".log", "ab") as file:
+        file.write(b"\x01\x02\x03")
+    assert URL in SeenStore(path)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter.for_capacity(1000)
+    values = [key_hash(f"0x1:0x{i:x}") for i in range(1000)]
+    for value in values:
+        bloom.add(value)
+    assert all(value in bloom for value in values)
+    misses = sum(1 for i in range(1000) if key_hash(f"0x2:0x{i:x}") in bloom)
+    assert misses < 50
+
+
+def write_csv(path, urls, mode="w"):
+    with open(path, mode, newline="", encoding="utf-8") as file:
+        if mode == "w":
+            file.write("search_item,url,within_7km\n")
+        for url in urls:
+            file.write(f"cafe,{url},YES\n")
+
+
+def test_sync_csv_reads_only_appended_rows(tmp_path):
+    path = str(tmp_path / "seen.bin")
+    csv_path = str(tmp_path / "all_scraped_urls.csv")
+    urls = [f"https://www.google.com/maps/place/P/data=!1s0x1:0x{i:x}" for i in range(10)]
+    write_csv(csv_path, urls[:6])
+
+    store = SeenStore(path)
+    assert store.sync_csv(csv_path) == 6
+    assert store.sync_csv(csv_path) == 0
+    store.close()
+
+    # Another process appends rows, the last one still half-written
+    write_csv(csv_path, urls[6:9], mode="a")
+    with open(csv_path, "a", encoding="utf-8") as file:
+        file.write(f"cafe,{urls[9]}")
+
+    reopened = SeenStore(path)
+    assert not reopened.csv_rewritten(csv_path)
+    assert reopened.sync_csv(csv_path) == 3
+    assert urls[8] in reopened and urls[9] not in reopened
+    with open(csv_path, "a", encoding="utf-8") as file:
+        file.write(",YES\n")
+    assert reopened.sync_csv(csv_path) == 1
+    assert len(reopened) == 10
+    reopened.close()
+
+
+def test_csv_rewritten_detects_truncation_and_rewrites(tmp_path):
+    path = str(tmp_path / "seen.bin")
+    csv_path = str(tmp_path / "all_scraped_urls.csv")
+    urls = [f"https://www.google.com/maps/place/P/data=!1s0x1:0x{i:x}" for i in range(5)]
+    write_csv(csv_path, urls)
+    store = SeenStore(path)
+    store.sync_csv(csv_path)
+
+    write_csv(csv_path, urls[:2])
+    assert store.csv_rewritten(csv_path)
+    write_csv(csv_path, list(reversed(urls)))
+    assert store.csv_rewritten(csv_path)
+    store.close()
+
+
+def test_stale_bloom_file_is_rebuilt(tmp_path):
+    path = str(tmp_path / "seen.bin")
+    store = SeenStore(path, use_bloom=True)
+    store.add(URL)
+    store.close()
+    stale_bloom = open(path + ".bloom", "rb").read()
+
+    other = "https://www.google.com/maps/place/B/data=!1s0x1:0x2"
+    store = SeenStore(path, use_bloom=True)
+    store.add(other)
+    store.close()
+
+    # A Bloom file left over from the smaller sorted file must not hide the new place
+    with open(path + ".bloom", "wb") as file:
+        file.write(stale_bloom)
+    assert BloomFilter.load(path + ".bloom", 2) is None
+    reopened = SeenStore(path, use_bloom=True)
+    assert URL in reopened and other in reopened
+    reopened.close()
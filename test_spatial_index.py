@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from geo_distance import haversine_km
+from spatial_index import GridIndex, assign_to_centers, nearest_centers
+
+rng = np.random.default_rng(7)
+LATS = 28.6 + rng.uniform(-0.3, 0.3, 500)
+LONS = 77.2 + rng.uniform(-0.3, 0.3, 500)
+LATS[10] = np.nan
+
+
+def test_radius_query_matches_brute_force():
+    index = GridIndex(LATS, LONS)
+    assert len(index) == 499
+    positions, distances = index.query_radius(28.63, 77.21, 7)
+    brute = haversine_km(28.63, 77.21, LATS, LONS)
+    expected = np.flatnonzero(brute <= 7)
+    assert sorted(positions.tolist()) == expected.tolist()
+    assert np.all(np.diff(distances) >= 0)
+
+
+def test_knn_query_matches_brute_force():
+    index = GridIndex(LATS, LONS)
+    positions, distances = index.query_knn(28.9, 77.5, k=5)
+    brute = haversine_km(28.9, 77.5, LATS, LONS)
+    assert positions.tolist() == np.argsort(np.nan_to_num(brute, nan=np.inf))[:5].tolist()
+    assert np.allclose(distances, np.sort(brute[~np.isnan(brute)])[:5])
+
+
+def test_assign_and_nearest_centers():
+    places = pd.DataFrame({"url_lat": LATS, "url_lon": LONS})
+    centers = pd.DataFrame({"latitude": [28.6315, 28.6519], "longitude": [77.2167, 77.1909]})
+    pairs = assign_to_centers(places, centers, radius_km=5)
+    for center, group in pairs.groupby("center_index"):
+        brute = haversine_km(centers.latitude[center], centers.longitude[center], LATS, LONS)
+        assert sorted(group.place_index) == np.flatnonzero(brute <= 5).tolist()
+
+    nearest = nearest_centers(places, centers)
+    assert len(nearest) == 499
+    assert set(nearest.center_index) <= {0, 1}
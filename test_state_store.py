@@ -0,0 +1,62 @@
+import csv
+import threading
+
+from state_store import StateStore
+
+URL = "https://www.google.com/maps/place/A/data=!1s0x390ce3607036239d:0x4ae2a2b7c1882de7!8m2!3d28.63!4d77.22"
+
+
+def test_results_upsert_by_place(tmp_path):
+    store = StateStore(str(tmp_path / "state.db"))
+    assert URL not in store
+    store.save_results([{'URL': URL, 'Name': 'Y-Axis', 'Latitude': '28.63', 'Longitude': '77.22'}])
+    store.save_results([{'URL': URL + "?hl=en", 'Name': 'Error', 'Latitude': 'Not Found'}])
+    assert URL in store
+    assert len(store) == 1
+    assert store.get_result(URL)['Name'] == 'Error'
+    place = store._connection().execute("SELECT name, latitude FROM places").fetchone()
+    assert place == ('Y-Axis', 28.63)
+
+    store.add("https://www.google.com/maps/place/B")
+    assert len(store) == 2
+    store.close()
+
+    reopened = StateStore(str(tmp_path / "state.db"))
+    assert URL in reopened and len(reopened) == 2
+
+
+def test_concurrent_writers(tmp_path):
+    store = StateStore(str(tmp_path / "state.db"))
+
+    def worker(offset):
+        for i in range(50):
+            url = f"https://www.google.com/maps/place/P/data=!1s0x{offset + i:x}:0x1"
+            store.save_results([{'URL': url, 'Name': str(i)}])
+            store.record_attempt(url, 'success', duration=0.1)
+
+    threads = [threading.Thread(target=worker, args=(n * 100,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(store) == 200
+    assert store.attempt_count("https://www.google.com/maps/place/P/data=!1s0x0:0x1") == 1
+    store.close()
+
+
+def test_search_jobs_and_csv_sync(tmp_path):
+    store = StateStore(str(tmp_path / "state.db"))
+    store.add_search_jobs([("IELTS", 28.63, 77.21), ("IELTS", 28.65, 77.19)])
+    store.add_search_jobs([("IELTS", 28.63, 77.21)])
+    store.finish_search_job("IELTS", 28.63, 77.21, result_count=12)
+    store.finish_search_job("IELTS", 28.65, 77.19, error="timeout")
+    assert store.pending_search_jobs() == [("IELTS", 28.65, 77.19)]
+
+    output = tmp_path / "out.csv"
+    with open(output, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=['URL', 'Name'])
+        writer.writeheader()
+        writer.writerow({'URL': URL, 'Name': 'Y-Axis'})
+    assert store.sync_csv(str(output)) == 1
+    assert store.sync_csv(str(output)) == 0
+    assert URL in store
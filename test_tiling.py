@@ -0,0 +1,34 @@
+from tiling import Tile, TilingPlanner
+
+
+def test_split_quarters_the_cell():
+    children = Tile(28.6315, 77.2167, 13000).split()
+    assert len(children) == 4
+    assert all(child.radius_m == 6500 and child.depth == 1 for child in children)
+    assert abs(sum(child.lat for child in children) / 4 - 28.6315) < 1e-9
+    assert len({(child.lat, child.lon) for child in children}) == 4
+
+
+def test_only_saturated_cells_are_split():
+    planner = TilingPlanner(28.6315, 77.2167, 13000, saturation_count=110, max_depth=2)
+    searched = []
+    for tile in planner:
+        searched.append(tile)
+        # Only the root and the first quadrant are dense
+        dense = tile.depth == 0 or tile == searched[1]
+        planner.record(tile, 120 if dense else 40, reached_end=not dense)
+
+    assert planner.queries == len(searched) == 1 + 4 + 4
+    assert planner.splits == 2
+    assert max(tile.depth for tile in searched) == 2
+
+
+def test_end_of_list_and_depth_limits():
+    planner = TilingPlanner(0, 0, 13000, max_depth=1)
+    root = next(iter(planner))
+    assert planner.record(root, 120, reached_end=True) == []
+    assert len(planner.record(root, 120)) == 4
+    assert planner.record(root.split()[0], 120) == []
+
+    small = TilingPlanner(0, 0, 2000, min_radius_m=1500)
+    assert small.record(Tile(0, 0, 2000), 120) == []
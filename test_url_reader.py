@@ -0,0 +1,46 @@
+import csv
+
+import pytest
+
+from url_reader import StreamingURLReader, iter_chunks, read_header
+
+
+def write_input(path, urls):
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=['Name', 'URL'])
+        writer.writeheader()
+        for url in urls:
+            writer.writerow({'Name': 'x', 'URL': url})
+
+
+def test_reader_skips_processed_and_blank_urls(tmp_path):
+    path = str(tmp_path / "in.csv")
+    write_input(path, ["https://a", "", " https://b ", "https://c"])
+
+    reader = StreamingURLReader(path, skip={"https://c"})
+    assert list(reader) == ["https://a", "https://b"]
+    assert reader.skipped == 2
+    assert reader.fieldnames == ['Name', 'URL']
+
+
+def test_reader_is_lazy(tmp_path):
+    """Rows are read one at a time, so a consumer can stop early"""
+    path = str(tmp_path / "in.csv")
+    write_input(path, [f"https://{i}" for i in range(1000)])
+
+    urls = iter(StreamingURLReader(path))
+    assert next(urls) == "https://0"
+    assert next(urls) == "https://1"
+
+
+def test_missing_column_raises(tmp_path):
+    path = str(tmp_path / "in.csv")
+    write_input(path, ["https://a"])
+
+    with pytest.raises(ValueError, match="Link"):
+        StreamingURLReader(path, column='Link')
+    assert read_header(path) == ['Name', 'URL']
+
+
+def test_chunks():
+    assert list(iter_chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
@@ -0,0 +1,82 @@
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterator, List
+
+METERS_PER_DEGREE = 111_195  # along a meridian
+
+# A Google Maps results feed stops at about 120 places; a feed that returns at
+# least this many without reaching the end-of-list marker was cut off
+SATURATION_COUNT = 110
+
+# Each split quarters a cell, so depth 2 is at most 1 + 4 + 16 queries per search
+MAX_TILE_DEPTH = 2
+MIN_TILE_RADIUS_M = 1500
+
+
+@dataclass(frozen=True)
+class Tile:
+    """One search cell: the map center and the viewport size used in the search URL"""
+    lat: float
+    lon: float
+    radius_m: float
+    depth: int = 0
+
+    def split(self) -> List["Tile"]:
+        """The four quadrants of this cell, each half as wide"""
+        offset_m = self.radius_m / 2
+        dlat = offset_m / METERS_PER_DEGREE
+        dlon = dlat / max(math.cos(math.radians(self.lat)), 1e-6)
+        return [Tile(self.lat + sign_lat * dlat, self.lon + sign_lon * dlon, offset_m, self.depth + 1)
+                for sign_lat in (1, -1) for sign_lon in (-1, 1)]
+
+
+class TilingPlanner:
+    """
+    Plans the searches that cover one area, splitting only cells whose feed saturated
+
+    Start with the whole area as a single cell. After each cell's search, call
+    ``record`` with how many results its feed showed; a cell that hit the feed
+    cap without reaching the end of the list is split into four smaller cells,
+    which are queued behind the remaining ones. Sparse areas therefore cost one
+    query, and only dense parts are searched again at a finer scale.
+    """
+
+    def __init__(self, lat: float, lon: float, radius_m: float,
+                 saturation_count: int = SATURATION_COUNT, max_depth: int = MAX_TILE_DEPTH,
+                 min_radius_m: float = MIN_TILE_RADIUS_M):
+        self.saturation_count = saturation_count
+        self.max_depth = max_depth
+        self.min_radius_m = min_radius_m
+        self.pending = deque([Tile(lat, lon, radius_m)])
+        self.queries = 0
+        self.splits = 0
+
+    def __iter__(self) -> Iterator[Tile]:
+        while self.pending:
+            self.queries += 1
+            yield self.pending.popleft()
+
+    def is_saturated(self, feed_count: int, reached_end: bool) -> bool:
+        return feed_count >= self.saturation_count and not reached_end
+
+    def record(self, tile: Tile, feed_count: int, reached_end: bool = False) -> List[Tile]:
+        """
+        Report a finished cell search
+
+        Args:
+            tile: The cell that was searched
+            feed_count: Results the cell's feed showed, including places seen before
+            reached_end: Whether the feed showed its end-of-list marker
+
+        Returns:
+            The sub-cells queued for this cell (empty if it was not split)
+        """
+        if not self.is_saturated(feed_count, reached_end):
+            return []
+        if tile.depth >= self.max_depth or tile.radius_m / 2 < self.min_radius_m:
+            return []
+        children = tile.split()
+        self.pending.extend(children)
+        self.splits += 1
+        return children
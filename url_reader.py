@@ -0,0 +1,76 @@
+import csv
+import sys
+from typing import Container, Dict, Iterable, Iterator, List, Optional
+
+# Allow very long cells (some exports carry whole review texts)
+csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def read_header(input_filename: str) -> List[str]:
+    """Return the column names of a CSV without reading its body"""
+    with open(input_filename, 'r', newline='', encoding='utf-8') as file:
+        return next(csv.reader(file), [])
+
+
+class StreamingURLReader:
+    """
+    Lazily yield rows or URLs from an input CSV, one line at a time
+
+    Memory use does not depend on the size of the input: nothing is buffered
+    beyond the current row. Rows whose key is in ``skip`` (typically a
+    ResumeIndex) or whose key is empty are dropped and counted in ``skipped``.
+    Iterating again re-opens the file.
+    """
+
+    def __init__(self, input_filename: str, column: str = 'URL', skip: Optional[Container[str]] = None):
+        """
+        Args:
+            input_filename: CSV file to read
+            column: Column holding the URL
+            skip: URLs that should not be yielded, e.g. a ResumeIndex
+
+        Raises:
+            ValueError: If the column is not in the CSV header
+        """
+        self.input_filename = input_filename
+        self.column = column
+        self.skip = skip
+        self.fieldnames = read_header(input_filename)
+        if column not in self.fieldnames:
+            raise ValueError(f"'{column}' column not found in {input_filename}. "
+                             f"Available columns: {self.fieldnames}")
+        self.skipped = 0
+
+    def rows(self) -> Iterator[Dict[str, str]]:
+        """Yield input rows (as dicts) that still need processing"""
+        self.skipped = 0
+        with open(self.input_filename, 'r', newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                url = (row.get(self.column) or '').strip()
+                if not url or (self.skip is not None and url in self.skip):
+                    self.skipped += 1
+                    continue
+                row[self.column] = url
+                yield row
+
+    def __iter__(self) -> Iterator[str]:
+        for row in self.rows():
+            yield row[self.column]
+
+    def chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[str]]:
+        """Yield pending URLs in lists of at most ``chunk_size``"""
+        return iter_chunks(self, chunk_size)
+
+
+def iter_chunks(items: Iterable, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[list]:
+    """Group any iterable into lists of at most ``chunk_size`` items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
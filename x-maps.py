@@ -6,104 +6,46 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
-import time
+from selenium.webdriver.chrome.service import Service
 import csv
-import pandas as pd
 import re
 import os
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import subprocess
-
-# Try to import webdriver_manager for automatic ChromeDriver management
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    from selenium.webdriver.chrome.service import Service
-    WEBDRIVER_MANAGER_AVAILABLE = True
-except ImportError:
-    WEBDRIVER_MANAGER_AVAILABLE = False
+
+from page_readiness import wait_until_ready, wait_until_settled
+from coordinates import extract_coordinates_from_url
+from place_keys import place_key
+from resume_index import ResumeIndex
+from url_reader import StreamingURLReader
+from resource_policy import apply_resource_options, apply_resource_policy
+from browser_discovery import WEBDRIVER_MANAGER_AVAILABLE, discover_browser
+from profile_manager import profile_manager, warm_with_selenium
+
+if not WEBDRIVER_MANAGER_AVAILABLE:
     print("webdriver-manager not available. Install it with: pip install webdriver-manager")
 
 # Global lock for thread-safe CSV writing
 csv_lock = threading.Lock()
 
-def get_chrome_version():
-    """Get the installed Chrome browser version for better compatibility"""
-    try:
-        # Try different methods to get Chrome version
-        methods = [
-            # Windows
-            r'reg query "HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon" /v version',
-            # Alternative Windows method
-            r'powershell "Get-ItemProperty HKLM:\SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Uninstall\* | Select-Object DisplayName, DisplayVersion | Where-Object {$_.DisplayName -like \"*Chrome*\"}"',
-        ]
-
-        for method in methods:
-            try:
-                result = subprocess.run(method, shell=True, capture_output=True, text=True, timeout=10)
-                if result.returncode == 0 and result.stdout:
-                    # Extract version number from output
-                    version_match = re.search(r'(\d+)\.(\d+)\.(\d+)\.(\d+)', result.stdout)
-                    if version_match:
-                        major_version = int(version_match.group(1))
-                        return major_version
-            except:
-                continue
-
-        # Fallback: Try to get version from Chrome executable
-        import platform
-        if platform.system() == "Windows":
-            chrome_paths = [
-                r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-                r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-            ]
-            for path in chrome_paths:
-                if os.path.exists(path):
-                    try:
-                        result = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10)
-                        version_match = re.search(r'(\d+)\.(\d+)\.(\d+)\.(\d+)', result.stdout)
-                        if version_match:
-                            return int(version_match.group(1))
-                    except:
-                        continue
-
-    except Exception as e:
-        print(f"Warning: Could not detect Chrome version: {e}")
-
-    return None
-
-def extract_coordinates_from_url(url):
-    """
-    Extract latitude and longitude coordinates from Google Maps URL
-
-    Args:
-        url (str): Google Maps URL containing coordinates
-
-    Returns:
-        tuple: (latitude, longitude) as strings, or ("Not Found", "Not Found") if not found
-    """
-    try:
-        # Use regex to find latitude (3d parameter) and longitude (4d parameter)
-        lat_pattern = r'3d([+-]?\d+\.?\d*)'
-        lng_pattern = r'4d([+-]?\d+\.?\d*)'
-
-        lat_match = re.search(lat_pattern, url)
-        lng_match = re.search(lng_pattern, url)
-
-        latitude = lat_match.group(1) if lat_match else "Not Found"
-        longitude = lng_match.group(1) if lng_match else "Not Found"
-
-        return latitude, longitude
+# Ceiling (seconds) for waiting on a place page to become ready
+PAGE_READY_TIMEOUT = 20
 
-    except Exception as e:
-        print(f"Error extracting coordinates from URL: {str(e)}")
-        return "Not Found", "Not Found"
+# Resource profile for place-detail pages (see resource_policy.RESOURCE_PROFILES)
+RESOURCE_PROFILE = "place_details"
 
 def safe_driver_quit(driver):
-    """Safely quit the Chrome driver with error handling"""
+    """Safely quit the Chrome driver with error handling and delete its cloned profile"""
     if not driver:
         return
 
+    try:
+        quit_driver_process(driver)
+    finally:
+        profile_manager.release(getattr(driver, 'profile_dir', None))
+
+def quit_driver_process(driver):
+    """Close the browser behind a driver, escalating to terminate/kill if needed"""
     try:
         # First try to close all windows
         try:
@@ -161,8 +103,9 @@ def check_url_already_processed(url, output_filename):
     try:
         with open(output_filename, 'r', newline='', encoding='utf-8') as file:
             reader = csv.DictReader(file)
+            key = place_key(url)
             for row in reader:
-                if row.get('URL') == url:
+                if place_key(row.get('URL')) == key:
                     return True
     except Exception as e:
         print(f"Warning: Error checking processed URLs: {e}")
@@ -173,17 +116,12 @@ def scroll_page(driver):
     """
     Scroll the page to help reveal dynamic content
     """
-    # Get the total height of the page
-    total_height = driver.execute_script("return document.body.scrollHeight")
-    
-    # Scroll in increments
-    for i in range(0, total_height, 500):
-        driver.execute_script(f"window.scrollTo(0, {i});")
-        time.sleep(0.5)
-    
+    # Scroll to the bottom and wait for any lazily loaded content to settle
+    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    wait_until_settled(driver)
+
     # Scroll back to top
     driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(1)
 
 
 def extract_phone_number(driver, wait):
@@ -191,8 +129,6 @@ def extract_phone_number(driver, wait):
     try:
         # Scroll and wait for page to be fully loaded
         scroll_page(driver)
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
 
         # Exact XPath selectors based on confirmed HTML structure
         phone_xpaths = [
@@ -217,7 +153,6 @@ def extract_phone_number(driver, wait):
                     try:
                         # Scroll to element to ensure it's visible
                         driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.3)
 
                         # Extract text or href for tel: links
                         if "tel:" in xpath:
@@ -267,11 +202,7 @@ def extract_store_type(driver, wait):
     try:
         # Enhanced scrolling and waiting for elements to load
         driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(2)
-
-        # Wait for page to be fully loaded
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
+        wait_until_settled(driver)
 
         # Try multiple selectors for store type/category (prioritized by reliability)
         category_selectors = [
@@ -293,7 +224,6 @@ def extract_store_type(driver, wait):
                     try:
                         # Scroll to element to ensure it's visible
                         driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.5)
 
                         category_text = element.text.strip()
                         if category_text and len(category_text) > 0:
@@ -322,11 +252,7 @@ def extract_operating_status_and_hours(driver, wait):
 
         # Enhanced scrolling and waiting
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-        time.sleep(2)
-
-        # Wait for page to be fully loaded
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
+        wait_until_settled(driver)
 
         # Try to find operating status with prioritized selectors (confirmed working)
         status_selectors = [
@@ -347,7 +273,6 @@ def extract_operating_status_and_hours(driver, wait):
                     try:
                         # Scroll to element to ensure it's visible
                         driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.5)
 
                         status_text = element.text.strip()
 
@@ -478,11 +403,7 @@ def extract_rating(driver, wait):
     try:
         # Enhanced scrolling and waiting for rating elements
         driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(2)
-
-        # Wait for page to be fully loaded
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(1)
+        wait_until_settled(driver)
 
         # Try multiple selectors for rating (prioritized by reliability)
         rating_selectors = [
@@ -503,7 +424,6 @@ def extract_rating(driver, wait):
                     try:
                         # Scroll to element to ensure it's visible
                         driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.5)
 
                         rating_text = element.text.strip()
 
@@ -563,21 +483,13 @@ def scrape_data(url, driver, wait):
     try:
         # Navigate to the URL
         driver.get(url)
-        time.sleep(8)  # Increased wait time for page to load completely
 
-        # Wait for page to be fully loaded
-        wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-        time.sleep(2)
+        # Wait for the place panel title, network idle and DOM quiet instead of fixed sleeps
+        if not wait_until_ready(driver, timeout=PAGE_READY_TIMEOUT):
+            print(f"⚠️ Page not settled after {PAGE_READY_TIMEOUT}s, extracting anyway: {url}")
 
         # Scroll the page to ensure all elements are loaded
         scroll_page(driver)
-        time.sleep(3)  # Additional wait after scrolling
-
-        # Additional scroll to ensure dynamic content is loaded
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
-        driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(2)
 
         # Initialize variables with default values
         address = website = phone = "Not Found"
@@ -666,23 +578,22 @@ def main():
         print("The file should be created by the Google Maps scraper with the correct spelling: 'stationery' not 'stationary'")
         return
 
-    # Read URLs from CSV file
-    try:
-        df = pd.read_csv(input_filename)
-        if 'URL' not in df.columns:
-            print(f"Error: 'URL' column not found in {input_filename}")
-            print(f"Available columns: {list(df.columns)}")
-            return
+    # Clean up browser profiles left behind by earlier, interrupted runs
+    profile_manager.gc()
+
+    # Setup output file for real-time incremental writing
+    output_filename = 'filtered_op.csv'
 
-        urls = df['URL'].tolist()
-        print(f"Successfully loaded {len(urls)} URLs from {input_filename}")
+    # Read only the URL column, line by line, dropping URLs already in the output
+    try:
+        processed = ResumeIndex.load(output_filename, use_sidecar=False)
+        reader = StreamingURLReader(input_filename, column='URL', skip=processed)
+        urls = list(reader)
+        print(f"Loaded {len(urls)} pending URLs from {input_filename} ({reader.skipped} already processed)")
     except Exception as e:
         print(f"Error reading CSV file: {str(e)}")
         return
 
-    # Setup output file for real-time incremental writing
-    output_filename = 'filtered_op.csv'
-
     # Check if output file already exists to determine if we need to write header
     file_exists = os.path.exists(output_filename)
 
@@ -799,14 +710,14 @@ def process_urls_multithreaded(urls, output_filename, file_exists):
 
         print("="*80)
 
-def create_chrome_driver(thread_id=0):
+def create_chrome_driver(thread_id=0, resource_profile=RESOURCE_PROFILE):
     """
     Create a Chrome driver with improved version compatibility and thread safety using standard Selenium
+
+    Images, fonts, media and map tiles are blocked according to ``resource_profile``.
     """
-    # Detect Chrome version for better compatibility
-    chrome_version = get_chrome_version()
-    if chrome_version:
-        print(f"🔍 Detected Chrome version: {chrome_version}")
+    # Browser, version and chromedriver are resolved once per process (cached on disk)
+    browser = discover_browser()
 
     def create_chrome_options(thread_id, suffix=""):
         """Create fresh Chrome options to avoid reuse errors"""
@@ -821,22 +732,33 @@ def create_chrome_driver(thread_id=0):
         #options.add_argument('--disable-plugins')
         #options.add_argument('--disable-images')
         #options.add_argument('--disable-javascript')
-        # Use Windows-compatible temp directory path
-        temp_profile = f"C:\\temp\\chrome_profile_{thread_id}_{suffix}_{int(time.time())}"
-        options.add_argument(f'--user-data-dir={temp_profile}')
+        # Fresh clone of the warm template profile, deleted again when the driver quits
+        profile_dir = profile_manager.clone(f"{thread_id}_{suffix}", warm=warm_with_selenium)
+        attempt_profiles.append(profile_dir)
+        options.add_argument(f'--user-data-dir={profile_dir}')
+        apply_resource_options(options, resource_profile)
         return options
 
+    attempt_profiles = []
+
+    def finish(driver):
+        # Keep the profile this driver runs on; discard those of failed attempts
+        driver.profile_dir = attempt_profiles.pop()
+        for profile_dir in attempt_profiles:
+            profile_manager.release(profile_dir)
+        return apply_resource_policy(driver, resource_profile)
+
     driver = None
 
-    # Method 1: Try with webdriver-manager for automatic version management
-    if WEBDRIVER_MANAGER_AVAILABLE:
+    # Method 1: Try the ChromeDriver found by browser discovery (webdriver-manager or PATH)
+    if browser['driver_path']:
         try:
-            print(f"🔄 [Thread {thread_id}] Trying webdriver-manager for automatic ChromeDriver management...")
-            service = Service(ChromeDriverManager().install())
+            print(f"🔄 [Thread {thread_id}] Trying discovered ChromeDriver {browser['driver_path']}...")
+            service = Service(browser['driver_path'])
             options = create_chrome_options(thread_id, "webdriver_manager")
             driver = webdriver.Chrome(service=service, options=options)
-            print(f"✅ [Thread {thread_id}] Successfully created Chrome driver using webdriver-manager")
-            return driver
+            print(f"✅ [Thread {thread_id}] Successfully created Chrome driver using discovered ChromeDriver")
+            return finish(driver)
         except Exception as e:
             print(f"❌ [Thread {thread_id}] webdriver-manager failed: {e}")
 
@@ -847,7 +769,7 @@ def create_chrome_driver(thread_id=0):
             options = create_chrome_options(thread_id, "system")
             driver = webdriver.Chrome(options=options)
             print(f"✅ [Thread {thread_id}] Successfully created Chrome driver using system ChromeDriver")
-            return driver
+            return finish(driver)
         except Exception as e:
             print(f"❌ [Thread {thread_id}] System ChromeDriver failed: {e}")
 
@@ -870,14 +792,14 @@ def create_chrome_driver(thread_id=0):
                         service = Service(path)
                         driver = webdriver.Chrome(service=service, options=options)
                         print(f"✅ [Thread {thread_id}] Successfully created Chrome driver using {path}")
-                        return driver
+                        return finish(driver)
                 except Exception:
                     continue
 
             # If no specific path works, try without service
             driver = webdriver.Chrome(options=options)
             print(f"✅ [Thread {thread_id}] Successfully created Chrome driver with default service")
-            return driver
+            return finish(driver)
 
         except Exception as e:
             print(f"❌ [Thread {thread_id}] Explicit ChromeDriver service failed: {e}")
@@ -889,6 +811,8 @@ def create_chrome_driver(thread_id=0):
         print("2. Install/update webdriver-manager: pip install --upgrade webdriver-manager")
         print("3. Download ChromeDriver from: https://chromedriver.chromium.org/downloads")
         print("4. Ensure ChromeDriver is in your PATH or place chromedriver.exe in the script directory")
+        for profile_dir in attempt_profiles:
+            profile_manager.release(profile_dir)
         raise Exception("Failed to create Chrome driver with all methods")
 
     return driver